@@ -1,10 +1,11 @@
 from django.contrib import admin
 
 # Register your models here.
-from .models import Book
+from .models import Author, Book
 
 class BookAdmin(admin.ModelAdmin):
     list_display = ('title', 'author', 'publication_year')
-    search_fields = ('title', 'author')
+    search_fields = ('title', 'author__name')
     list_filter = ('title', 'author', 'publication_year')
-admin.site.register(Book)
\ No newline at end of file
+admin.site.register(Book)
+admin.site.register(Author, search_fields=('name',))
\ No newline at end of file
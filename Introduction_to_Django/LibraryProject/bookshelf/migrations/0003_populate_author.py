@@ -0,0 +1,72 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:05
+
+"""
+Moves Book.author strings into Author rows, one batch of books at a time so
+memory stays bounded on large tables. Names are deduplicated on the same key
+as Author.normalized_name (copied here, as migrations must not depend on
+code that may change).
+"""
+from collections import defaultdict
+
+from django.db import migrations
+
+BATCH_SIZE = 1000
+
+
+def normalize(name):
+    return ' '.join(name.split()).casefold()
+
+
+def books_in_batches(Book, *fields):
+    last_pk = 0
+    while True:
+        batch = list(Book.objects.filter(pk__gt=last_pk).order_by('pk').values_list('pk', *fields)[:BATCH_SIZE])
+        if not batch:
+            return
+        yield batch
+        last_pk = batch[-1][0]
+
+
+def populate_authors(apps, schema_editor):
+    Author = apps.get_model('bookshelf', 'Author')
+    Book = apps.get_model('bookshelf', 'Book')
+    for batch in books_in_batches(Book, 'author'):
+        # The first spelling seen for a name becomes its display name.
+        names = {}
+        for _, name in batch:
+            names.setdefault(normalize(name), ' '.join(name.split()))
+        Author.objects.bulk_create(
+            [Author(name=name, normalized_name=key) for key, name in names.items()],
+            ignore_conflicts=True,
+        )
+        author_ids = dict(Author.objects.filter(normalized_name__in=names).values_list('normalized_name', 'pk'))
+        books_by_author = defaultdict(list)
+        for pk, name in batch:
+            books_by_author[author_ids[normalize(name)]].append(pk)
+        for author_id, pks in books_by_author.items():
+            Book.objects.filter(pk__in=pks).update(author_ref=author_id)
+
+
+def restore_author_names(apps, schema_editor):
+    # Writes back each author's display name (the first spelling seen), not
+    # the spelling each book had before: variants of a name were merged.
+    Author = apps.get_model('bookshelf', 'Author')
+    Book = apps.get_model('bookshelf', 'Book')
+    for batch in books_in_batches(Book, 'author_ref'):
+        author_names = dict(Author.objects.filter(pk__in={pk for _, pk in batch}).values_list('pk', 'name'))
+        books_by_author = defaultdict(list)
+        for pk, author_id in batch:
+            books_by_author[author_id].append(pk)
+        for author_id, pks in books_by_author.items():
+            Book.objects.filter(pk__in=pks).update(author=author_names[author_id])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookshelf', '0002_author'),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_authors, restore_author_names),
+    ]
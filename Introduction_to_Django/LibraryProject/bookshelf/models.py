@@ -1,9 +1,42 @@
 from django.db import models
 
+
+def normalize_author_name(name):
+    """
+    The key authors are deduplicated on: whitespace collapsed, case folded.
+    """
+    return ' '.join(name.split()).casefold()
+
+
+class AuthorManager(models.Manager):
+    def get_for_name(self, name):
+        """
+        The Author with this name (compared normalized), created if needed.
+        """
+        name = ' '.join(name.split())
+        author, _ = self.get_or_create(normalized_name=normalize_author_name(name), defaults={'name': name})
+        return author
+
+
+class Author(models.Model):
+    name = models.CharField(max_length=100)
+    # casefold() can turn one character into up to three ('ß' -> 'ss', 'ﬃ' -> 'ffi').
+    normalized_name = models.CharField(max_length=300, unique=True, editable=False)
+
+    objects = AuthorManager()
+
+    def save(self, *args, **kwargs):
+        self.normalized_name = normalize_author_name(self.name)
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return self.name
+
+
 # Create your models here.
 class Book(models.Model):
     title = models.CharField(max_length=200)
-    author = models.CharField(max_length=100)
+    author = models.ForeignKey(Author, on_delete=models.PROTECT, related_name='books')
     publication_year = models.IntegerField()
     
     
@@ -1,3 +1,60 @@
-from django.test import TestCase
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TestCase, TransactionTestCase
 
-# Create your tests here.
+from .models import Author
+
+
+class AuthorMigrationTests(TransactionTestCase):
+    """
+    0002-0004 move the Book.author strings into deduplicated Author rows, and
+    can be unapplied.
+    """
+    before = [('bookshelf', '0001_initial')]
+    after = [('bookshelf', '0004_book_author_fk')]
+
+    def migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    def tearDown(self):
+        # Back to the latest migrations for the tests that follow.
+        self.migrate(MigrationExecutor(connection).loader.graph.leaf_nodes())
+
+    def test_forwards_and_backwards(self):
+        apps = self.migrate(self.before)
+        OldBook = apps.get_model('bookshelf', 'Book')
+        OldBook.objects.bulk_create([
+            OldBook(title='1984', author='George  Orwell', publication_year=1949),
+            OldBook(title='Animal Farm', author='george orwell', publication_year=1945),
+            OldBook(title='Brave New World', author='Aldous Huxley', publication_year=1932),
+        ])
+
+        apps = self.migrate(self.after)
+        NewAuthor, NewBook = apps.get_model('bookshelf', 'Author'), apps.get_model('bookshelf', 'Book')
+        self.assertEqual(
+            sorted(NewAuthor.objects.values_list('name', 'normalized_name')),
+            [('Aldous Huxley', 'aldous huxley'), ('George Orwell', 'george orwell')],
+        )
+        self.assertEqual(
+            dict(NewBook.objects.values_list('title', 'author__name')),
+            {'1984': 'George Orwell', 'Animal Farm': 'George Orwell', 'Brave New World': 'Aldous Huxley'},
+        )
+
+        # Unapplied, each book gets its author's display name back.
+        apps = self.migrate(self.before)
+        self.assertEqual(
+            dict(apps.get_model('bookshelf', 'Book').objects.values_list('title', 'author')),
+            {'1984': 'George Orwell', 'Animal Farm': 'George Orwell', 'Brave New World': 'Aldous Huxley'},
+        )
+
+
+class AuthorTests(TestCase):
+    def test_normalized_name_fits_a_full_length_name(self):
+        # Every 'ﬃ' casefolds to three characters.
+        name = 'ﬃ' * Author._meta.get_field('name').max_length
+        author = Author.objects.get_for_name(name)
+        self.assertEqual(author.normalized_name, 'ffi' * len(name))
+        self.assertLessEqual(len(author.normalized_name), Author._meta.get_field('normalized_name').max_length)
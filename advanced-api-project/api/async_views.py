@@ -0,0 +1,236 @@
+"""
+Async (ASGI-native) variants of the book views.
+
+They keep the configuration of the sync views in api.views (filters, search,
+ordering, keyset pagination, permissions, BookSerializer validation) but run
+the request on the event loop: the user comes from request.auser(), rows are
+read with aiterator()/aget() and written with acreate()/asave()/adelete().
+Permission classes may define `async def has_permission` /
+`has_object_permission`; plain DRF permission classes work too.
+
+Steps that are still synchronous in Django/DRF run through sync_to_async:
+django-filter's form validation (it may look up the author) and serializer
+validation (PrimaryKeyRelatedField checks the author exists).
+"""
+import inspect
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ImproperlyConfigured
+from django.http import Http404
+from rest_framework import exceptions, generics, status
+from rest_framework.authentication import SessionAuthentication
+from rest_framework.response import Response
+
+from .serializers import BookSerializer, get_field_options, get_values_serializer
+from .views import BookDeleteView, BookDetailView, BookListView, BookUpdateView, BookCreateView, EagerLoadingMixin
+
+
+async def _resolve(value):
+    return await value if inspect.isawaitable(value) else value
+
+
+class AsyncAPIViewMixin:
+    """
+    Async request lifecycle for DRF generic views: same steps as
+    APIView.dispatch, with authentication and permission checks awaited.
+    The view's authenticators run in order, as in Request._authenticate:
+    SessionAuthentication reads the user with request.auser(), an
+    authenticator with `async def aauthenticate(request)` is awaited, and any
+    other (Basic, Token, ...) runs its authenticate() through sync_to_async.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await self.ainitial(request, *args, **kwargs)
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+            response = await _resolve(handler(request, *args, **kwargs))
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    async def ainitial(self, request, *args, **kwargs):
+        self.format_kwarg = self.get_format_suffix(**kwargs)
+        request.accepted_renderer, request.accepted_media_type = self.perform_content_negotiation(request)
+        request.version, request.versioning_scheme = self.determine_version(request, *args, **kwargs)
+
+        await self.aperform_authentication(request)
+        await self.acheck_permissions(request)
+        self.check_throttles(request)
+
+    async def aperform_authentication(self, request):
+        for authenticator in request.authenticators:
+            try:
+                user_auth_tuple = await self.aauthenticate(authenticator, request)
+            except exceptions.APIException:
+                request._not_authenticated()
+                raise
+            if user_auth_tuple is not None:
+                request._authenticator = authenticator
+                request.user, request.auth = user_auth_tuple
+                return
+        request._not_authenticated()
+
+    async def aauthenticate(self, authenticator, request):
+        if hasattr(authenticator, 'aauthenticate'):
+            return await authenticator.aauthenticate(request)
+        if (
+            isinstance(authenticator, SessionAuthentication)
+            and type(authenticator).authenticate is SessionAuthentication.authenticate
+        ):
+            # SessionAuthentication.authenticate, with the user loaded by auser().
+            user = await request._request.auser()
+            if not user or not user.is_active:
+                return None
+            authenticator.enforce_csrf(request)
+            return (user, None)
+        return await sync_to_async(authenticator.authenticate)(request)
+
+    async def acheck_permissions(self, request):
+        for permission in self.get_permissions():
+            if not await _resolve(permission.has_permission(request, self)):
+                self.permission_denied(
+                    request,
+                    message=getattr(permission, 'message', None),
+                    code=getattr(permission, 'code', None),
+                )
+
+    async def acheck_object_permissions(self, request, obj):
+        for permission in self.get_permissions():
+            if not await _resolve(permission.has_object_permission(request, self, obj)):
+                self.permission_denied(
+                    request,
+                    message=getattr(permission, 'message', None),
+                    code=getattr(permission, 'code', None),
+                )
+
+    async def aget_object(self):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        queryset = self.get_queryset()
+        try:
+            obj = await queryset.aget(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        except (queryset.model.DoesNotExist, ValueError):
+            raise Http404(f"No {queryset.model._meta.object_name} matches the given query.")
+        await self.acheck_object_permissions(self.request, obj)
+        return obj
+
+    async def avalidate(self, serializer):
+        await sync_to_async(serializer.is_valid)(raise_exception=True)
+        return serializer.validated_data
+
+
+# ---------------------
+# READ OPERATIONS
+# ---------------------
+
+class AsyncBookListView(AsyncAPIViewMixin, generics.ListAPIView):
+    """
+    Async BookListView: same filtering, search, ordering and keyset pagination,
+    rows streamed from the database with aiterator().
+    """
+    queryset = BookListView.queryset
+    serializer_class = BookListView.serializer_class
+    permission_classes = BookListView.permission_classes
+    pagination_class = BookListView.pagination_class
+    filter_backends = BookListView.filter_backends
+    filterset_fields = BookListView.filterset_fields
+    search_fields = BookListView.search_fields
+    ordering_fields = BookListView.ordering_fields
+    ordering = BookListView.ordering
+
+    async def get(self, request, *args, **kwargs):
+        try:
+            fast = get_values_serializer(self.get_serializer_class(), **get_field_options(request))
+        except ImproperlyConfigured:
+            # ?expand= nests a serializer: render model instances instead.
+            return await sync_to_async(self.list)(request, *args, **kwargs)
+        queryset = await sync_to_async(self.filter_queryset)(self.get_queryset())
+        queryset = fast.get_queryset(queryset)
+
+        if self.paginator is not None:
+            page = await self.paginator.apaginate_queryset(queryset, request, view=self)
+            if page is not None:
+                return self.get_paginated_response(fast.to_representation(page))
+        rows = [row async for row in queryset.aiterator()]
+        return Response(fast.to_representation(rows))
+
+
+class AsyncBookDetailView(AsyncAPIViewMixin, EagerLoadingMixin, generics.RetrieveAPIView):
+    """
+    Async BookDetailView. An expanded author is joined in aget(), as the
+    serializer cannot lazy-load it on the event loop.
+    """
+    queryset = BookDetailView.queryset
+    serializer_class = BookDetailView.serializer_class
+    permission_classes = BookDetailView.permission_classes
+
+    async def get(self, request, *args, **kwargs):
+        book = await self.aget_object()
+        return Response(self.get_serializer(book).data)
+
+
+# ---------------------
+# WRITE OPERATIONS
+# ---------------------
+
+class AsyncBookCreateView(AsyncAPIViewMixin, generics.CreateAPIView):
+    """
+    Async BookCreateView. Validation is BookSerializer's, including
+    validate_publication_year.
+    """
+    queryset = BookCreateView.queryset
+    serializer_class = BookCreateView.serializer_class
+    permission_classes = BookCreateView.permission_classes
+
+    async def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        validated_data = await self.avalidate(serializer)
+        book = await self.get_queryset().model.objects.acreate(**validated_data)
+        return Response(BookSerializer(book).data, status=status.HTTP_201_CREATED)
+
+
+class AsyncBookUpdateView(AsyncAPIViewMixin, generics.UpdateAPIView):
+    """
+    Async BookUpdateView (PUT and PATCH).
+    """
+    queryset = BookUpdateView.queryset
+    serializer_class = BookUpdateView.serializer_class
+    permission_classes = BookUpdateView.permission_classes
+
+    async def put(self, request, *args, **kwargs):
+        return await self.aupdate(request, partial=False)
+
+    async def patch(self, request, *args, **kwargs):
+        return await self.aupdate(request, partial=True)
+
+    async def aupdate(self, request, partial):
+        book = await self.aget_object()
+        serializer = self.get_serializer(book, data=request.data, partial=partial)
+        for attr, value in (await self.avalidate(serializer)).items():
+            setattr(book, attr, value)
+        await book.asave()
+        return Response(self.get_serializer(book).data)
+
+
+class AsyncBookDeleteView(AsyncAPIViewMixin, generics.DestroyAPIView):
+    """
+    Async BookDeleteView.
+    """
+    queryset = BookDeleteView.queryset
+    serializer_class = BookDeleteView.serializer_class
+    permission_classes = BookDeleteView.permission_classes
+
+    async def delete(self, request, *args, **kwargs):
+        book = await self.aget_object()
+        await book.adelete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,270 @@
+"""
+Latency benchmarks for the book endpoints at realistic data sizes.
+
+run_benchmarks() seeds Authors/Books with bulk_create inside a transaction
+that is rolled back afterwards, then times each scenario through the test
+client and records p50/p95/p99 latency, SQL queries per request and peak
+Python memory. Results are plain dicts, saved as JSON by the benchmark_api
+command, and compare_results() turns two runs into a regression report.
+
+run_concurrency_benchmark() drives the sync and async (api.async_views)
+variants through the in-process ASGI stack with many requests in flight and
+reports the throughput of each.
+"""
+import asyncio
+import random
+import statistics
+import time
+import tracemalloc
+
+from asgiref.sync import async_to_sync
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test import AsyncClient
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from . import search
+from .models import Author, Book
+
+WORDS = [
+    "river", "shadow", "garden", "empire", "winter", "silent", "golden", "machine",
+    "ocean", "forest", "secret", "broken", "crimson", "distant", "hidden", "iron",
+]
+
+# run_benchmarks() swaps this in for the default cache, so clearing it between
+# requests never touches the cache the site itself uses.
+BENCHMARK_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "api-benchmark"},
+}
+
+# Metrics compared between runs; a higher value is worse for all of them.
+COMPARED_METRICS = ("p50_ms", "p95_ms", "p99_ms", "queries", "peak_memory_kb")
+
+
+def seed(books, authors, batch_size=5000):
+    """
+    Bulk-load `authors` authors and `books` books and index them for search.
+    """
+    rng = random.Random(42)
+    Author.objects.bulk_create(
+        (Author(name=f"{rng.choice(WORDS).title()} Author {i}") for i in range(authors)),
+        batch_size=batch_size,
+    )
+    author_ids = list(Author.objects.values_list("id", flat=True))
+    for start in range(0, books, batch_size):
+        Book.objects.bulk_create(
+            Book(
+                title=f"The {rng.choice(WORDS)} {rng.choice(WORDS)} {i}",
+                publication_year=rng.randint(1900, 2020),
+                author_id=rng.choice(author_ids),
+            )
+            for i in range(start, min(start + batch_size, books))
+        )
+    if search.is_supported():
+        search.rebuild_index(batch_size=batch_size)
+
+
+def get_scenarios(author_id, book_ids, rng):
+    """
+    name -> callable(client) issuing one request of that scenario.
+    """
+    list_url = reverse("book-list")
+    return {
+        "list": lambda client: client.get(list_url),
+        "filter": lambda client: client.get(list_url, {"publication_year": rng.randint(1900, 2020)}),
+        "search": lambda client: client.get(list_url, {"search": rng.choice(WORDS)}),
+        "ordering": lambda client: client.get(list_url, {"ordering": "-publication_year"}),
+        "detail": lambda client: client.get(reverse("book-detail", args=[rng.choice(book_ids)])),
+        "create": lambda client: client.post(
+            reverse("book-create"),
+            {"title": "Benchmark", "publication_year": 2000, "author": author_id},
+            format="json",
+        ),
+    }
+
+
+def percentile(samples, pct):
+    if len(samples) == 1:
+        return samples[0]
+    return statistics.quantiles(samples, n=100, method="inclusive")[pct - 1]
+
+
+def measure(request, client, requests, use_cache):
+    """
+    Time `requests` calls of `request`, then one extra traced call for memory.
+    The response cache is cleared before each call unless use_cache is set,
+    so call this with BENCHMARK_CACHES in place (see run_benchmarks).
+    """
+    latencies, queries = [], []
+    for _ in range(requests):
+        if not use_cache:
+            cache.clear()
+        with CaptureQueriesContext(connection) as ctx:
+            start = time.perf_counter()
+            response = request(client)
+            latencies.append((time.perf_counter() - start) * 1000)
+        if response.status_code >= 400:
+            raise RuntimeError(f"Benchmark request failed with status {response.status_code}.")
+        queries.append(len(ctx.captured_queries))
+
+    if not use_cache:
+        cache.clear()
+    tracemalloc.start()
+    try:
+        request(client)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "requests": requests,
+        "mean_ms": round(statistics.fmean(latencies), 3),
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "queries": max(queries),
+        "peak_memory_kb": round(peak / 1024, 1),
+    }
+
+
+def _test_client_settings(**overrides):
+    """
+    Let the test clients' "testserver" host through, whatever ALLOWED_HOSTS says.
+    """
+    return override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"], **overrides)
+
+
+def run_benchmarks(books, authors, requests, scenarios=None, use_cache=False):
+    """
+    Seed the data, run the scenarios and roll everything back. Responses are
+    cached in a private LocMem cache (BENCHMARK_CACHES), emptied afterwards.
+    """
+    rng = random.Random(7)
+    results = {}
+    with transaction.atomic(), _test_client_settings(CACHES=BENCHMARK_CACHES):
+        seed(books, authors)
+        user = User.objects.create_user(username="benchmark-user")
+        client = APIClient()
+        client.force_authenticate(user)
+
+        book_ids = list(Book.objects.values_list("id", flat=True)[:10000])
+        available = get_scenarios(Author.objects.values_list("id", flat=True).first(), book_ids, rng)
+        for name in scenarios or available:
+            results[name] = measure(available[name], client, requests, use_cache)
+
+        transaction.set_rollback(True)
+        cache.clear()
+
+    return {
+        "meta": {
+            "books": books,
+            "authors": authors,
+            "requests": requests,
+            "cache": use_cache,
+            "database": connection.vendor,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+
+def compare_results(baseline, current, threshold):
+    """
+    Return (rows, regressions): one row per scenario/metric, and the rows
+    where the current value is more than `threshold` (e.g. 0.2 = 20%) worse.
+    """
+    rows, regressions = [], []
+    for name, metrics in current["results"].items():
+        old_metrics = baseline["results"].get(name)
+        if old_metrics is None:
+            continue
+        for metric in COMPARED_METRICS:
+            old, new = old_metrics[metric], metrics[metric]
+            change = (new - old) / old if old else (0.0 if new == old else float("inf"))
+            row = (name, metric, old, new, change)
+            rows.append(row)
+            if change > threshold:
+                regressions.append(row)
+    return rows, regressions
+
+
+async def _load(client, paths, total, concurrency):
+    """
+    Issue `total` GETs over `paths` with at most `concurrency` in flight.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(path):
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.get(path)
+            latencies.append((time.perf_counter() - start) * 1000)
+            if response.status_code >= 400:
+                raise RuntimeError(f"Benchmark request to {path} failed with status {response.status_code}.")
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(paths[i % len(paths)]) for i in range(total)))
+    elapsed = time.perf_counter() - start
+    return {
+        "requests": total,
+        "concurrency": concurrency,
+        "throughput_rps": round(total / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+    }
+
+
+# The sync and async views do not have the same features; reported with the results.
+CONCURRENCY_CAVEATS = (
+    "The async views have no response cache (CachedResponseMixin) and no conditional GET "
+    "(ConditionalGetMixin). The cache is off for both variants, but the sync views still "
+    "compute ETags: no SQL for lists, one extra query per detail request.",
+)
+
+
+def run_concurrency_benchmark(books, authors, requests, concurrency):
+    """
+    Throughput of the sync and async book list/detail views under concurrent
+    load through the ASGI handler. The response cache is switched off so both
+    variants hit the database; see CONCURRENCY_CAVEATS for what still differs.
+    """
+    rng = random.Random(7)
+    results = {}
+    with transaction.atomic(), _test_client_settings(
+        CACHES={"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
+    ):
+        seed(books, authors)
+        book_ids = list(Book.objects.values_list("id", flat=True)[:10000])
+        detail_ids = [rng.choice(book_ids) for _ in range(100)]
+        word = rng.choice(WORDS)
+        scenarios = {
+            "list": lambda prefix: [reverse(f"{prefix}book-list")],
+            "search": lambda prefix: [reverse(f"{prefix}book-list") + f"?search={word}"],
+            "detail": lambda prefix: [reverse(f"{prefix}book-detail", args=[pk]) for pk in detail_ids],
+        }
+
+        client = AsyncClient()
+        for name, paths in scenarios.items():
+            for variant, prefix in (("sync", ""), ("async", "async-")):
+                results[f"{name}/{variant}"] = async_to_sync(_load)(client, paths(prefix), requests, concurrency)
+
+        transaction.set_rollback(True)
+
+    return {
+        "meta": {
+            "books": books,
+            "authors": authors,
+            "requests": requests,
+            "concurrency": concurrency,
+            "caveats": list(CONCURRENCY_CAVEATS),
+            "database": connection.vendor,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
@@ -0,0 +1,143 @@
+"""
+Versioned response cache for the read endpoints.
+
+Each model has a version number in the cache. A cached response's key contains
+the current version of every model it depends on, so a write only has to bump
+one number (see api.signals) and every older entry becomes unreachable; nothing
+is scanned or deleted, stale entries simply expire. The same versions make up
+the list ETags (api.conditional).
+"""
+import hashlib
+import time
+from collections import Counter
+from urllib.parse import urlencode
+
+from django.core.cache import cache
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import parse_http_date_safe
+from rest_framework.response import Response
+
+KEY_PREFIX = "api:response"
+
+# Validator headers stored with the data, so cache hits can still answer 304.
+CACHED_HEADERS = ("ETag", "Last-Modified")
+
+_stats = Counter()
+
+
+def _version_key(model):
+    return f"{KEY_PREFIX}:version:{model._meta.label_lower}"
+
+
+def _initial_version():
+    # Seeded from the clock, not 1: clients keep ETags longer than the cache keeps
+    # versions, and an evicted counter must not come back as a number it had before.
+    return time.time_ns() // 1000
+
+
+def get_model_versions(models):
+    """
+    Current version of each model, fetched with a single cache round-trip.
+    """
+    keys = [_version_key(model) for model in models]
+    versions = cache.get_many(keys)
+    missing = {key: _initial_version() for key in keys if key not in versions}
+    if missing:
+        cache.set_many(missing, timeout=None)
+        versions.update(missing)
+    return [versions[key] for key in keys]
+
+
+def bump_model_version(model):
+    """
+    Invalidate every cached response that depends on `model`. O(1).
+    Call this after writes that skip signals (bulk_create, QuerySet.update).
+    """
+    key = _version_key(model)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Not set yet (or evicted): a fresh seed differs from every older version.
+        cache.set(key, _initial_version(), timeout=None)
+
+
+def normalize_query(query_params):
+    """
+    Sorted, re-encoded query string so ?b=2&a=1 and ?a=1&b=2 share an entry.
+    """
+    items = sorted((key, value) for key, values in query_params.lists() for value in values)
+    return urlencode(items)
+
+
+def get_cache_key(request, view_name, models):
+    user = request.user
+    scope = f"user:{user.pk}" if user and user.is_authenticated else "anon"
+    versions = ".".join(str(version) for version in get_model_versions(models))
+    # The host is part of the key because paginated responses embed absolute links;
+    # the negotiated format because the cached ETag differs per representation.
+    renderer = getattr(request, "accepted_renderer", None)
+    renderer_format = renderer.format if renderer is not None else ""
+    raw = f"{request.get_host()}{request.path}?{normalize_query(request.query_params)}|{scope}|{renderer_format}"
+    digest = hashlib.md5(raw.encode("utf-8")).hexdigest()
+    return f"{KEY_PREFIX}:{view_name}:{versions}:{digest}"
+
+
+def cache_stats():
+    """
+    Hit/miss counters for this process.
+    """
+    hits, misses = _stats["hits"], _stats["misses"]
+    total = hits + misses
+    return {"hits": hits, "misses": misses, "hit_ratio": hits / total if total else 0.0}
+
+
+def reset_cache_stats():
+    _stats.clear()
+
+
+class CachedResponseMixin:
+    """
+    Caches the serialized data of successful GET responses.
+    cache_dependencies: models whose writes invalidate this view's entries
+    (get_cache_dependencies() can vary them per request).
+    cache_timeout: seconds an entry lives (stale versions expire on their own).
+    Responses carry X-Cache: HIT or MISS. ETag/Last-Modified headers are cached
+    too, and a hit whose validators match the request is answered with 304.
+    Entries are per negotiated format, so responses carry Vary: Accept.
+    """
+    cache_dependencies = ()
+    cache_timeout = 300
+
+    def get_cache_dependencies(self):
+        return self.cache_dependencies
+
+    def get(self, request, *args, **kwargs):
+        response = self.get_cached(request, *args, **kwargs)
+        patch_vary_headers(response, ("Accept",))
+        return response
+
+    def get_cached(self, request, *args, **kwargs):
+        key = get_cache_key(request, type(self).__name__, self.get_cache_dependencies())
+        entry = cache.get(key)
+        if entry is not None:
+            _stats["hits"] += 1
+            data, headers = entry
+            headers = {**headers, "X-Cache": "HIT"}
+            if "ETag" in headers:
+                last_modified = parse_http_date_safe(headers.get("Last-Modified", ""))
+                not_modified = get_conditional_response(
+                    request, etag=headers["ETag"], last_modified=last_modified,
+                )
+                if not_modified is not None:
+                    for name, value in headers.items():
+                        not_modified[name] = value
+                    return not_modified
+            return Response(data, headers=headers)
+
+        _stats["misses"] += 1
+        response = super().get(request, *args, **kwargs)
+        if response.status_code == 200:
+            headers = {name: response[name] for name in CACHED_HEADERS if name in response}
+            cache.set(key, (response.data, headers), self.cache_timeout)
+        response["X-Cache"] = "MISS"
+        return response
@@ -0,0 +1,73 @@
+"""
+Conditional GET (ETag / Last-Modified / 304) for the book endpoints.
+
+Validators are never computed from the rendered body, so a matching
+If-None-Match or If-Modified-Since is answered with 304 before the serializer
+runs. A detail ETag reads one row's timestamps; a list ETag is built from the
+api.cache model versions and runs no SQL at all.
+"""
+import hashlib
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from .cache import get_model_versions, normalize_query
+
+
+def make_etag(*parts):
+    return quote_etag(hashlib.md5("|".join(str(part) for part in parts).encode("utf-8")).hexdigest())
+
+
+class ConditionalGetMixin:
+    """
+    Adds ETag and Last-Modified to GET responses and answers matching
+    conditional requests with 304 Not Modified.
+    - detail views: validators come from the object's and its author's updated_at.
+    - list views: from the versions of the view's cache dependencies (see
+      api.cache), plus the query string (cursor, ordering, ...). Any write to
+      those models changes the ETag; lists carry no Last-Modified.
+    Both include the negotiated renderer format.
+    """
+
+    def get_validators(self):
+        """
+        Return (etag, last_modified) for this request, or (None, None) when the
+        object does not exist (the normal flow then returns 404).
+        """
+        variant = (self.request.accepted_renderer.format, normalize_query(self.request.query_params))
+
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        if lookup_url_kwarg in self.kwargs:
+            # The author's timestamp counts too: ?expand=author renders it.
+            row = (
+                self.filter_queryset(self.get_queryset()).filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+                .values_list("updated_at", "author__updated_at")
+                .first()
+            )
+            if row is None:
+                return None, None
+            return make_etag(*variant, self.kwargs[lookup_url_kwarg], *(ts.isoformat() for ts in row)), max(row)
+
+        versions = get_model_versions(self.get_cache_dependencies())
+        return make_etag(*variant, *versions), None
+
+    def get(self, request, *args, **kwargs):
+        etag, last_modified = self.get_validators()
+        if etag is not None:
+            not_modified = get_conditional_response(
+                request, etag=etag, last_modified=last_modified and int(last_modified.timestamp()),
+            )
+            if not_modified is not None:
+                return set_validators(not_modified, etag, last_modified)
+
+        response = super().get(request, *args, **kwargs)
+        if etag is not None and response.status_code == 200:
+            set_validators(response, etag, last_modified)
+        return response
+
+
+def set_validators(response, etag, last_modified):
+    response["ETag"] = etag
+    if last_modified is not None:
+        response["Last-Modified"] = http_date(last_modified.timestamp())
+    return response
@@ -0,0 +1,72 @@
+"""
+Streaming export of the book catalogue as NDJSON or CSV.
+
+Rows are read with QuerySet.iterator(chunk_size=...) and encoded as they are
+produced, so memory use does not depend on the size of the table. Used by
+BookExportView and the export_books management command.
+"""
+import csv
+import json
+
+EXPORT_FIELDS = ['id', 'title', 'publication_year', 'author', 'author_name']
+EXPORT_COLUMNS = ['id', 'title', 'publication_year', 'author_id', 'author__name']
+
+# Rows encoded per chunk handed to the response (one write per chunk, not per row).
+ROWS_PER_WRITE = 500
+
+
+def export_rows(queryset, chunk_size=2000):
+    return queryset.values_list(*EXPORT_COLUMNS).iterator(chunk_size=chunk_size)
+
+
+def _grouped(lines):
+    buffer = []
+    for line in lines:
+        buffer.append(line)
+        if len(buffer) >= ROWS_PER_WRITE:
+            yield ''.join(buffer)
+            buffer = []
+    if buffer:
+        yield ''.join(buffer)
+
+
+def ndjson_lines(rows):
+    """
+    One JSON object per line.
+    """
+    for row in rows:
+        yield json.dumps(dict(zip(EXPORT_FIELDS, row)), ensure_ascii=False) + '\n'
+
+
+class _Echo:
+    """
+    File-like object whose write() returns the value, so csv.writer
+    produces lines we can yield instead of storing them.
+    """
+
+    def write(self, value):
+        return value
+
+
+def csv_lines(rows):
+    """
+    A header line, then one line per book.
+    """
+    writer = csv.writer(_Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+FORMATS = {
+    'ndjson': (ndjson_lines, 'application/x-ndjson'),
+    'csv': (csv_lines, 'text/csv'),
+}
+
+
+def stream_export(queryset, export_format, chunk_size=2000):
+    """
+    Encoded chunks of the export of `queryset` in `export_format` ('ndjson' or 'csv').
+    """
+    encode, _ = FORMATS[export_format]
+    return _grouped(encode(export_rows(queryset, chunk_size)))
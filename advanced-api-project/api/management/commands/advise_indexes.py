@@ -0,0 +1,224 @@
+import json
+from itertools import combinations
+
+from django.core.exceptions import FieldDoesNotExist
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import ForeignKey, Index
+from django.db.models.constants import LOOKUP_SEP
+from django.test import RequestFactory
+from django.urls import get_resolver
+from django.utils import timezone
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework.mixins import ListModelMixin
+from rest_framework.request import Request
+
+FULL_SCAN = "full scan"
+TEMP_SORT = "temp b-tree sort"
+
+
+def iter_list_views(patterns=None, prefix=""):
+    """
+    Yield (route, view class) for every DRF list view in the URLconf.
+    """
+    if patterns is None:
+        patterns = get_resolver().url_patterns
+    for pattern in patterns:
+        route = prefix + str(pattern.pattern)
+        if hasattr(pattern, "url_patterns"):
+            yield from iter_list_views(pattern.url_patterns, route)
+            continue
+        view_class = getattr(pattern.callback, "view_class", None)
+        if view_class is not None and issubclass(view_class, ListModelMixin):
+            yield route, view_class
+
+
+def sample_value(model, path):
+    """
+    A value of the right type for an exact lookup on `path` (the value itself
+    does not matter to the query plan).
+    """
+    field = None
+    for name in path.split(LOOKUP_SEP):
+        field = model._meta.get_field(name)
+        if field.is_relation and field.related_model is not None:
+            model = field.related_model
+    if isinstance(field, ForeignKey):
+        return 1
+    internal_type = field.get_internal_type()
+    if "Integer" in internal_type or internal_type in ("AutoField", "BigAutoField", "FloatField", "DecimalField"):
+        return 1
+    if internal_type in ("DateTimeField", "DateField"):
+        return timezone.now()
+    if internal_type == "BooleanField":
+        return True
+    return "sample"
+
+
+def explain(queryset):
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute("EXPLAIN QUERY PLAN " + sql, params)
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def find_issues(plan):
+    issues = []
+    for step in plan:
+        if step.startswith("SCAN") and "VIRTUAL TABLE" not in step and " INDEX " not in step:
+            issues.append(FULL_SCAN)
+        if "USE TEMP B-TREE" in step:
+            issues.append(TEMP_SORT)
+    return sorted(set(issues))
+
+
+def suggest_index(model, filters, ordering):
+    """
+    Meta.indexes entry serving equality filters on `filters` followed by `ordering`,
+    named the way Django names an unnamed index (with a hash of the fields).
+    """
+    fields = [name for name in filters if LOOKUP_SEP not in name]
+    order_fields = [name for name in ordering if LOOKUP_SEP not in name.lstrip("-")]
+    try:
+        for name in order_fields:
+            model._meta.get_field(name.lstrip("-"))
+    except FieldDoesNotExist:
+        order_fields = []  # annotations such as search_rank cannot be indexed
+    if order_fields and all(name.startswith("-") for name in order_fields):
+        order_fields = [name.lstrip("-") for name in order_fields]  # SQLite scans an index backwards
+    fields += [name for name in order_fields if name not in fields]
+    if not fields:
+        return None
+    index = Index(fields=fields)
+    index.set_name_with_model(model)
+    return f"models.Index(fields={fields!r}, name={index.name!r})"
+
+
+class Command(BaseCommand):
+    help = (
+        "EXPLAIN QUERY PLAN every filterset_fields / search / ordering_fields combination "
+        "of every DRF list view, flag full table scans and temp B-tree sorts and suggest "
+        "Meta.indexes entries. With --baseline, exits non-zero when a combination gets "
+        "an issue it did not have in the baseline; with --strict, when any issue could "
+        "be fixed by an index."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--baseline", help="JSON file written by --write-baseline to compare against.")
+        parser.add_argument("--write-baseline", help="Save the issues found to this JSON file.")
+        parser.add_argument(
+            "--strict", action="store_true",
+            help="Exit non-zero on any issue an index could fix, not just regressions.",
+        )
+        parser.add_argument("--verbose-plans", action="store_true", help="Print the query plan of every combination.")
+
+    def handle(self, *args, **options):
+        if connection.vendor != "sqlite":
+            raise CommandError("advise_indexes reads SQLite EXPLAIN QUERY PLAN output.")
+
+        report = {}
+        self.fixable = 0
+        for route, view_class in iter_list_views():
+            report[view_class.__name__] = self.check_view(route, view_class, options["verbose_plans"])
+
+        if options["write_baseline"]:
+            with open(options["write_baseline"], "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2, sort_keys=True)
+            self.stdout.write(f"Baseline written to {options['write_baseline']}")
+
+        issues = sum(1 for view in report.values() for found in view.values() if found)
+        if options["baseline"]:
+            with open(options["baseline"], encoding="utf-8") as f:
+                baseline = json.load(f)
+            regressions = [
+                f"{view} [{combination}]: {', '.join(sorted(set(found) - set(baseline.get(view, {}).get(combination, []))))}"
+                for view, combinations_found in report.items()
+                for combination, found in combinations_found.items()
+                if set(found) - set(baseline.get(view, {}).get(combination, []))
+            ]
+            if regressions:
+                raise CommandError("Query plan regressions:\n  " + "\n  ".join(regressions))
+        if options["strict"] and self.fixable:
+            raise CommandError(f"{self.fixable} combination(s) scan or sort without an index that could serve them.")
+        self.stdout.write(self.style.SUCCESS(
+            f"Done: {issues} combination(s) with issues, {self.fixable} of them fixable with an index."
+        ))
+
+    def check_view(self, route, view_class, verbose):
+        filter_fields = list(getattr(view_class, "filterset_fields", None) or [])
+        search_fields = getattr(view_class, "search_fields", None)
+        ordering_fields = getattr(view_class, "ordering_fields", None)
+        if ordering_fields == "__all__" or not isinstance(ordering_fields, (list, tuple)):
+            ordering_fields = []
+        orderings = [None] + [prefix + name for name in ordering_fields for prefix in ("", "-")]
+
+        self.stdout.write(self.style.MIGRATE_HEADING(f"{view_class.__name__} (/{route})"))
+        results = {}
+        for size in range(len(filter_fields) + 1):
+            for filters in combinations(filter_fields, size):
+                for search in ([None, "sample"] if search_fields else [None]):
+                    for ordering in orderings:
+                        key = "filter={} search={} ordering={}".format(
+                            ",".join(filters) or "-", "yes" if search else "-", ordering or "-",
+                        )
+                        queryset, effective_ordering = self.build_queryset(view_class, filters, search, ordering)
+                        plan = explain(queryset)
+                        found = find_issues(plan)
+                        results[key] = found
+                        self.report(view_class, key, plan, found, filters, effective_ordering, verbose)
+        return results
+
+    def build_queryset(self, view_class, filters, search, ordering):
+        """
+        The queryset the view would run for this combination: exact filters
+        for filterset_fields, then the view's own search/ordering backends and
+        paginator ordering, limited to one page.
+        """
+        params = {}
+        if search:
+            params["search"] = search
+        if ordering:
+            params["ordering"] = ordering
+
+        view = view_class()
+        view.request = Request(RequestFactory().get("/", params))
+        view.format_kwarg = None
+        view.kwargs = {}
+        view.args = ()
+
+        queryset = view.get_queryset()
+        model = queryset.model
+        queryset = queryset.filter(**{name: sample_value(model, name) for name in filters})
+        for backend in view.filter_backends:
+            if not issubclass(backend, DjangoFilterBackend):
+                queryset = backend().filter_queryset(view.request, queryset, view)
+
+        effective_ordering = list(queryset.query.order_by)
+        paginator = view.paginator
+        if paginator is not None and hasattr(paginator, "get_keyset_ordering"):
+            effective_ordering = list(paginator.get_keyset_ordering(view.request, queryset, view))
+            queryset = queryset.order_by(*effective_ordering)
+        page_size = getattr(paginator, "page_size", None) or 100
+        return queryset[:page_size], effective_ordering
+
+    def report(self, view_class, key, plan, found, filters, ordering, verbose):
+        """
+        Print the combination's result. Issues an index could fix get a
+        suggestion and count towards --strict; the others (such as sorting
+        full-text matches by rank, or listing a whole table) are only shown.
+        """
+        if found:
+            self.stdout.write(self.style.WARNING(f"  {' + '.join(found).upper():<30} {key}"))
+            if any("VIRTUAL TABLE" in step for step in plan):
+                # Rows come from the full-text index; a B-tree index cannot order them.
+                suggestion = None
+            else:
+                suggestion = suggest_index(view_class.queryset.model, filters, ordering)
+            if suggestion:
+                self.fixable += 1
+                self.stdout.write(f"      suggest: {suggestion}")
+        else:
+            self.stdout.write(f"  {'ok':<30} {key}")
+        if verbose or found:
+            for step in plan:
+                self.stdout.write(f"      plan: {step}")
@@ -0,0 +1,76 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api import benchmarks
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the book endpoints (list, filter, search, ordering, detail, create) "
+        "against bulk-loaded data that is rolled back afterwards. Reports p50/p95/p99 "
+        "latency, queries per request and peak memory; compares with a baseline run."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--books", type=int, default=10000, help="Books to seed (default: 10000).")
+        parser.add_argument("--authors", type=int, help="Authors to seed (default: books / 10).")
+        parser.add_argument("--requests", type=int, default=50, help="Timed requests per scenario.")
+        parser.add_argument("--scenario", action="append", choices=[
+            "list", "filter", "search", "ordering", "detail", "create",
+        ], help="Only run this scenario (repeatable).")
+        parser.add_argument("--use-cache", action="store_true", help="Leave the response cache on.")
+        parser.add_argument("--output", help="Write the results as JSON to this file.")
+        parser.add_argument("--results", help="Compare this results file instead of running the benchmarks.")
+        parser.add_argument("--baseline", help="Results JSON of an earlier run to compare against.")
+        parser.add_argument(
+            "--threshold", type=float, default=0.2,
+            help="Relative increase counted as a regression (default: 0.2 = 20%%).",
+        )
+
+    def handle(self, *args, **options):
+        if options["results"]:
+            with open(options["results"], encoding="utf-8") as f:
+                current = json.load(f)
+        else:
+            if options["books"] < 1 or options["requests"] < 1:
+                raise CommandError("--books and --requests must be positive integers.")
+            authors = options["authors"] or max(1, options["books"] // 10)
+            current = benchmarks.run_benchmarks(
+                options["books"], authors, options["requests"],
+                scenarios=options["scenario"], use_cache=options["use_cache"],
+            )
+
+        self.write_results(current)
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as f:
+                json.dump(current, f, indent=2)
+            self.stdout.write(f"Results written to {options['output']}")
+
+        if options["baseline"]:
+            with open(options["baseline"], encoding="utf-8") as f:
+                baseline = json.load(f)
+            rows, regressions = benchmarks.compare_results(baseline, current, options["threshold"])
+            self.write_comparison(rows, options["threshold"])
+            if regressions:
+                raise CommandError(
+                    f"{len(regressions)} metric(s) regressed by more than {options['threshold']:.0%}."
+                )
+            self.stdout.write(self.style.SUCCESS("No regressions."))
+
+    def write_results(self, current):
+        meta = current["meta"]
+        self.stdout.write(
+            f"{meta['books']} books, {meta['authors']} authors, {meta['requests']} requests per scenario"
+        )
+        self.stdout.write(f"{'scenario':<10} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'queries':>8} {'peak KB':>9}")
+        for name, m in current["results"].items():
+            self.stdout.write(
+                f"{name:<10} {m['p50_ms']:>9.2f} {m['p95_ms']:>9.2f} {m['p99_ms']:>9.2f} "
+                f"{m['queries']:>8} {m['peak_memory_kb']:>9.1f}"
+            )
+
+    def write_comparison(self, rows, threshold):
+        for name, metric, old, new, change in rows:
+            line = f"{name:<10} {metric:<15} {old:>10} -> {new:<10} {change:+.0%}"
+            self.stdout.write(self.style.ERROR(line) if change > threshold else line)
@@ -0,0 +1,42 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api import benchmarks
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare throughput of the sync and async book views under concurrent load, "
+        "using an in-process ASGI load generator. Data is rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--books", type=int, default=10000, help="Books to seed (default: 10000).")
+        parser.add_argument("--authors", type=int, help="Authors to seed (default: books / 10).")
+        parser.add_argument("--requests", type=int, default=200, help="Requests per scenario and variant.")
+        parser.add_argument("--concurrency", type=int, default=20, help="Requests in flight at once.")
+        parser.add_argument("--output", help="Write the results as JSON to this file.")
+
+    def handle(self, *args, **options):
+        if min(options["books"], options["requests"], options["concurrency"]) < 1:
+            raise CommandError("--books, --requests and --concurrency must be positive integers.")
+        authors = options["authors"] or max(1, options["books"] // 10)
+        current = benchmarks.run_concurrency_benchmark(
+            options["books"], authors, options["requests"], options["concurrency"],
+        )
+
+        self.stdout.write(
+            f"{options['books']} books, {options['requests']} requests per run, "
+            f"concurrency {options['concurrency']}"
+        )
+        self.stdout.write(f"{'scenario':<16} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9}")
+        for name, m in current["results"].items():
+            self.stdout.write(f"{name:<16} {m['throughput_rps']:>9.1f} {m['p50_ms']:>9.2f} {m['p95_ms']:>9.2f}")
+        for caveat in current["meta"]["caveats"]:
+            self.stdout.write(f"Note: {caveat}")
+
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as f:
+                json.dump(current, f, indent=2)
+            self.stdout.write(f"Results written to {options['output']}")
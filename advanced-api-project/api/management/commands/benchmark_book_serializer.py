@@ -0,0 +1,62 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from api.models import Author, Book
+from api.serializers import BookSerializer, get_values_serializer
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare rows/sec of BookSerializer(many=True) over model instances with the "
+        ".values() fast path, and check both render to identical JSON. "
+        "Sample rows are created inside a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=20000, help="Books to serialize (default: 20000).")
+        parser.add_argument("--repeat", type=int, default=3, help="Runs per path; the best is kept.")
+
+    def handle(self, *args, **options):
+        rows, repeat = options["rows"], options["repeat"]
+        if rows < 1 or repeat < 1:
+            raise CommandError("--rows and --repeat must be positive integers.")
+
+        with transaction.atomic():
+            author = Author.objects.create(name="Benchmark Author")
+            Book.objects.bulk_create(
+                (Book(title=f"Benchmark book {i}", publication_year=1900 + i % 120, author=author)
+                 for i in range(rows)),
+                batch_size=1000,
+            )
+            queryset = Book.objects.filter(author=author).order_by("id")
+            fast = get_values_serializer(BookSerializer)
+            renderer = JSONRenderer()
+
+            def serializer_path():
+                return renderer.render(BookSerializer(queryset.all(), many=True).data)
+
+            def values_path():
+                return renderer.render(fast.to_representation(fast.get_queryset(queryset.all())))
+
+            results = {}
+            for name, run in (("BookSerializer", serializer_path), ("ValuesSerializer", values_path)):
+                best, output = None, None
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    output = run()
+                    elapsed = time.perf_counter() - start
+                    best = elapsed if best is None else min(best, elapsed)
+                results[name] = (best, output)
+                self.stdout.write(f"{name:<18} {rows / best:>12,.0f} rows/sec  ({best * 1000:.1f} ms)")
+
+            transaction.set_rollback(True)
+
+        slow, fast_result = results["BookSerializer"], results["ValuesSerializer"]
+        if slow[1] != fast_result[1]:
+            raise CommandError("The two paths rendered different JSON.")
+        self.stdout.write(self.style.SUCCESS(
+            f"Identical output; .values() path is {slow[0] / fast_result[0]:.1f}x faster."
+        ))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from api import statistics
+
+
+class Command(BaseCommand):
+    help = "Rebuild the books-per-year and per-author statistics tables from the Book table."
+
+    def handle(self, *args, **options):
+        years, authors = statistics.rebuild_statistics()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt statistics for {years} years and {authors} authors."))
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from api import statistics
+
+
+class Command(BaseCommand):
+    help = "Recompute the denormalized Author.book_count and latest_publication_year columns."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=1000,
+            help="Number of authors checked per batch (default: 1000).",
+        )
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be a positive integer.")
+
+        checked, corrected = statistics.repair_author_counts(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Checked {checked} authors, corrected {corrected}."))
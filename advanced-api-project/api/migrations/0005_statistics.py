@@ -0,0 +1,53 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:26
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Max, Min
+
+
+def populate_statistics(apps, schema_editor):
+    Book = apps.get_model('api', 'Book')
+    PublicationYearStatistics = apps.get_model('api', 'PublicationYearStatistics')
+    AuthorStatistics = apps.get_model('api', 'AuthorStatistics')
+    PublicationYearStatistics.objects.bulk_create(
+        PublicationYearStatistics(publication_year=row['publication_year'], book_count=row['book_count'])
+        for row in Book.objects.values('publication_year').annotate(book_count=Count('id')).order_by()
+    )
+    AuthorStatistics.objects.bulk_create(
+        AuthorStatistics(author_id=row.pop('author'), **row)
+        for row in Book.objects.values('author').annotate(
+            book_count=Count('id'),
+            first_publication_year=Min('publication_year'),
+            last_publication_year=Max('publication_year'),
+        ).order_by()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PublicationYearStatistics',
+            fields=[
+                ('publication_year', models.IntegerField(primary_key=True, serialize=False)),
+                ('book_count', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='AuthorStatistics',
+            fields=[
+                ('author', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='statistics', serialize=False, to='api.author')),
+                ('book_count', models.PositiveIntegerField(default=0)),
+                ('first_publication_year', models.IntegerField()),
+                ('last_publication_year', models.IntegerField()),
+            ],
+            options={
+                'indexes': [models.Index(fields=['book_count', 'author'], name='author_stats_count_idx'), models.Index(fields=['first_publication_year', 'author'], name='author_stats_first_idx'), models.Index(fields=['last_publication_year', 'author'], name='author_stats_last_idx')],
+            },
+        ),
+        migrations.RunPython(populate_statistics, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:31
+
+from django.db import migrations, models
+from django.db.models import Count, Max
+
+
+def populate_author_counts(apps, schema_editor):
+    Author = apps.get_model('api', 'Author')
+    Book = apps.get_model('api', 'Book')
+    authors = [
+        Author(pk=row['author'], book_count=row['book_count'], latest_publication_year=row['latest'])
+        for row in Book.objects.values('author').annotate(book_count=Count('id'), latest=Max('publication_year')).order_by()
+    ]
+    Author.objects.bulk_update(authors, ['book_count', 'latest_publication_year'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0005_statistics'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='author',
+            name='book_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='author',
+            name='latest_publication_year',
+            field=models.IntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='author',
+            index=models.Index(fields=['book_count', 'id'], name='author_book_count_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='author',
+            index=models.Index(fields=['latest_publication_year', 'id'], name='author_latest_year_idx'),
+        ),
+        migrations.RunPython(populate_author_counts, migrations.RunPython.noop),
+    ]
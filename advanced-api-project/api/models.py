@@ -6,8 +6,33 @@ class Author(models.Model):
     Represents an author who can have multiple books.
     Fields:
         - name: The author's full name (string).
+        - updated_at: When the author was last saved (used for ETag/Last-Modified).
+        - book_count / latest_publication_year: Denormalized from the author's
+          books, maintained by api.signals (see api.statistics) and repaired
+          with `python manage.py repair_author_counts`. save() never writes
+          them, so a stale instance can't overwrite a concurrent update.
     """
+    DENORMALIZED_FIELDS = ("book_count", "latest_publication_year")
+
     name = models.CharField(max_length=100)
+    updated_at = models.DateTimeField(auto_now=True)
+    book_count = models.PositiveIntegerField(default=0, editable=False)
+    latest_publication_year = models.IntegerField(null=True, blank=True, editable=False)
+
+    class Meta:
+        # Ordering and range filters of AuthorListCreateView.
+        indexes = [
+            models.Index(fields=["book_count", "id"], name="author_book_count_idx"),
+            models.Index(fields=["latest_publication_year", "id"], name="author_latest_year_idx"),
+        ]
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            kwargs["update_fields"] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.DENORMALIZED_FIELDS
+            ]
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return self.name
@@ -20,10 +45,90 @@ class Book(models.Model):
         - title: The book's title.
         - publication_year: Year the book was published.
         - author: ForeignKey to Author (One-to-Many relationship).
+        - updated_at: When the book was last saved (used for ETag/Last-Modified).
     """
     title = models.CharField(max_length=200)
     publication_year = models.IntegerField()
     author = models.ForeignKey(Author, related_name="books", on_delete=models.CASCADE)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        # Composite indexes for keyset pagination: each ordering BookListView
+        # allows, followed by the id tiebreaker.
+        indexes = [
+            models.Index(fields=["title", "id"], name="book_title_id_idx"),
+            models.Index(fields=["publication_year", "id"], name="book_year_id_idx"),
+            models.Index(fields=["title", "publication_year", "id"], name="book_title_year_id_idx"),
+            models.Index(fields=["publication_year", "title", "id"], name="book_year_title_id_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.title} ({self.publication_year})"
+
+
+class BookSearchIndex(models.Model):
+    """
+    Read-only mapping of the api_book_fts FTS5 table (one row per book).
+    The table is created by a migration and kept in sync by api.signals;
+    see api.search for how it is queried.
+    Fields:
+        - book: The indexed book; its id is the FTS rowid.
+        - title / author_name: The indexed text.
+        - match: The hidden column named after the table, used for MATCH queries.
+        - rank: BM25 relevance of the current match (lower is better).
+    """
+    book = models.OneToOneField(
+        Book, primary_key=True, db_column="rowid", db_constraint=False,
+        related_name="search_index", on_delete=models.DO_NOTHING,
+    )
+    title = models.TextField()
+    author_name = models.TextField()
+    match = models.TextField(db_column="api_book_fts")
+    rank = models.FloatField()
+
+    class Meta:
+        managed = False
+        db_table = "api_book_fts"
+
+class PublicationYearStatistics(models.Model):
+    """
+    Precomputed number of books per publication year, for the statistics
+    endpoints. One row per year that has books.
+    Kept up to date by api.signals (see api.statistics); rebuilt from the Book
+    table with `python manage.py rebuild_statistics`.
+    Fields:
+        - publication_year: The year.
+        - book_count: Number of books published that year.
+    """
+    publication_year = models.IntegerField(primary_key=True)
+    book_count = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.publication_year}: {self.book_count} books"
+
+
+class AuthorStatistics(models.Model):
+    """
+    Precomputed per-author book statistics. One row per author with books.
+    Maintained like PublicationYearStatistics.
+    Fields:
+        - author: The author (primary key).
+        - book_count: Number of books by the author.
+        - first_publication_year / last_publication_year: Earliest and latest
+          publication year of those books.
+    """
+    author = models.OneToOneField(Author, primary_key=True, related_name="statistics", on_delete=models.CASCADE)
+    book_count = models.PositiveIntegerField(default=0)
+    first_publication_year = models.IntegerField()
+    last_publication_year = models.IntegerField()
+
+    class Meta:
+        # Keyset pagination of each ordering AuthorStatisticsView allows.
+        indexes = [
+            models.Index(fields=["book_count", "author"], name="author_stats_count_idx"),
+            models.Index(fields=["first_publication_year", "author"], name="author_stats_first_idx"),
+            models.Index(fields=["last_publication_year", "author"], name="author_stats_last_idx"),
+        ]
 
     def __str__(self):
-        return f"{self.title} ({self.publication_year})"
\ No newline at end of file
+        return f"{self.author_id}: {self.book_count} books"
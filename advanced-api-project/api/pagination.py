@@ -0,0 +1,218 @@
+import json
+from base64 import b64decode, b64encode
+from collections import namedtuple
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+from django_common.pagination import get_estimated_count
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+Cursor = namedtuple('Cursor', ['position', 'reverse'])
+
+
+def _invert(ordering):
+    """
+    Flip the direction of every field in an ordering tuple.
+    """
+    return tuple(field[1:] if field.startswith('-') else '-' + field for field in ordering)
+
+
+class KeysetCursorPagination(CursorPagination):
+    """
+    Cursor pagination that seeks with a WHERE clause instead of OFFSET.
+
+    The cursor stores the values of every ordering field of the last row seen,
+    plus the primary key as a tiebreaker, so pages stay stable however many
+    rows share a title or publication year. The ordering comes from the view's
+    OrderingFilter (?ordering=...), so any ordering_fields combination works.
+    No page runs SELECT COUNT(*); unless include_estimated_count is turned off,
+    the response carries an 'estimated_count' from get_estimated_count()
+    (null until the first background count finishes).
+    Usage: ?cursor=<opaque value from the next/previous links>&page_size=50
+    """
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = ('title',)
+    tiebreaker = 'id'
+    include_estimated_count = True
+
+    def get_keyset_ordering(self, request, queryset, view):
+        """
+        The active ordering with the tiebreaker appended. The tiebreaker runs in
+        the same direction as the last field, so one composite index serves both
+        the ascending and the descending ordering.
+        """
+        ordering = list(self.get_ordering(request, queryset, view))
+        names = {field.lstrip('-') for field in ordering}
+        if self.tiebreaker not in names and 'pk' not in names:
+            direction = '-' if ordering and ordering[-1].startswith('-') else ''
+            ordering.append(direction + self.tiebreaker)
+        return tuple(ordering)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        page_queryset = self.get_page_queryset(queryset, request, view)
+        if page_queryset is None:
+            return None
+        if self.include_estimated_count:
+            self.estimated_count = get_estimated_count(queryset)
+        return self.set_page(list(page_queryset))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """
+        Async variant of paginate_queryset for views running on the async ORM.
+        """
+        page_queryset = self.get_page_queryset(queryset, request, view)
+        if page_queryset is None:
+            return None
+        if self.include_estimated_count:
+            self.estimated_count = await sync_to_async(get_estimated_count)(queryset)
+        return self.set_page([row async for row in page_queryset])
+
+    def get_page_queryset(self, queryset, request, view=None):
+        """
+        The (unevaluated) query for this page: seek past the cursor and fetch
+        one extra row to find out whether there is a page beyond this one.
+        """
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_keyset_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+
+        reverse = self.cursor is not None and self.cursor.reverse
+        ordering = _invert(self.ordering) if reverse else self.ordering
+        queryset = queryset.order_by(*ordering)
+        if self.cursor is not None:
+            position = self.parse_position(queryset.model, self.cursor.position)
+            queryset = queryset.filter(self.get_keyset_filter(ordering, position))
+        return queryset[:self.page_size + 1]
+
+    def set_page(self, results):
+        reverse = self.cursor is not None and self.cursor.reverse
+        has_more = len(results) > self.page_size
+        self.page = results[:self.page_size]
+
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, self.cursor is not None
+        return self.page
+
+    def get_paginated_response(self, data):
+        if not self.include_estimated_count:
+            return super().get_paginated_response(data)
+        return Response({
+            'estimated_count': self.estimated_count,
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_keyset_filter(self, ordering, position):
+        """
+        Rows strictly after `position` in `ordering`:
+        (a > x) OR (a = x AND b > y) OR (a = x AND b = y AND id > z)
+        """
+        keyset = Q()
+        equal = {}
+        for field, value in zip(ordering, position):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            keyset |= Q(**equal, **{f'{name}__{lookup}': value})
+            equal[name] = value
+        return keyset
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        if self.page:
+            position = self._get_position_from_instance(self.page[-1], self.ordering)
+        else:
+            position = self.cursor.position
+        return self.encode_cursor(Cursor(position=position, reverse=False))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if self.page:
+            position = self._get_position_from_instance(self.page[0], self.ordering)
+        else:
+            position = self.cursor.position
+        return self.encode_cursor(Cursor(position=position, reverse=True))
+
+    def _get_position_from_instance(self, instance, ordering):
+        # Pages hold model instances, or dicts when a view renders from .values().
+        if isinstance(instance, dict):
+            return [instance[field.lstrip('-')] for field in ordering]
+        return [getattr(instance, field.lstrip('-')) for field in ordering]
+
+    def decode_cursor(self, request):
+        """
+        Given a request with a cursor, return a `Cursor` instance.
+        A cursor built for a different ordering, or tampered with, is rejected
+        as invalid. The position values are still raw JSON here; see
+        parse_position().
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+
+        try:
+            data = json.loads(b64decode(encoded.encode('ascii')).decode('utf-8'))
+            ordering, position, reverse = data['o'], data['p'], bool(data['r'])
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+
+        if not isinstance(ordering, list) or not all(isinstance(field, str) for field in ordering):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list) or tuple(ordering) != self.ordering or len(position) != len(ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return Cursor(position=position, reverse=reverse)
+
+    def parse_position(self, model, position):
+        """
+        Convert the cursor's position values with their ordering fields'
+        to_python(), so a tampered value is a 404, not an error in the query.
+        """
+        values = []
+        for field_name, value in zip(self.ordering, position):
+            name = field_name.lstrip('-')
+            try:
+                field = model._meta.pk if name == 'pk' else model._meta.get_field(name)
+            except FieldDoesNotExist:
+                values.append(value)  # an annotation: nothing to convert with
+                continue
+            try:
+                value = field.to_python(value)
+            except (TypeError, ValueError, ValidationError):
+                raise NotFound(self.invalid_cursor_message)
+            if value is None:
+                # NULLs cannot be compared with > / <, so no cursor holds them.
+                raise NotFound(self.invalid_cursor_message)
+            values.append(value)
+        return values
+
+    def encode_cursor(self, cursor):
+        """
+        Given a Cursor instance, return a URL with the encoded cursor.
+        """
+        data = {'o': list(self.ordering), 'p': cursor.position, 'r': int(cursor.reverse)}
+        encoded = b64encode(json.dumps(data, default=str).encode('utf-8')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+
+class AuthorStatisticsPagination(KeysetCursorPagination):
+    """
+    Keyset pagination for the author statistics, most books first.
+    """
+    ordering = ('-book_count',)
+    tiebreaker = 'author_id'
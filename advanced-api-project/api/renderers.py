@@ -0,0 +1,122 @@
+"""
+Faster JSON and MessagePack renderers/parsers for the API.
+
+FastJSONRenderer/FastJSONParser use orjson when it is installed and fall back
+to DRF's JSONRenderer/JSONParser otherwise, so the accelerator is optional.
+The output is byte-for-byte what JSONRenderer produces: types orjson doesn't
+encode the DRF way (datetimes, Decimal, lazy strings, ...) go through DRF's
+JSONEncoder, float exponents are rewritten the way repr() writes them (1e16 ->
+1e+16, 1e-7 -> 1e-07), U+2028/U+2029 are escaped, and data orjson can't encode
+at all (ints beyond 64 bits) is rendered by JSONRenderer. The one difference:
+a NaN or infinite float renders as null instead of raising.
+
+MessagePackRenderer/MessagePackParser (application/msgpack) need the msgpack
+package; settings.py only offers them when it is installed. Values are
+encoded like the JSON renderer would (e.g. datetimes as ISO 8601 strings).
+Clients pick a format with the Accept header (or ?format=msgpack).
+"""
+import re
+
+from rest_framework import renderers
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser, JSONParser
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional accelerator
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional format
+    msgpack = None
+
+_default = encoders.JSONEncoder().default
+
+# A digit followed by an exponent; when present, strings are matched too so
+# that text inside them is left alone.
+_EXPONENT_HINT = re.compile(rb'\de-?\d')
+_STRING_OR_EXPONENT = re.compile(rb'"(?:[^"\\]|\\.)*"|(?<=\d)e(-?)(\d+)')
+
+
+def _repr_exponent(match):
+    if match.group(2) is None:
+        return match.group(0)
+    return b'e' + (match.group(1) or b'+') + match.group(2).zfill(2)
+
+
+class FastJSONRenderer(renderers.JSONRenderer):
+    """
+    JSONRenderer backed by orjson for compact, non-ASCII-escaped output
+    (DRF's defaults). Indented or ASCII-only output uses the stdlib encoder.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None or data is None or self.ensure_ascii or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(
+                data, default=_default,
+                option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS,
+            )
+        except orjson.JSONEncodeError:
+            # Ints beyond 64 bits, or a type nothing can encode (JSONRenderer
+            # then raises the same TypeError it always would).
+            return super().render(data, accepted_media_type, renderer_context)
+        if _EXPONENT_HINT.search(ret):
+            ret = _STRING_OR_EXPONENT.sub(_repr_exponent, ret)
+        # Like JSONRenderer: keep the output a strict JavaScript subset.
+        if b'\xe2\x80' in ret:
+            ret = ret.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
+        return ret
+
+
+class FastJSONParser(JSONParser):
+    """
+    JSONParser backed by orjson for UTF-8 request bodies.
+    """
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = (parser_context or {}).get('encoding', 'utf-8')
+        if orjson is None or encoding.lower().replace('-', '') != 'utf8':
+            return super().parse(stream, media_type, parser_context)
+        try:
+            # Like JSONParser with STRICT_JSON, orjson rejects NaN and Infinity.
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
+
+
+class MessagePackRenderer(renderers.BaseRenderer):
+    """
+    Renders the response data as MessagePack.
+    """
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return msgpack.packb(data, default=_default, use_bin_type=True, datetime=False)
+
+
+class MessagePackParser(BaseParser):
+    """
+    Parses a MessagePack request body.
+    """
+    media_type = 'application/msgpack'
+    renderer_class = MessagePackRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return msgpack.unpackb(stream.read(), raw=False, strict_map_key=False)
+        except (ValueError, msgpack.ExtraData, msgpack.FormatError, msgpack.StackError) as exc:
+            raise ParseError('MessagePack parse error - %s' % str(exc))
@@ -0,0 +1,145 @@
+"""
+Full-text search for books backed by an SQLite FTS5 table.
+
+api_book_fts holds one row per book (rowid = book id) with the book title and
+the author name. api.signals keeps it in sync on Book/Author save and delete;
+bulk loads bypass signals, so run `python manage.py rebuild_search_index`
+after them.
+"""
+import re
+
+from django.db import connection, transaction
+from django.db.models import F
+from rest_framework.filters import OrderingFilter, SearchFilter
+
+from .cache import bump_model_version
+from .models import Book, BookSearchIndex
+
+FTS_TABLE = BookSearchIndex._meta.db_table
+
+CREATE_TABLE_SQL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    "title, author_name, tokenize = 'unicode61 remove_diacritics 2')"
+)
+DROP_TABLE_SQL = f"DROP TABLE IF EXISTS {FTS_TABLE}"
+
+
+def is_supported(conn=connection):
+    """
+    FTS5 is an SQLite feature; other databases fall back to SearchFilter.
+    """
+    return conn.vendor == "sqlite"
+
+
+def build_match_expression(search):
+    """
+    Turn user input into an FTS5 query: every word must match, and the last
+    characters typed may be the start of a longer word ("clea" finds "Clean").
+    Returns None when there is nothing searchable in the input.
+    """
+    terms = [term for term in search.replace(",", " ").split() if re.search(r"\w", term)]
+    if not terms:
+        return None
+    return " ".join('"{}"*'.format(term.replace('"', '""')) for term in terms)
+
+
+def index_rows(rows):
+    """
+    Insert or replace (id, title, author_name) rows in the index.
+    """
+    rows = list(rows)
+    if not rows:
+        return
+    with connection.cursor() as cursor:
+        placeholders = ", ".join(["%s"] * len(rows))
+        cursor.execute(
+            f"DELETE FROM {FTS_TABLE} WHERE rowid IN ({placeholders})",
+            [row[0] for row in rows],
+        )
+        cursor.executemany(
+            f"INSERT INTO {FTS_TABLE} (rowid, title, author_name) VALUES (%s, %s, %s)",
+            rows,
+        )
+
+
+def index_books(queryset):
+    """
+    (Re)index every book in the queryset.
+    """
+    index_rows(queryset.values_list("id", "title", "author__name"))
+
+
+def unindex_books(ids, batch_size=500):
+    """
+    Remove books from the index, batch_size ids per DELETE (SQLite limits
+    the number of query parameters).
+    """
+    ids = list(ids)
+    with connection.cursor() as cursor:
+        for start in range(0, len(ids), batch_size):
+            batch = ids[start:start + batch_size]
+            placeholders = ", ".join(["%s"] * len(batch))
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid IN ({placeholders})", batch)
+
+
+def rebuild_index(batch_size=1000):
+    """
+    Rebuild the whole index from api_book, reading batch_size books at a time
+    (keyset on id, so memory stays flat). Returns the number of books indexed.
+    """
+    total = 0
+    last_id = 0
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(DROP_TABLE_SQL)
+            cursor.execute(CREATE_TABLE_SQL)
+        while True:
+            rows = list(
+                Book.objects.filter(id__gt=last_id)
+                .order_by("id")
+                .values_list("id", "title", "author__name")[:batch_size]
+            )
+            if not rows:
+                break
+            with connection.cursor() as cursor:
+                cursor.executemany(
+                    f"INSERT INTO {FTS_TABLE} (rowid, title, author_name) VALUES (%s, %s, %s)",
+                    rows,
+                )
+            total += len(rows)
+            last_id = rows[-1][0]
+    # Search results may have changed under cached responses.
+    bump_model_version(Book)
+    return total
+
+
+class FullTextSearchFilter(SearchFilter):
+    """
+    Drop-in replacement for SearchFilter that answers ?search= from the FTS5
+    index instead of LIKE '%x%' over title and author__name. Matching books
+    are annotated with `search_rank` (BM25, lower is more relevant).
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        if not is_supported():
+            return super().filter_queryset(request, queryset, view)
+
+        expression = build_match_expression(request.query_params.get(self.search_param, ""))
+        if expression is None:
+            return queryset
+        return queryset.filter(search_index__match=expression).annotate(
+            search_rank=F("search_index__rank")
+        )
+
+
+class RankedOrderingFilter(OrderingFilter):
+    """
+    OrderingFilter that orders search results by relevance unless the client
+    asked for an explicit ?ordering=.
+    """
+
+    def get_ordering(self, request, queryset, view):
+        searching = build_match_expression(request.query_params.get(SearchFilter.search_param, ""))
+        if searching and is_supported() and not request.query_params.get(self.ordering_param):
+            return ["search_rank"]
+        return super().get_ordering(request, queryset, view)
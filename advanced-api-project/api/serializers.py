@@ -1,16 +1,178 @@
+from functools import lru_cache
+
 from rest_framework import serializers
-from .models import Author, Book
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from django.utils import timezone
+from .models import Author, AuthorStatistics, Book, PublicationYearStatistics
 from datetime import datetime
 
 
-class BookSerializer(serializers.ModelSerializer):
+class BulkListSerializer(serializers.ListSerializer):
+    """
+    ListSerializer used for BookSerializer(many=True). Writes with bulk_create /
+    bulk_update instead of one query per item.
+    Context options:
+        - batch_size: rows per INSERT/UPDATE statement.
+        - allow_partial: keep the valid items instead of failing the whole list;
+          the others are reported in `item_errors` as {'index', 'errors'}.
+    For updates, pass the instances and include 'id' in every item; an id
+    may appear only once per list.
+    """
+
+    def run_child_validation(self, data):
+        if self.instance is not None:
+            if not hasattr(self, '_instance_map'):
+                self._instance_map = {obj.pk: obj for obj in self.instance}
+            pk = data.get('id') if isinstance(data, dict) else None
+            if pk not in self._instance_map:
+                raise serializers.ValidationError({'id': ['No book with this id.']})
+            if pk in self._seen_ids:
+                # bulk_update would write the same row twice, the last item winning.
+                raise serializers.ValidationError({'id': ['Duplicate id: each book may appear only once.']})
+            self._seen_ids.add(pk)
+            self.child.instance = self._instance_map[pk]
+            self.child.initial_data = data
+
+        validated = super().run_child_validation(data)
+        self._validated_instances.append(self.child.instance)
+        return validated
+
+    def to_internal_value(self, data):
+        self._validated_instances = []
+        self._seen_ids = set()
+        self.item_errors = []
+        if not self.context.get('allow_partial') or not isinstance(data, list):
+            return super().to_internal_value(data)
+
+        valid = []
+        for index, item in enumerate(data):
+            try:
+                valid.append(self.run_child_validation(item))
+            except serializers.ValidationError as exc:
+                self.item_errors.append({'index': index, 'errors': exc.detail})
+        return valid
+
+    def create(self, validated_data):
+        model = self.child.Meta.model
+        objs = [model(**attrs) for attrs in validated_data]
+        return model.objects.bulk_create(objs, batch_size=self.context.get('batch_size'))
+
+    def update(self, instance, validated_data):
+        model = self.child.Meta.model
+        fields = {'updated_at'}
+        now = timezone.now()
+        for obj, attrs in zip(self._validated_instances, validated_data):
+            for attr, value in attrs.items():
+                setattr(obj, attr, value)
+            obj.updated_at = now  # bulk_update skips auto_now
+            fields.update(attrs)
+        objs = self._validated_instances
+        model.objects.bulk_update(objs, sorted(fields), batch_size=self.context.get('batch_size'))
+        return objs
+
+
+def _split_names(value):
+    return tuple(dict.fromkeys(name.strip() for name in value.split(',') if name.strip()))
+
+
+def _group_names(names):
+    """
+    ('id', 'books.title', 'books.author') -> {'id': [], 'books': ['title', 'author']}
+    """
+    grouped = {}
+    for name in names:
+        head, _, rest = name.partition('.')
+        grouped.setdefault(head, [])
+        if rest:
+            grouped[head].append(rest)
+    return grouped
+
+
+def get_field_options(request):
+    """
+    Read ?fields=id,title and ?expand=author from a request, as the keyword
+    arguments DynamicFieldsMixin takes: {'fields': tuple or None, 'expand': tuple}.
+    Blank names are dropped, and ?fields= without any name (e.g. ?fields=,)
+    selects every field, like no ?fields= at all.
+    """
+    params = request.query_params if request is not None else {}
+    fields, expand = params.get('fields'), params.get('expand')
+    return {
+        'fields': _split_names(fields or '') or None,
+        'expand': _split_names(expand or ''),
+    }
+
+
+class DynamicFieldsMixin:
+    """
+    Sparse fieldsets and on-demand expansion for a ModelSerializer.
+        - fields: the names to render (default: all). 'books.title' keeps
+          'books' and trims the nested serializer down to 'title'.
+        - expand: relations to render with the serializer given in
+          Meta.expandable_fields ({name: (serializer class or its name, kwargs)})
+          instead of their default representation. 'books.author' expands
+          inside a nested serializer.
+    Both can be passed as keyword arguments; otherwise the top-level serializer
+    reads them from the request's ?fields= and ?expand=. Unknown names are
+    ignored. Serializers given input data are left alone, so writes always
+    see every field.
+    """
+
+    def __init__(self, *args, fields=None, expand=None, **kwargs):
+        self.requested_fields = fields
+        self.requested_expand = expand
+        super().__init__(*args, **kwargs)
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if hasattr(self.root, 'initial_data'):
+            return fields
+
+        requested, expand = self.requested_fields, self.requested_expand
+        parent = self.parent.parent if isinstance(self.parent, serializers.ListSerializer) else self.parent
+        if requested is None and expand is None and parent is None:
+            options = get_field_options(self.context.get('request'))
+            requested, expand = options['fields'], options['expand']
+
+        nested_fields = _group_names(requested or ())
+        nested_expand = _group_names(expand or ())
+        expandable = getattr(self.Meta, 'expandable_fields', {})
+        if requested is not None:
+            fields = {name: field for name, field in fields.items() if name in nested_fields}
+
+        for name, field in list(fields.items()):
+            # 'books' asks for every nested field, 'books.title' for some of them.
+            child_fields = None if requested is None or name in requested else tuple(nested_fields[name])
+            child_expand = tuple(nested_expand.get(name, ()))
+            if name in nested_expand and name in expandable:
+                serializer_class, kwargs = expandable[name]
+                if isinstance(serializer_class, str):
+                    serializer_class = globals()[serializer_class]
+                kwargs = {'read_only': True, **kwargs, 'expand': child_expand}
+                if child_fields is not None:
+                    kwargs['fields'] = child_fields
+                fields[name] = serializer_class(**kwargs)
+                continue
+
+            child = field.child if isinstance(field, serializers.ListSerializer) else field
+            if isinstance(child, DynamicFieldsMixin):
+                child.requested_fields = child_fields
+                child.requested_expand = child_expand
+        return fields
+
+
+class BookSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """
     Serializes all fields of the Book model.
     Includes validation to ensure the publication_year is not in the future.
+    With many=True, saves go through BulkListSerializer.
+    ?expand=author renders the author as {'id', 'name'} instead of its id.
     """
     class Meta:
         model = Book
         fields = ['id', 'title', 'publication_year', 'author']
+        list_serializer_class = BulkListSerializer
+        expandable_fields = {'author': ('AuthorSerializer', {'fields': ('id', 'name')})}
 
     def validate_publication_year(self, value):
         """
@@ -22,13 +184,171 @@ class BookSerializer(serializers.ModelSerializer):
         return value
 
 
-class AuthorSerializer(serializers.ModelSerializer):
+class AuthorSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """
     Serializes the Author model, including a nested list of books.
     The 'books' field is read-only and populated using BookSerializer.
+    ?fields=id,name leaves the books out (and unloaded); ?fields=books.title
+    trims each book. book_count and latest_publication_year are read-only.
     """
     books = BookSerializer(many=True, read_only=True)
 
     class Meta:
         model = Author
-        fields = ['id', 'name', 'books']
\ No newline at end of file
+        fields = ['id', 'name', 'book_count', 'latest_publication_year', 'books']
+
+
+class PublicationYearStatisticsSerializer(serializers.ModelSerializer):
+    """
+    One bar of the books-per-year histogram.
+    """
+    class Meta:
+        model = PublicationYearStatistics
+        fields = ['publication_year', 'book_count']
+
+
+class AuthorStatisticsSerializer(serializers.ModelSerializer):
+    """
+    Book count and first/last publication year of one author.
+    """
+    author_name = serializers.CharField(source='author.name', read_only=True)
+
+    class Meta:
+        model = AuthorStatistics
+        fields = ['author', 'author_name', 'book_count', 'first_publication_year', 'last_publication_year']
+
+
+def get_eager_loading_lookups(serializer, prefix=''):
+    """
+    Work out which relations a serializer nests so views can load them up front.
+    Takes a serializer class (declared fields) or instance (the fields it will
+    actually render, after ?fields= / ?expand=).
+    Returns (select_related, prefetch_related) lookup lists:
+        - a nested serializer for a single object -> select_related
+        - a nested serializer with many=True -> prefetch_related
+    Relations nested below a prefetched one are prefetched as well.
+    """
+    select_related, prefetch_related = [], []
+    fields = serializer.fields if isinstance(serializer, serializers.BaseSerializer) else serializer._declared_fields
+    for name, field in fields.items():
+        many = isinstance(field, serializers.ListSerializer)
+        child = field.child if many else field
+        if not isinstance(child, serializers.ModelSerializer) or field.source == '*':
+            continue
+
+        lookup = prefix + (field.source or name).replace('.', '__')
+        (prefetch_related if many else select_related).append(lookup)
+
+        nested = child if isinstance(serializer, serializers.BaseSerializer) else type(child)
+        nested_select, nested_prefetch = get_eager_loading_lookups(nested, lookup + '__')
+        if many:
+            prefetch_related.extend(nested_select)
+        else:
+            select_related.extend(nested_select)
+        prefetch_related.extend(nested_prefetch)
+    return select_related, prefetch_related
+
+
+def get_only_fields(serializer, prefix=''):
+    """
+    The model fields a serializer instance reads, as .only() lookups
+    ('title', 'author__name', ...), or None when that can't be worked out
+    (method fields, source='*', dotted sources, properties).
+    Relations rendered from their own query (many=True) need nothing here.
+    """
+    model = serializer.Meta.model
+    only = [prefix + model._meta.pk.name]
+    for field in serializer.fields.values():
+        if field.write_only:
+            continue
+        if field.source == '*' or '.' in field.source:
+            return None
+        try:
+            model_field = model._meta.get_field(field.source)
+        except FieldDoesNotExist:
+            return None
+        if isinstance(field, (serializers.ListSerializer, serializers.ManyRelatedField)):
+            continue
+        if not model_field.concrete:
+            return None
+
+        only.append(prefix + field.source)
+        if isinstance(field, serializers.ModelSerializer):
+            nested = get_only_fields(field, prefix + field.source + '__')
+            if nested is None:
+                return None
+            only.extend(nested)
+    return list(dict.fromkeys(only))
+
+
+class ValuesSerializer:
+    """
+    Read-only fast path for a flat ModelSerializer.
+    Rows are fetched with .values() and turned into the same dicts the
+    serializer would produce, using accessors worked out once per serializer
+    class instead of field dispatch per instance. No model instances are built.
+    Supports fields backed by a model column and primary-key relations; any
+    other field (nested serializers, method fields, dotted sources) raises
+    ImproperlyConfigured. Use get_values_serializer() to get a cached instance.
+    fields/expand are passed on to a DynamicFieldsMixin serializer.
+    """
+    # DRF fields whose to_representation() is a no-op for values the database returns.
+    PASSTHROUGH_FIELDS = (serializers.IntegerField, serializers.CharField, serializers.BooleanField)
+
+    def __init__(self, serializer_class, fields=None, expand=()):
+        self.serializer_class = serializer_class
+        model = serializer_class.Meta.model
+        options = {'fields': fields, 'expand': expand} if issubclass(serializer_class, DynamicFieldsMixin) else {}
+        self.accessors = []
+        for field in serializer_class(**options).fields.values():
+            if field.write_only:
+                continue
+            self.accessors.append((field.field_name,) + self._compile(model, field))
+        self.columns = list(dict.fromkeys(column for _, column, _ in self.accessors))
+
+    def _compile(self, model, field):
+        """
+        Return (column, convert) for one serializer field; convert is None
+        when the database value can be used as is.
+        """
+        source = field.source
+        if isinstance(field, (serializers.BaseSerializer, serializers.ManyRelatedField)) or source == '*' or '.' in source:
+            raise ImproperlyConfigured(f"ValuesSerializer cannot render field '{field.field_name}'.")
+        try:
+            model_field = model._meta.get_field(source)
+        except FieldDoesNotExist:
+            raise ImproperlyConfigured(f"Field '{field.field_name}' is not a column of {model.__name__}.")
+        if not model_field.concrete or model_field.many_to_many:
+            raise ImproperlyConfigured(f"Field '{field.field_name}' is not a column of {model.__name__}.")
+
+        if isinstance(field, serializers.PrimaryKeyRelatedField):
+            return model_field.attname, None if field.pk_field is None else field.pk_field.to_representation
+        if isinstance(field, serializers.RelatedField):
+            raise ImproperlyConfigured(f"ValuesSerializer cannot render field '{field.field_name}'.")
+        return model_field.attname, None if type(field) in self.PASSTHROUGH_FIELDS else field.to_representation
+
+    def get_queryset(self, queryset):
+        """
+        Rows as dicts of the serializer's columns, plus the primary key, the
+        ordering columns and any annotations (e.g. search_rank), which keyset
+        pagination may need even when ?fields= leaves them out.
+        """
+        ordering = [name.lstrip('-') for name in queryset.query.order_by if isinstance(name, str)]
+        columns = [*self.columns, queryset.model._meta.pk.attname, *ordering, *queryset.query.annotations]
+        return queryset.values(*dict.fromkeys(columns))
+
+    def to_representation(self, rows):
+        accessors = self.accessors
+        data = []
+        for row in rows:
+            item = {}
+            for name, column, convert in accessors:
+                value = row[column]
+                item[name] = value if convert is None or value is None else convert(value)
+            data.append(item)
+        return data
+
+
+@lru_cache(maxsize=256)
+def get_values_serializer(serializer_class, fields=None, expand=()):
+    return ValuesSerializer(serializer_class, fields, expand)
\ No newline at end of file
@@ -0,0 +1,80 @@
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from . import cache, search, statistics
+from .models import Author, Book
+
+
+def _deleted_with_author(origin):
+    # origin is the instance or queryset whose delete() started the cascade.
+    # The Author handlers below then do the work once for all of its books.
+    return isinstance(origin, Author) or getattr(origin, "model", None) is Author
+
+
+@receiver(post_save, sender=Book)
+def index_book(sender, instance, **kwargs):
+    if search.is_supported():
+        search.index_rows([(instance.pk, instance.title, instance.author.name)])
+
+
+@receiver(post_delete, sender=Book)
+def unindex_book(sender, instance, origin=None, **kwargs):
+    if search.is_supported() and not _deleted_with_author(origin):
+        search.unindex_books([instance.pk])
+
+
+@receiver(post_save, sender=Author)
+def reindex_author_books(sender, instance, created, **kwargs):
+    # A new author has no books yet; a rename changes every book's author_name.
+    if not created and search.is_supported():
+        search.index_books(instance.books.all())
+
+
+@receiver(pre_save, sender=Book)
+def remember_book_statistics_key(sender, instance, **kwargs):
+    # The year and author the statistics currently count this book under.
+    if not instance._state.adding:
+        instance._statistics_key = (
+            Book.objects.filter(pk=instance.pk).values_list("publication_year", "author_id").first()
+        )
+
+
+@receiver(post_save, sender=Book)
+def update_book_statistics(sender, instance, created, **kwargs):
+    previous = None if created else getattr(instance, "_statistics_key", None)
+    current = (instance.publication_year, instance.author_id)
+    if previous is None:
+        statistics.book_added(*current)
+    elif previous != current:
+        statistics.book_moved(previous, current)
+
+
+@receiver(post_delete, sender=Book)
+def remove_book_statistics(sender, instance, origin=None, **kwargs):
+    if not _deleted_with_author(origin):
+        statistics.book_removed(instance.publication_year, instance.author_id)
+
+
+@receiver(pre_delete, sender=Author)
+def remember_author_books(sender, instance, **kwargs):
+    # Read before the cascade deletes the books.
+    instance._books_by_year = statistics.books_by_year(instance.pk)
+    if search.is_supported():
+        instance._book_ids = list(instance.books.values_list("pk", flat=True))
+
+
+@receiver(post_delete, sender=Author)
+def remove_author_books(sender, instance, **kwargs):
+    statistics.author_removed(getattr(instance, "_books_by_year", {}))
+    if search.is_supported():
+        search.unindex_books(getattr(instance, "_book_ids", ()))
+    cache.bump_model_version(Book)
+
+
+@receiver(post_save, sender=Book)
+@receiver(post_delete, sender=Book)
+@receiver(post_save, sender=Author)
+@receiver(post_delete, sender=Author)
+def invalidate_cached_responses(sender, origin=None, **kwargs):
+    if not (sender is Book and _deleted_with_author(origin)):
+        cache.bump_model_version(sender)
@@ -0,0 +1,198 @@
+"""
+Precomputed book statistics: books per publication year and per author.
+
+The dashboards read PublicationYearStatistics and AuthorStatistics instead of
+running GROUP BY over api_book, so a histogram costs O(#years) rows.
+api.signals keeps both tables in sync on Book save and delete:
+    - a new book increments its year and author counters;
+    - a removed book decrements them, and the author's first/last year is
+      recomputed from that author's books;
+    - a book moved to another year or author does both.
+    - an author delete cascades to its books without the per-book updates:
+      their years are counted before the delete (books_by_year) and each
+      year is decremented once afterwards (author_removed).
+The same updates maintain the denormalized Author.book_count and
+Author.latest_publication_year columns.
+Bulk writes bypass signals: call refresh_years()/refresh_authors() for the
+rows they touch, or rebuild everything with `python manage.py rebuild_statistics`
+(and `python manage.py repair_author_counts` for the Author columns).
+"""
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Max, Min
+from django.db.models.functions import Coalesce, Greatest, Least
+
+from .cache import bump_model_version
+from .models import Author, AuthorStatistics, Book, PublicationYearStatistics
+
+
+def _increment_year(publication_year):
+    year = PublicationYearStatistics.objects.filter(publication_year=publication_year)
+    if year.update(book_count=F("book_count") + 1):
+        return
+    try:
+        # In a savepoint: losing the race below must not break the caller's transaction.
+        with transaction.atomic():
+            PublicationYearStatistics.objects.create(publication_year=publication_year, book_count=1)
+    except IntegrityError:
+        # Another request created the year between our UPDATE and INSERT.
+        year.update(book_count=F("book_count") + 1)
+
+
+def _decrement_year(publication_year, count=1):
+    # Drop the row with the last books of the year; PositiveIntegerField can't go below 0.
+    deleted, _ = PublicationYearStatistics.objects.filter(
+        publication_year=publication_year, book_count__lte=count,
+    ).delete()
+    if not deleted:
+        PublicationYearStatistics.objects.filter(publication_year=publication_year).update(
+            book_count=F("book_count") - count,
+        )
+
+
+def book_added(publication_year, author_id):
+    _increment_year(publication_year)
+    Author.objects.filter(pk=author_id).update(
+        book_count=F("book_count") + 1,
+        latest_publication_year=Greatest(Coalesce("latest_publication_year", publication_year), publication_year),
+    )
+    updated = AuthorStatistics.objects.filter(author_id=author_id).update(
+        book_count=F("book_count") + 1,
+        first_publication_year=Least("first_publication_year", publication_year),
+        last_publication_year=Greatest("last_publication_year", publication_year),
+    )
+    if not updated:
+        refresh_authors([author_id])
+
+
+def book_moved(previous, current):
+    """
+    A saved book changed its (publication_year, author_id) from previous to current.
+    """
+    if previous[0] != current[0]:
+        _decrement_year(previous[0])
+        _increment_year(current[0])
+    refresh_authors({previous[1], current[1]})
+
+
+def book_removed(publication_year, author_id):
+    _decrement_year(publication_year)
+    refresh_authors([author_id])
+
+
+def books_by_year(author_id):
+    """
+    {publication_year: number of books} for the author; read before an author
+    delete cascades to the books, and passed to author_removed() after it.
+    """
+    return dict(
+        Book.objects.filter(author_id=author_id)
+        .values_list("publication_year").annotate(Count("id")).order_by()
+    )
+
+
+def author_removed(books_by_year):
+    """
+    An author was deleted with its books. Its AuthorStatistics row went with
+    it (CASCADE); each of its years is decremented once.
+    """
+    for publication_year, count in books_by_year.items():
+        _decrement_year(publication_year, count)
+
+
+def refresh_years(years):
+    """
+    Recount the given publication years from the Book table.
+    """
+    years = set(years)
+    if not years:
+        return
+    counts = dict(
+        Book.objects.filter(publication_year__in=years)
+        .values_list("publication_year").annotate(Count("id")).order_by()
+    )
+    PublicationYearStatistics.objects.filter(publication_year__in=years - counts.keys()).delete()
+    PublicationYearStatistics.objects.bulk_create(
+        [PublicationYearStatistics(publication_year=year, book_count=count) for year, count in counts.items()],
+        update_conflicts=True, unique_fields=["publication_year"], update_fields=["book_count"],
+    )
+
+
+def refresh_authors(author_ids):
+    """
+    Recompute the given authors' rows and Author columns from their books
+    (uses the author_id index).
+    """
+    author_ids = set(author_ids)
+    if not author_ids:
+        return
+    rows = {
+        row.pop("author"): row
+        for row in Book.objects.filter(author_id__in=author_ids).values("author").annotate(
+            book_count=Count("id"),
+            first_publication_year=Min("publication_year"),
+            last_publication_year=Max("publication_year"),
+        ).order_by()
+    }
+    AuthorStatistics.objects.filter(author_id__in=author_ids - rows.keys()).delete()
+    AuthorStatistics.objects.bulk_create(
+        [AuthorStatistics(author_id=author_id, **row) for author_id, row in rows.items()],
+        update_conflicts=True, unique_fields=["author"],
+        update_fields=["book_count", "first_publication_year", "last_publication_year"],
+    )
+    Author.objects.bulk_update(
+        [
+            Author(
+                pk=author_id,
+                book_count=rows.get(author_id, {}).get("book_count", 0),
+                latest_publication_year=rows.get(author_id, {}).get("last_publication_year"),
+            )
+            for author_id in author_ids
+        ],
+        list(Author.DENORMALIZED_FIELDS),
+    )
+
+
+def rebuild_statistics():
+    """
+    Recompute both tables from scratch. Returns (#years, #authors).
+    """
+    with transaction.atomic():
+        PublicationYearStatistics.objects.all().delete()
+        AuthorStatistics.objects.all().delete()
+        refresh_years(Book.objects.values_list("publication_year", flat=True).distinct().order_by())
+        refresh_authors(Book.objects.values_list("author_id", flat=True).distinct().order_by())
+    bump_model_version(Book)
+    return PublicationYearStatistics.objects.count(), AuthorStatistics.objects.count()
+
+
+def repair_author_counts(batch_size=1000):
+    """
+    Recompute Author.book_count and latest_publication_year for every author,
+    batch_size authors at a time. Returns (#authors checked, #authors corrected).
+    """
+    checked = corrected = 0
+    last_pk = 0
+    while True:
+        batch = list(
+            Author.objects.filter(pk__gt=last_pk).order_by("pk")
+            .values_list("pk", *Author.DENORMALIZED_FIELDS)[:batch_size]
+        )
+        if not batch:
+            break
+        last_pk = batch[-1][0]
+        actual = {
+            row[0]: row[1:]
+            for row in Book.objects.filter(author_id__in=[row[0] for row in batch])
+            .values_list("author").annotate(Count("id"), Max("publication_year")).order_by()
+        }
+        stale = []
+        for pk, *stored in batch:
+            expected = actual.get(pk, (0, None))
+            if tuple(stored) != expected:
+                stale.append(Author(pk=pk, book_count=expected[0], latest_publication_year=expected[1]))
+        Author.objects.bulk_update(stale, list(Author.DENORMALIZED_FIELDS))
+        checked += len(batch)
+        corrected += len(stale)
+    if corrected:
+        bump_model_version(Author)
+    return checked, corrected
@@ -0,0 +1,111 @@
+import base64
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import AsyncClient, TestCase
+from django.urls import reverse
+
+from rest_framework import status
+
+from .models import Author, Book
+
+
+class AsyncBookViewTests(TestCase):
+    """
+    The async book endpoints behave like their sync counterparts.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.client = AsyncClient()
+        self.user = User.objects.create_user(username="testuser", password="password123")
+        self.author = Author.objects.create(name="George Orwell")
+        self.book = Book.objects.create(title="1984", publication_year=1949, author=self.author)
+        Book.objects.create(title="Animal Farm", publication_year=1945, author=self.author)
+
+    async def test_list_matches_sync_view(self):
+        for params in ({}, {"ordering": "-publication_year"}, {"search": "farm"}, {"page_size": 1}):
+            with self.subTest(params=params):
+                sync_resp = await self.client.get(reverse("book-list"), params)
+                async_resp = await self.client.get(reverse("async-book-list"), params)
+                self.assertEqual(async_resp.status_code, status.HTTP_200_OK)
+                self.assertEqual(
+                    async_resp.json()["results"], sync_resp.json()["results"]
+                )
+
+    async def test_list_follows_next_cursor(self):
+        resp = await self.client.get(reverse("async-book-list"), {"page_size": 1})
+        titles = [row["title"] for row in resp.json()["results"]]
+        resp = await self.client.get(resp.json()["next"])
+        titles += [row["title"] for row in resp.json()["results"]]
+        self.assertEqual(titles, ["1984", "Animal Farm"])
+
+    async def test_detail(self):
+        resp = await self.client.get(reverse("async-book-detail", args=[self.book.pk]))
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.json()["title"], "1984")
+        resp = await self.client.get(reverse("async-book-detail", args=[self.book.pk + 100]))
+        self.assertEqual(resp.status_code, status.HTTP_404_NOT_FOUND)
+
+    async def test_writes_require_authentication(self):
+        data = {"title": "Homage to Catalonia", "publication_year": 1938, "author": self.author.pk}
+        resp = await self.client.post(reverse("async-book-create"), data, content_type="application/json")
+        self.assertIn(resp.status_code, (status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN))
+        resp = await self.client.delete(reverse("async-book-delete", args=[self.book.pk]))
+        self.assertIn(resp.status_code, (status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN))
+        self.assertTrue(await Book.objects.filter(pk=self.book.pk).aexists())
+
+    async def test_basic_authentication(self):
+        data = {"title": "Homage to Catalonia", "publication_year": 1938, "author": self.author.pk}
+        for password in ("password123", "wrong"):
+            with self.subTest(password=password):
+                headers = {"Authorization": "Basic " + base64.b64encode(f"testuser:{password}".encode()).decode()}
+                responses = [
+                    await self.client.post(reverse(name), data, content_type="application/json", headers=headers)
+                    for name in ("book-create", "async-book-create")
+                ]
+                # Rejected credentials are a 403 for both: SessionAuthentication,
+                # the first authenticator, sends no WWW-Authenticate header.
+                expected = status.HTTP_201_CREATED if password == "password123" else status.HTTP_403_FORBIDDEN
+                self.assertEqual([resp.status_code for resp in responses], [expected, expected])
+                if expected == status.HTTP_403_FORBIDDEN:
+                    self.assertEqual(responses[1].json(), {"detail": "Invalid username/password."})
+
+    async def test_session_writes_need_csrf_token(self):
+        client = AsyncClient(enforce_csrf_checks=True)
+        await client.aforce_login(self.user)
+        resp = await client.delete(reverse("async-book-delete", args=[self.book.pk]))
+        self.assertEqual(resp.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertIn("CSRF", resp.json()["detail"])
+
+    async def test_create_update_delete(self):
+        await self.client.aforce_login(self.user)
+        data = {"title": "Homage to Catalonia", "publication_year": 1938, "author": self.author.pk}
+        resp = await self.client.post(reverse("async-book-create"), data, content_type="application/json")
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        pk = resp.json()["id"]
+
+        resp = await self.client.patch(
+            reverse("async-book-update", args=[pk]), {"publication_year": 1939}, content_type="application/json"
+        )
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual((await Book.objects.aget(pk=pk)).publication_year, 1939)
+
+        resp = await self.client.delete(reverse("async-book-delete", args=[pk]))
+        self.assertEqual(resp.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(await Book.objects.filter(pk=pk).aexists())
+
+    async def test_validation_errors(self):
+        await self.client.aforce_login(self.user)
+        data = {"title": "Future Book", "publication_year": 3000, "author": self.author.pk}
+        resp = await self.client.post(reverse("async-book-create"), data, content_type="application/json")
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("publication_year", resp.json())
+
+    async def test_fields_and_expand(self):
+        resp = await self.client.get(reverse("async-book-list"), {"fields": "title", "expand": "author"})
+        self.assertEqual(resp.json()["results"][0], {"title": "1984"})
+        resp = await self.client.get(reverse("async-book-list"), {"fields": "title,author", "expand": "author"})
+        self.assertEqual(resp.json()["results"][0]["author"], {"id": self.author.pk, "name": "George Orwell"})
+        resp = await self.client.get(reverse("async-book-detail", args=[self.book.pk]), {"expand": "author"})
+        self.assertEqual(resp.json()["author"]["name"], "George Orwell")
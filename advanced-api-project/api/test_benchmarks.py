@@ -0,0 +1,61 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from .benchmarks import compare_results, run_benchmarks
+from .models import Book
+
+
+class BenchmarkSuiteTests(TestCase):
+    """
+    A tiny benchmark_api run produces a complete report and leaves no data behind.
+    """
+
+    def test_run_writes_results_and_rolls_back(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "results.json")
+            call_command("benchmark_api", books=40, requests=2, output=path, stdout=StringIO())
+            with open(path, encoding="utf-8") as f:
+                results = json.load(f)
+
+        self.assertEqual(
+            set(results["results"]), {"list", "filter", "search", "ordering", "detail", "create"}
+        )
+        for metrics in results["results"].values():
+            self.assertLessEqual(metrics["p50_ms"], metrics["p99_ms"])
+            self.assertGreater(metrics["queries"], 0)
+        self.assertEqual(Book.objects.count(), 0)
+
+    def test_run_leaves_the_default_cache_alone(self):
+        cache.set("unrelated", "kept")
+        self.addCleanup(cache.delete, "unrelated")
+        run_benchmarks(books=20, authors=5, requests=2, scenarios=["list", "detail"])
+        self.assertEqual(cache.get("unrelated"), "kept")
+
+    def test_compare_flags_regressions_over_threshold(self):
+        metrics = {"p50_ms": 10, "p95_ms": 20, "p99_ms": 30, "queries": 2, "peak_memory_kb": 100}
+        baseline = {"results": {"list": metrics}}
+        current = {"results": {"list": {**metrics, "p95_ms": 23, "queries": 3}}}
+
+        rows, regressions = compare_results(baseline, current, threshold=0.2)
+        self.assertEqual(len(rows), 5)
+        self.assertEqual([(row[0], row[1]) for row in regressions], [("list", "queries")])
+
+    def test_command_exits_non_zero_on_regression(self):
+        metrics = {"p50_ms": 10, "p95_ms": 20, "p99_ms": 30, "queries": 2, "peak_memory_kb": 100}
+        meta = {"books": 1, "authors": 1, "requests": 1}
+        with tempfile.TemporaryDirectory() as tmp:
+            old, new = os.path.join(tmp, "old.json"), os.path.join(tmp, "new.json")
+            with open(old, "w") as f:
+                json.dump({"meta": meta, "results": {"list": metrics}}, f)
+            with open(new, "w") as f:
+                json.dump({"meta": meta, "results": {"list": {**metrics, "p99_ms": 60}}}, f)
+
+            with self.assertRaises(CommandError):
+                call_command("benchmark_api", results=new, baseline=old, stdout=StringIO())
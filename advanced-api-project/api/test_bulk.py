@@ -0,0 +1,127 @@
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+
+from .models import Author, Book
+
+
+class BookBulkTests(APITestCase):
+    """
+    /books/bulk/ creates, updates and deletes many books per request.
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="alice", password="password123")
+        self.client.force_authenticate(self.user)
+        self.author = Author.objects.create(name="George Orwell")
+        self.url = reverse("book-bulk")
+        self.next_year = timezone.now().year + 1
+
+    def books(self, count, **overrides):
+        return [
+            {"title": f"Book {i}", "publication_year": 2000, "author": self.author.id, **overrides}
+            for i in range(count)
+        ]
+
+    def test_requires_authentication(self):
+        self.client.force_authenticate(None)
+        resp = self.client.post(self.url, self.books(1), format="json")
+        self.assertIn(resp.status_code, (status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN))
+
+    def test_bulk_create_batches_inserts(self):
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.post(self.url + "?batch_size=10", self.books(25), format="json")
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(resp.json()["results"]), 25)
+        self.assertTrue(all(book["id"] for book in resp.json()["results"]))
+        self.assertEqual(Book.objects.count(), 25)
+        inserts = [q for q in ctx.captured_queries if q["sql"].startswith('INSERT INTO "api_book"')]
+        self.assertEqual(len(inserts), 3)
+
+    def test_bulk_create_validates_every_item(self):
+        items = self.books(3)
+        items[1]["publication_year"] = self.next_year
+        resp = self.client.post(self.url, items, format="json")
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("publication_year", resp.json()["1"])
+        self.assertEqual(Book.objects.count(), 0)
+
+    def test_partial_mode_keeps_valid_items(self):
+        items = self.books(3)
+        items[1]["publication_year"] = self.next_year
+        items[2]["author"] = self.author.id + 100
+        resp = self.client.post(self.url + "?allow_partial=true", items, format="json")
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        data = resp.json()
+        self.assertEqual([book["title"] for book in data["results"]], ["Book 0"])
+        self.assertEqual([error["index"] for error in data["errors"]], [1, 2])
+        self.assertIn("publication_year", data["errors"][0]["errors"])
+        self.assertEqual(list(Book.objects.values_list("title", flat=True)), ["Book 0"])
+
+    def test_bulk_update(self):
+        created = self.client.post(self.url, self.books(3), format="json").json()["results"]
+        changes = [{"id": book["id"], "title": book["title"].upper()} for book in created]
+        changes.append({"id": 9999, "title": "Missing"})
+
+        resp = self.client.patch(self.url, changes, format="json")
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("id", resp.json()["3"])
+
+        resp = self.client.patch(self.url + "?allow_partial=1", changes, format="json")
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.json()["errors"][0]["index"], 3)
+        self.assertEqual(
+            sorted(Book.objects.values_list("title", flat=True)), ["BOOK 0", "BOOK 1", "BOOK 2"]
+        )
+
+    def test_bulk_update_rejects_duplicate_ids(self):
+        book = Book.objects.create(title="1984", publication_year=1949, author=self.author)
+        changes = [{"id": book.id, "title": "First"}, {"id": book.id, "title": "Second"}]
+
+        resp = self.client.patch(self.url, changes, format="json")
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(list(resp.json()), ["1"])
+        self.assertIn("id", resp.json()["1"])
+        book.refresh_from_db()
+        self.assertEqual(book.title, "1984")
+
+        resp = self.client.patch(self.url + "?allow_partial=1", changes, format="json")
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual([error["index"] for error in resp.json()["errors"]], [1])
+        book.refresh_from_db()
+        self.assertEqual(book.title, "First")
+
+    def test_bulk_update_rejects_future_year(self):
+        book = Book.objects.create(title="1984", publication_year=1949, author=self.author)
+        resp = self.client.patch(self.url, [{"id": book.id, "publication_year": self.next_year}], format="json")
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        book.refresh_from_db()
+        self.assertEqual(book.publication_year, 1949)
+
+    def test_bulk_writes_reach_search_and_list(self):
+        self.client.get(reverse("book-list"))  # warm the response cache
+        self.client.post(self.url, self.books(2, title="Searchable"), format="json")
+        resp = self.client.get(reverse("book-list"), {"search": "searchable"})
+        self.assertEqual(len(resp.json()["results"]), 2)
+
+    def test_bulk_delete(self):
+        ids = [book["id"] for book in self.client.post(self.url, self.books(4), format="json").json()["results"]]
+
+        resp = self.client.delete(self.url, ids[:2] + [9999], format="json")
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("id", resp.json()["2"])
+        self.assertEqual(Book.objects.count(), 4)
+
+        resp = self.client.delete(self.url + "?allow_partial=true", ids[:2] + [9999], format="json")
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.json()["deleted"], 2)
+        self.assertEqual(sorted(Book.objects.values_list("id", flat=True)), ids[2:])
+
+        resp = self.client.delete(self.url, {"ids": ids}, format="json")
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
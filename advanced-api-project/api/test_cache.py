@@ -0,0 +1,94 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+
+from .cache import cache_stats, reset_cache_stats
+from .models import Author, Book
+
+
+class ResponseCacheTests(APITestCase):
+    """
+    GETs on the list and detail endpoints are served from the cache until a
+    Book or Author write bumps the model version.
+    """
+
+    def setUp(self):
+        cache.clear()
+        reset_cache_stats()
+        self.client = APIClient()
+        self.author = Author.objects.create(name="George Orwell")
+        self.book = Book.objects.create(title="1984", publication_year=1949, author=self.author)
+        self.list_url = reverse("book-list")
+        self.detail_url = reverse("book-detail", args=[self.book.pk])
+        self.author_url = reverse("author-list")
+
+    def get(self, url):
+        resp = self.client.get(url)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        return resp
+
+    def test_repeated_get_is_a_hit_without_queries(self):
+        self.assertEqual(self.get(self.list_url)["X-Cache"], "MISS")
+        with self.assertNumQueries(0):
+            resp = self.get(self.list_url)
+        self.assertEqual(resp["X-Cache"], "HIT")
+        self.assertEqual(resp.json()["results"][0]["title"], "1984")
+        self.assertEqual(cache_stats(), {"hits": 1, "misses": 1, "hit_ratio": 0.5})
+
+    def test_query_string_is_normalized(self):
+        self.get(self.list_url + "?ordering=title&publication_year=1949")
+        resp = self.get(self.list_url + "?publication_year=1949&ordering=title")
+        self.assertEqual(resp["X-Cache"], "HIT")
+        self.assertEqual(self.get(self.list_url + "?ordering=-title")["X-Cache"], "MISS")
+
+    def test_representations_are_cached_apart(self):
+        # The ETag varies by format, so one format's entry must never answer another.
+        etags = {}
+        for accept in ("application/json", "text/html", "application/json", "text/html"):
+            resp = self.client.get(self.list_url, HTTP_ACCEPT=accept)
+            self.assertEqual(resp.status_code, status.HTTP_200_OK)
+            self.assertIn("Accept", resp["Vary"])
+            self.assertEqual(resp["Content-Type"].split(";")[0], accept)
+            self.assertEqual(etags.setdefault(accept, resp["ETag"]), resp["ETag"])
+        self.assertNotEqual(etags["application/json"], etags["text/html"])
+
+        resp = self.client.get(
+            self.list_url, HTTP_ACCEPT="application/json", HTTP_IF_NONE_MATCH=etags["application/json"],
+        )
+        self.assertEqual(resp.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(resp["X-Cache"], "HIT")
+
+    def test_auth_scope_is_part_of_the_key(self):
+        self.get(self.detail_url)
+        user = User.objects.create_user(username="alice", password="password123")
+        self.client.force_authenticate(user)
+        self.assertEqual(self.get(self.detail_url)["X-Cache"], "MISS")
+        self.assertEqual(self.get(self.detail_url)["X-Cache"], "HIT")
+
+    def test_book_write_invalidates_book_and_author_views(self):
+        for url in (self.list_url, self.detail_url, self.author_url):
+            self.get(url)
+
+        self.book.title = "Nineteen Eighty-Four"
+        self.book.save()
+
+        self.assertEqual(self.get(self.list_url).json()["results"][0]["title"], "Nineteen Eighty-Four")
+        self.assertEqual(self.get(self.detail_url).json()["title"], "Nineteen Eighty-Four")
+        self.assertEqual(self.get(self.author_url).json()[0]["books"][0]["title"], "Nineteen Eighty-Four")
+
+    def test_author_write_leaves_book_detail_cached(self):
+        self.get(self.detail_url)
+        self.get(self.author_url)
+        Author.objects.create(name="Aldous Huxley")
+        self.assertEqual(self.get(self.detail_url)["X-Cache"], "HIT")
+        self.assertEqual(len(self.get(self.author_url).json()), 2)
+
+    def test_errors_are_not_cached(self):
+        url = reverse("book-detail", args=[self.book.pk + 100])
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+        resp = self.client.get(url)
+        self.assertEqual(resp.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertNotEqual(resp.get("X-Cache"), "HIT")
@@ -0,0 +1,105 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+
+from .cache import CachedResponseMixin
+from .models import Author, Book
+from .serializers import BookSerializer
+
+
+class ConditionalGetTests(APITestCase):
+    """
+    Book list and detail responses carry ETag/Last-Modified; matching
+    conditional requests get 304 without the serializer running.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.author = Author.objects.create(name="George Orwell")
+        self.book = Book.objects.create(title="1984", publication_year=1949, author=self.author)
+        Book.objects.create(title="Animal Farm", publication_year=1945, author=self.author)
+        self.list_url = reverse("book-list")
+        self.detail_url = reverse("book-detail", args=[self.book.pk])
+
+    def get_uncached(self, url, **extra):
+        # Bypasses the cached responses but keeps the model versions.
+        def get_cached(view, request, *args, **kwargs):
+            return super(CachedResponseMixin, view).get(request, *args, **kwargs)
+
+        with mock.patch.object(CachedResponseMixin, "get_cached", get_cached):
+            return self.client.get(url, **extra)
+
+    def assertNotModified(self, url, etag, cached):
+        with mock.patch.object(BookSerializer, "to_representation") as to_representation:
+            if cached:
+                resp = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            else:
+                resp = self.get_uncached(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(resp["ETag"], etag)
+        self.assertFalse(resp.content)
+        to_representation.assert_not_called()
+
+    def test_if_none_match_returns_304(self):
+        for url in (self.list_url, self.detail_url):
+            with self.subTest(url=url):
+                resp = self.client.get(url)
+                self.assertEqual(resp.status_code, status.HTTP_200_OK)
+                self.assertNotModified(url, resp["ETag"], cached=True)
+                self.assertNotModified(url, resp["ETag"], cached=False)
+
+    def test_if_modified_since_returns_304(self):
+        last_modified = self.client.get(self.detail_url)["Last-Modified"]
+        resp = self.get_uncached(self.detail_url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(resp.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_list_etag_runs_no_sql(self):
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(self.list_url)
+        self.assertNotIn("Last-Modified", resp)
+        self.assertEqual(len(ctx.captured_queries), 1)  # just the page
+        for query in ctx.captured_queries:
+            self.assertNotIn("COUNT(", query["sql"].upper())
+            self.assertNotIn("MAX(", query["sql"].upper())
+
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.get_uncached(self.list_url, HTTP_IF_NONE_MATCH=resp["ETag"])
+        self.assertEqual(resp.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(ctx.captured_queries, [])
+
+    def test_list_etag_survives_evicted_versions(self):
+        etag = self.client.get(self.list_url)["ETag"]
+        cache.clear()
+        resp = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(resp["ETag"], etag)
+
+    def test_etag_changes_with_the_data(self):
+        list_etag = self.client.get(self.list_url)["ETag"]
+        detail_etag = self.client.get(self.detail_url)["ETag"]
+
+        self.book.title = "Nineteen Eighty-Four"
+        self.book.save()
+        self.assertNotEqual(self.client.get(self.detail_url)["ETag"], detail_etag)
+        resp = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=list_etag)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+
+        list_etag = resp["ETag"]
+        Book.objects.filter(title="Animal Farm").delete()
+        self.assertNotEqual(self.client.get(self.list_url)["ETag"], list_etag)
+
+    def test_etag_depends_on_query_string(self):
+        etag = self.client.get(self.list_url)["ETag"]
+        self.assertNotEqual(self.client.get(self.list_url, {"ordering": "-title"})["ETag"], etag)
+
+    def test_missing_book_is_404_without_etag(self):
+        resp = self.client.get(reverse("book-detail", args=[self.book.pk + 100]), HTTP_IF_NONE_MATCH="*")
+        self.assertEqual(resp.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertNotIn("ETag", resp)
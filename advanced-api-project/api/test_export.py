@@ -0,0 +1,69 @@
+import csv
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.http import StreamingHttpResponse
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+
+from .models import Author, Book
+
+
+class BookExportTests(APITestCase):
+    """
+    The catalogue export streams NDJSON/CSV and honours BookListView's filters.
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.orwell = Author.objects.create(name="George Orwell")
+        self.martin = Author.objects.create(name="Robert C. Martin")
+        Book.objects.create(title="1984", publication_year=1949, author=self.orwell)
+        Book.objects.create(title="Animal Farm", publication_year=1945, author=self.orwell)
+        Book.objects.create(title="Clean Code, 2nd \"ed\"", publication_year=2008, author=self.martin)
+
+    def export(self, export_format, params=None):
+        resp = self.client.get(reverse("book-export", args=[export_format]), params)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertIsInstance(resp, StreamingHttpResponse)
+        return b"".join(resp.streaming_content).decode("utf-8")
+
+    def test_ndjson(self):
+        rows = [json.loads(line) for line in self.export("ndjson").splitlines()]
+        self.assertEqual([row["title"] for row in rows], ["1984", "Animal Farm", 'Clean Code, 2nd "ed"'])
+        self.assertEqual(rows[0], {
+            "id": rows[0]["id"], "title": "1984", "publication_year": 1949,
+            "author": self.orwell.id, "author_name": "George Orwell",
+        })
+
+    def test_csv(self):
+        rows = list(csv.reader(StringIO(self.export("csv"))))
+        self.assertEqual(rows[0], ["id", "title", "publication_year", "author", "author_name"])
+        self.assertEqual(rows[3][1:], ['Clean Code, 2nd "ed"', "2008", str(self.martin.id), "Robert C. Martin"])
+
+    def test_same_filters_as_book_list(self):
+        params = {"author": self.orwell.id, "ordering": "-publication_year"}
+        listed = [book["title"] for book in self.client.get(reverse("book-list"), params).json()["results"]]
+        exported = [json.loads(line)["title"] for line in self.export("ndjson", params).splitlines()]
+        self.assertEqual(exported, listed)
+        self.assertEqual(len(self.export("ndjson", {"search": "clean"}).splitlines()), 1)
+
+    def test_unknown_format(self):
+        resp = self.client.get(reverse("book-export", args=["xml"]))
+        self.assertEqual(resp.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_management_command(self):
+        out = StringIO()
+        call_command("export_books", format="csv", query="publication_year=1945", stdout=out)
+        self.assertEqual(len(out.getvalue().splitlines()), 2)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "books.ndjson")
+            call_command("export_books", output=path, chunk_size=1)
+            with open(path, encoding="utf-8") as f:
+                self.assertEqual(len(f.readlines()), 3)
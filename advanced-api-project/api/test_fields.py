@@ -0,0 +1,103 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+
+from .models import Author, Book
+from .serializers import AuthorSerializer, BookSerializer, get_eager_loading_lookups, get_only_fields
+
+
+class DynamicFieldsTests(APITestCase):
+    """
+    ?fields= trims the response and the SELECT; ?expand= nests related
+    objects and loads them in the same fixed number of queries.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.orwell = Author.objects.create(name="George Orwell")
+        self.huxley = Author.objects.create(name="Aldous Huxley")
+        self.book = Book.objects.create(title="1984", publication_year=1949, author=self.orwell)
+        Book.objects.create(title="Animal Farm", publication_year=1945, author=self.orwell)
+        Book.objects.create(title="Brave New World", publication_year=1932, author=self.huxley)
+        self.list_url = reverse("book-list")
+        self.author_url = reverse("author-list")
+        self.detail_url = reverse("book-detail", args=[self.book.pk])
+
+    def get(self, url, params):
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(url, params)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        return resp.json(), ctx.captured_queries
+
+    def test_book_list_sparse_fieldset(self):
+        data, _ = self.get(self.list_url, {"fields": "id,title"})
+        self.assertEqual(data["results"][0], {"id": self.book.pk, "title": "1984"})
+
+    def test_sparse_fieldset_keeps_pagination_working(self):
+        data, _ = self.get(self.list_url, {"fields": "title", "ordering": "-publication_year", "page_size": 2})
+        titles = [book["title"] for book in data["results"]]
+        data, _ = self.get(data["next"], {})
+        titles += [book["title"] for book in data["results"]]
+        self.assertEqual(titles, ["1984", "Animal Farm", "Brave New World"])
+
+    def test_book_list_expand_author(self):
+        data, queries = self.get(self.list_url, {"expand": "author", "fields": "title,author"})
+        self.assertEqual(data["results"][0], {"title": "1984", "author": {"id": self.orwell.pk, "name": "George Orwell"}})
+        self.assertLessEqual(len(queries), 2)
+
+    def test_book_detail_expand_author(self):
+        data, _ = self.get(self.detail_url, {"expand": "author"})
+        self.assertEqual(data["author"], {"id": self.orwell.pk, "name": "George Orwell"})
+
+        self.orwell.name = "Eric Blair"
+        self.orwell.save()
+        data, _ = self.get(self.detail_url, {"expand": "author"})
+        self.assertEqual(data["author"]["name"], "Eric Blair")
+
+    def test_author_list_without_books(self):
+        data, queries = self.get(self.author_url, {"fields": "id,name"})
+        self.assertEqual(data[0], {"id": self.orwell.pk, "name": "George Orwell"})
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn("updated_at", queries[0]["sql"])
+
+    def test_author_list_nested_fields_and_expand(self):
+        data, queries = self.get(self.author_url, {"fields": "name,books.title,books.author", "expand": "books.author"})
+        self.assertEqual(data[0]["books"][0], {"title": "1984", "author": {"id": self.orwell.pk, "name": "George Orwell"}})
+        self.assertEqual(len(queries), 2)
+
+    def test_unknown_names_are_ignored(self):
+        data, _ = self.get(self.list_url, {"fields": "id,nope", "expand": "nope"})
+        self.assertEqual(set(data["results"][0]), {"id"})
+
+    def test_blank_fields_select_every_field(self):
+        full, _ = self.get(self.list_url, {})
+        for fields in (",", " , ,", ""):
+            with self.subTest(fields=fields):
+                data, _ = self.get(self.list_url, {"fields": fields})
+                self.assertEqual(data["results"], full["results"])
+        data, _ = self.get(self.list_url, {"fields": ",title,,"})
+        self.assertEqual(data["results"][0], {"title": "1984"})
+
+    def test_writes_ignore_fields(self):
+        self.client.force_authenticate(User.objects.create_user(username="writer"))
+        resp = self.client.post(
+            reverse("book-create") + "?fields=id&expand=author",
+            {"title": "Homage to Catalonia", "publication_year": 1938, "author": self.orwell.pk},
+        )
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(resp.json()["author"], self.orwell.pk)
+
+    def test_lookups_follow_requested_fields(self):
+        self.assertEqual(get_eager_loading_lookups(AuthorSerializer(fields=("id", "name"))), ([], []))
+        self.assertEqual(get_eager_loading_lookups(BookSerializer(expand=("author",))), (["author"], []))
+        self.assertEqual(get_only_fields(BookSerializer(fields=("title",))), ["id", "title"])
+        self.assertEqual(
+            get_only_fields(BookSerializer(fields=("author",), expand=("author",))),
+            ["id", "author", "author__id", "author__name"],
+        )
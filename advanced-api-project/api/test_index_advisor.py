@@ -0,0 +1,73 @@
+import json
+import os
+import re
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db.models import Index
+from django.test import TestCase
+
+from .management.commands.advise_indexes import suggest_index
+from .models import Author
+
+
+class IndexAdvisorTests(TestCase):
+    """
+    advise_indexes explains every combination of the list views and gates
+    on regressions against a saved baseline.
+    """
+
+    def run_advisor(self, **options):
+        out = StringIO()
+        call_command("advise_indexes", stdout=out, **options)
+        return out.getvalue()
+
+    def test_reports_every_combination(self):
+        output = self.run_advisor()
+        self.assertIn("BookListView (/books/)", output)
+        # Book lists (sync + async): 8 filter subsets x 2 search modes x 5 orderings;
+        # year statistics: 2 filter subsets x 5 orderings; author statistics: 7 orderings;
+        # authors: 4 filter subsets x 7 orderings.
+        self.assertEqual(output.count("filter="), 2 * 80 + 10 + 7 + 28)
+        self.assertIn("ok                             filter=- search=- ordering=title", output)
+        self.assertIn("FULL SCAN", output)  # /authors/ lists the whole table
+
+    def test_baseline_gates_regressions(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "baseline.json")
+            self.run_advisor(write_baseline=path)
+            self.run_advisor(baseline=path)  # no change, no error
+
+            with open(path, encoding="utf-8") as f:
+                baseline = json.load(f)
+            baseline["AuthorListCreateView"] = {}
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(baseline, f)
+
+            with self.assertRaisesMessage(CommandError, "AuthorListCreateView"):
+                self.run_advisor(baseline=path)
+
+    def test_strict_counts_only_issues_an_index_can_fix(self):
+        output = self.run_advisor()
+        fixable = output.count("suggest:")
+        # Full-text matches sorted by rank show up, but no index can serve them.
+        self.assertIn("TEMP B-TREE SORT               filter=- search=yes ordering=-", output)
+        self.assertIn(f", {fixable} of them fixable with an index.", output)
+        with self.assertRaisesMessage(CommandError, f"{fixable} combination(s) scan or sort"):
+            self.run_advisor(strict=True)
+
+    def test_suggested_names_are_unique(self):
+        suggestions = {
+            suggest_index(Author, filters, ordering)
+            for filters, ordering in [
+                (["book_count", "latest_publication_year"], ["name"]),
+                (["book_count"], ["latest_publication_year"]),
+                (["latest_publication_year"], ["name"]),
+                (["latest_publication_year"], ["book_count"]),
+            ]
+        }
+        names = {re.search(r"name='(\w+)'", suggestion).group(1) for suggestion in suggestions}
+        self.assertEqual(len(names), 4)
+        self.assertTrue(all(len(name) <= Index.max_name_length for name in names))
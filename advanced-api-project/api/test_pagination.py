@@ -0,0 +1,158 @@
+import json
+from base64 import b64encode
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+
+from django_common import pagination
+
+from .models import Author, Book
+from .search import rebuild_index
+
+
+class KeysetPaginationTests(APITestCase):
+    """
+    Walking the cursor links must visit every book exactly once, in the
+    requested order, for each ordering BookListView accepts.
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.list_url = reverse("book-list")
+        self.orwell = Author.objects.create(name="George Orwell")
+        self.martin = Author.objects.create(name="Robert C. Martin")
+        # Lots of duplicate titles and years so the id tiebreaker matters.
+        Book.objects.bulk_create(
+            Book(
+                title=f"Title {i % 4}",
+                publication_year=1990 + i % 3,
+                author=self.orwell if i % 2 else self.martin,
+            )
+            for i in range(23)
+        )
+        rebuild_index()  # bulk_create skips the signals that maintain the search index
+
+    def walk(self, params, direction="next"):
+        resp = self.client.get(self.list_url, params)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        pages = [resp.json()]
+        while pages[-1][direction]:
+            resp = self.client.get(pages[-1][direction])
+            self.assertEqual(resp.status_code, status.HTTP_200_OK)
+            pages.append(resp.json())
+        return pages
+
+    def expected_ids(self, *ordering):
+        return list(Book.objects.order_by(*ordering).values_list("id", flat=True))
+
+    def test_every_ordering_combination(self):
+        cases = {
+            "title": ("title", "id"),
+            "-title": ("-title", "-id"),
+            "publication_year": ("publication_year", "id"),
+            "-publication_year": ("-publication_year", "-id"),
+            "publication_year,title": ("publication_year", "title", "id"),
+            "-publication_year,title": ("-publication_year", "title", "id"),
+            "title,-publication_year": ("title", "-publication_year", "-id"),
+        }
+        for ordering, expected in cases.items():
+            with self.subTest(ordering=ordering):
+                pages = self.walk({"ordering": ordering, "page_size": 5})
+                ids = [book["id"] for page in pages for book in page["results"]]
+                self.assertEqual(ids, self.expected_ids(*expected))
+                self.assertEqual(len(pages), 5)
+
+    def test_previous_links_walk_back(self):
+        forward = self.walk({"ordering": "-publication_year", "page_size": 5})
+        backward = [forward[-1]]
+        while backward[-1]["previous"]:
+            resp = self.client.get(backward[-1]["previous"])
+            backward.append(resp.json())
+        self.assertEqual(
+            [page["results"] for page in reversed(backward)],
+            [page["results"] for page in forward],
+        )
+
+    def test_works_with_filters_and_search(self):
+        pages = self.walk({"author": self.orwell.id, "search": "Title", "ordering": "title", "page_size": 3})
+        ids = [book["id"] for page in pages for book in page["results"]]
+        self.assertEqual(ids, list(
+            Book.objects.filter(author=self.orwell).order_by("title", "id").values_list("id", flat=True)
+        ))
+
+    def test_cursor_for_another_ordering_is_rejected(self):
+        first = self.client.get(self.list_url, {"ordering": "title", "page_size": 5}).json()
+        resp = self.client.get(first["next"].replace("ordering=title", "ordering=publication_year"))
+        self.assertEqual(resp.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_garbage_cursor_is_rejected(self):
+        resp = self.client.get(self.list_url, {"cursor": "not-a-cursor"})
+        self.assertEqual(resp.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_tampered_cursors_are_rejected(self):
+        cases = [
+            ("title", {"o": ["title", "id"], "p": 5, "r": 0}),
+            ("title", {"o": 5, "p": ["Title 1", 1], "r": 0}),
+            ("title", {"o": ["title", 1], "p": ["Title 1", 1], "r": 0}),
+            ("title", {"o": ["title", "id"], "p": ["Title 1"], "r": 0}),
+            ("title", {"o": ["title", "id"], "p": ["Title 1", None], "r": 0}),
+            ("title", {"o": ["title", "id"], "p": ["Title 1", "x"], "r": 0}),
+            ("publication_year", {"o": ["publication_year", "id"], "p": ["abc", 1], "r": 0}),
+            ("publication_year", {"o": ["publication_year", "id"], "p": [[1990], 1], "r": 0}),
+        ]
+        for ordering, data in cases:
+            with self.subTest(data=data):
+                cursor = b64encode(json.dumps(data).encode("utf-8")).decode("ascii")
+                resp = self.client.get(self.list_url, {"ordering": ordering, "cursor": cursor})
+                self.assertEqual(resp.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_cursor_values_are_converted(self):
+        # Strings for numbers, as a hand-built cursor might have, still work.
+        data = {"o": ["publication_year", "id"], "p": ["1990", "0"], "r": 0}
+        cursor = b64encode(json.dumps(data).encode("utf-8")).decode("ascii")
+        resp = self.client.get(self.list_url, {"ordering": "publication_year", "cursor": cursor, "page_size": 50})
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(resp.json()["results"]), 23)
+
+
+class EstimatedCountTests(APITestCase):
+    """
+    Pages never run COUNT(*); the estimated total comes from a count that
+    runs after the request, once per refresh interval.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        author = Author.objects.create(name="George Orwell")
+        Book.objects.bulk_create(
+            Book(title=f"Title {i}", publication_year=1990, author=author) for i in range(5)
+        )
+
+    def get(self, **params):
+        # A new page_size each time skips the response cache; the count is shared.
+        self.page_size = getattr(self, "page_size", 0) + 1
+        with self.captureOnCommitCallbacks(execute=True):
+            with CaptureQueriesContext(connection) as ctx:
+                data = self.client.get(reverse("book-list"), {**params, "page_size": self.page_size}).json()
+        self.assertFalse([q for q in ctx.captured_queries if "COUNT(*)" in q["sql"]])
+        return data
+
+    @mock.patch.object(pagination, "refresh_in_background", lambda func: func())
+    def test_estimated_count(self):
+        self.assertIsNone(self.get()["estimated_count"])  # counted after the response
+        self.assertEqual(self.get()["estimated_count"], 5)
+        self.assertIsNone(self.get(publication_year=1991)["estimated_count"])  # per query
+        self.assertEqual(self.get(publication_year=1991)["estimated_count"], 0)
+
+    @mock.patch.object(pagination, "refresh_in_background")
+    def test_counts_once_per_interval(self, refresh):
+        self.get()
+        self.get()
+        self.assertEqual(refresh.call_count, 1)
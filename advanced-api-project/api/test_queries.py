@@ -0,0 +1,64 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve, reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from .models import Author, Book
+from .serializers import AuthorSerializer, BookSerializer, get_eager_loading_lookups
+
+
+class EagerLoadingLookupTests(TestCase):
+    """
+    The lookups are derived from the fields each serializer nests.
+    """
+
+    def test_author_serializer_prefetches_books(self):
+        self.assertEqual(get_eager_loading_lookups(AuthorSerializer), ([], ['books']))
+
+    def test_book_serializer_has_nothing_to_load(self):
+        self.assertEqual(get_eager_loading_lookups(BookSerializer), ([], []))
+
+
+class QueryBudgetTests(TestCase):
+    """
+    Each list endpoint declares a query_budget. A GET must stay within it,
+    and the number of queries must not grow with the number of rows.
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def seed(self, authors, books_per_author):
+        for i in range(authors):
+            author = Author.objects.create(name=f"Author {Author.objects.count()}")
+            Book.objects.bulk_create(
+                Book(title=f"{author.name} book {j}", publication_year=2000, author=author)
+                for j in range(books_per_author)
+            )
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(url)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        return len(ctx.captured_queries)
+
+    def assertWithinQueryBudget(self, url_name):
+        url = reverse(url_name)
+        budget = resolve(url).func.view_class.query_budget
+
+        self.seed(authors=2, books_per_author=2)
+        small = self.count_queries(url)
+        self.seed(authors=20, books_per_author=5)
+        large = self.count_queries(url)
+
+        self.assertLessEqual(large, budget)
+        self.assertEqual(small, large, "query count grows with the number of rows")
+
+    def test_author_list_query_budget(self):
+        self.assertWithinQueryBudget("author-list")
+
+    def test_book_list_query_budget(self):
+        self.assertWithinQueryBudget("book-list")
@@ -0,0 +1,164 @@
+import datetime
+import decimal
+import io
+import json
+import unittest
+import uuid
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils.translation import gettext_lazy
+
+from rest_framework import status
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient, APITestCase
+
+from . import renderers
+from .models import Author, Book
+from .renderers import FastJSONParser, FastJSONRenderer, MessagePackParser, MessagePackRenderer
+
+SAMPLE = {
+    "id": 1,
+    "title": "Ça ira     \U0001f4da",
+    "price": decimal.Decimal("12.50"),
+    "ratio": 0.1,
+    "floats": [1e16, 1e-7, -2.5e-300, 1.5e300, 1e15, 0.0001],
+    "exponent_text": "1e5 copies, 2e-7 \\\"3e8\" ",
+    "published": datetime.date(1949, 6, 8),
+    "updated_at": datetime.datetime(2024, 1, 2, 3, 4, 5, 678901, tzinfo=datetime.timezone.utc),
+    "time": datetime.time(12, 30),
+    "delay": datetime.timedelta(minutes=5),
+    "uuid": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+    "label": gettext_lazy("Books"),
+    "tags": ("a", "b"),
+    "nested": [{"empty": None, "flag": True}],
+    "big": 2 ** 60,
+}
+
+# orjson only encodes 64-bit ints; these render through JSONRenderer.
+WIDE_INTS = {**SAMPLE, "huge": 2 ** 70, "negative": [-(2 ** 63) - 1]}
+
+
+class FastJSONRendererTests(APITestCase):
+    """
+    FastJSONRenderer renders exactly what DRF's JSONRenderer does.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        orwell = Author.objects.create(name="George Orwell")
+        Book.objects.create(title="1984", publication_year=1949, author=orwell)
+        Book.objects.create(title="Animal Farm", publication_year=1945, author=orwell)
+        Author.objects.create(name="Émile Zola")
+
+    def assertSameOutput(self, data, accepted_media_type=None, renderer_context=None):
+        self.assertEqual(
+            FastJSONRenderer().render(data, accepted_media_type, renderer_context),
+            JSONRenderer().render(data, accepted_media_type, renderer_context),
+        )
+
+    def test_matches_json_renderer(self):
+        self.assertSameOutput(SAMPLE)
+        self.assertSameOutput([SAMPLE, SAMPLE])
+        self.assertSameOutput(WIDE_INTS)
+        self.assertSameOutput(None)
+        self.assertSameOutput({})
+
+    @unittest.skipUnless(renderers.orjson, "orjson is not installed")
+    def test_sample_is_rendered_by_orjson(self):
+        expected = JSONRenderer().render(SAMPLE)
+        with mock.patch.object(JSONRenderer, "render", side_effect=AssertionError("fell back")):
+            self.assertEqual(FastJSONRenderer().render(SAMPLE), expected)
+
+    def test_unencodable_data_raises_like_json_renderer(self):
+        with self.assertRaises(TypeError):
+            FastJSONRenderer().render({"value": object()})
+
+    def test_indent_uses_json_renderer(self):
+        self.assertSameOutput(SAMPLE, "application/json; indent=2")
+        self.assertSameOutput(SAMPLE, None, {"indent": 4})
+
+    def test_falls_back_without_orjson(self):
+        with mock.patch.object(renderers, "orjson", None):
+            self.assertSameOutput(SAMPLE)
+
+    def test_api_responses_match_json_renderer(self):
+        for url in [reverse("book-list"), reverse("author-list"), reverse("statistics-summary")]:
+            resp = self.client.get(url, HTTP_ACCEPT="application/json")
+            self.assertEqual(resp.status_code, status.HTTP_200_OK)
+            self.assertIsInstance(resp.accepted_renderer, FastJSONRenderer)
+            self.assertEqual(resp.content, JSONRenderer().render(resp.data))
+
+
+class FastJSONParserTests(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="alice", password="password123")
+        self.author = Author.objects.create(name="George Orwell")
+
+    def parse(self, parser, body, encoding="utf-8"):
+        return parser.parse(io.BytesIO(body), "application/json", {"encoding": encoding})
+
+    def test_matches_json_parser(self):
+        body = JSONRenderer().render(SAMPLE)
+        self.assertEqual(self.parse(FastJSONParser(), body), self.parse(JSONParser(), body))
+
+    def test_rejects_invalid_json(self):
+        for body in [b"{", b'{"a": NaN}', b"\xff"]:
+            with self.subTest(body=body), self.assertRaises(ParseError):
+                self.parse(FastJSONParser(), body)
+
+    def test_other_encodings_use_json_parser(self):
+        body = '{"title": "Ça ira"}'.encode("latin-1")
+        self.assertEqual(self.parse(FastJSONParser(), body, "latin-1"), {"title": "Ça ira"})
+
+    def test_create_book(self):
+        self.client.force_authenticate(self.user)
+        resp = self.client.post(
+            reverse("book-create"),
+            b'{"title": "Homage to Catalonia", "publication_year": 1938, "author": %d}' % self.author.pk,
+            content_type="application/json",
+        )
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(Book.objects.filter(title="Homage to Catalonia").exists())
+
+        resp = self.client.post(reverse("book-create"), b'{"title": ', content_type="application/json")
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("JSON parse error", resp.json()["detail"])
+
+
+@unittest.skipUnless(renderers.msgpack, "msgpack is not installed")
+class MessagePackTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="alice", password="password123")
+        self.author = Author.objects.create(name="George Orwell")
+        Book.objects.create(title="1984", publication_year=1949, author=self.author)
+
+    def test_round_trip_matches_json(self):
+        packed = MessagePackRenderer().render(SAMPLE)
+        unpacked = MessagePackParser().parse(io.BytesIO(packed))
+        self.assertEqual(unpacked, json.loads(JSONRenderer().render(SAMPLE)))
+
+    def test_negotiated_by_accept_header(self):
+        msgpack = renderers.msgpack
+        resp = self.client.get(reverse("book-list"), HTTP_ACCEPT="application/msgpack")
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp["Content-Type"], "application/msgpack")
+        self.assertEqual(msgpack.unpackb(resp.content), self.client.get(reverse("book-list")).json())
+
+    def test_create_book(self):
+        msgpack = renderers.msgpack
+        self.client.force_authenticate(self.user)
+        resp = self.client.post(
+            reverse("book-create"),
+            msgpack.packb({"title": "Animal Farm", "publication_year": 1945, "author": self.author.pk}),
+            content_type="application/msgpack",
+        )
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
@@ -0,0 +1,78 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+
+from .models import Author, Book
+from .search import FTS_TABLE, build_match_expression
+
+
+class FullTextSearchTests(APITestCase):
+    """
+    ?search= on BookListView is answered from the FTS5 index, which follows
+    Book and Author saves and deletes.
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.list_url = reverse("book-list")
+        self.orwell = Author.objects.create(name="George Orwell")
+        self.martin = Author.objects.create(name="Robert C. Martin")
+        self.farm = Book.objects.create(title="Animal Farm", publication_year=1945, author=self.orwell)
+        self.clean = Book.objects.create(title="Clean Code", publication_year=2008, author=self.martin)
+        self.coder = Book.objects.create(title="The Clean Coder: clean habits", publication_year=2011, author=self.martin)
+
+    def search(self, term, **params):
+        resp = self.client.get(self.list_url, {"search": term, **params})
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        return [book["title"] for book in resp.json()["results"]]
+
+    def indexed_ids(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT rowid FROM {FTS_TABLE} ORDER BY rowid")
+            return [row[0] for row in cursor.fetchall()]
+
+    def test_prefix_matching_on_title_and_author(self):
+        self.assertEqual(self.search("anim"), ["Animal Farm"])
+        self.assertEqual(self.search("orwe"), ["Animal Farm"])
+        self.assertEqual(set(self.search("Martin clean")), {"Clean Code", "The Clean Coder: clean habits"})
+        self.assertEqual(self.search("nothing here"), [])
+
+    def test_results_are_ranked_unless_ordering_is_given(self):
+        self.assertEqual(self.search("clean")[0], "The Clean Coder: clean habits")
+        self.assertEqual(self.search("clean", ordering="title"), ["Clean Code", "The Clean Coder: clean habits"])
+
+    def test_index_follows_saves_and_deletes(self):
+        self.clean.title = "Refactoring"
+        self.clean.save()
+        self.assertEqual(self.search("refact"), ["Refactoring"])
+
+        self.orwell.name = "Eric Blair"
+        self.orwell.save()
+        self.assertEqual(self.search("blair"), ["Animal Farm"])
+        self.assertEqual(self.search("orwell"), [])
+
+        self.martin.delete()
+        self.assertEqual(self.indexed_ids(), [self.farm.id])
+
+    def test_rebuild_command_indexes_bulk_loaded_books(self):
+        Book.objects.bulk_create(
+            Book(title=f"Bulk {i}", publication_year=2000, author=self.orwell) for i in range(7)
+        )
+        self.assertEqual(self.search("bulk"), [])
+
+        out = StringIO()
+        call_command("rebuild_search_index", batch_size=3, stdout=out)
+        self.assertIn("Indexed 10 books.", out.getvalue())
+        self.assertEqual(len(self.search("bulk")), 7)
+
+    def test_match_expression_escapes_input(self):
+        self.assertEqual(build_match_expression('say "hi" c.'), '"say"* """hi"""* "c."*')
+        self.assertIsNone(build_match_expression(" -- "))
+        self.assertEqual(self.search('"unbalanced'), [])
+        # Operators are searched as plain words: "OR" is a prefix of "Orwell".
+        self.assertEqual(self.search("OR"), ["Animal Farm"])
@@ -0,0 +1,61 @@
+import json
+import re
+
+from django.test import override_settings
+from django.urls import reverse
+
+from rest_framework.test import APIClient, APITestCase
+
+from django_common.server_timing import ServerTimingMiddleware
+
+from .models import Author, Book
+
+
+class ServerTimingTests(APITestCase):
+    """
+    Sampled requests carry a Server-Timing header (and optionally a log line)
+    with the SQL, serializer, render and total timings.
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        author = Author.objects.create(name="George Orwell")
+        Book.objects.create(title="1984", publication_year=1949, author=author)
+
+    def metrics(self, response):
+        return {
+            name: float(duration)
+            for name, duration in re.findall(r"([\w-]+)(?:;desc=\"[^\"]*\")?;dur=([\d.]+)", response["Server-Timing"])
+        }
+
+    @override_settings(SERVER_TIMING_SAMPLE_RATE=1.0)
+    def test_header(self):
+        response = self.client.get(reverse("author-list"))
+        self.assertIn('db;desc="2 queries"', response["Server-Timing"])
+        metrics = self.metrics(response)
+        self.assertEqual(set(metrics), {"db", "db-max", "ser", "render", "total"})
+        self.assertGreater(metrics["ser"], 0)
+        self.assertGreater(metrics["render"], 0)
+        self.assertGreaterEqual(metrics["total"], metrics["db"] + metrics["ser"] + metrics["render"] - 0.01)
+
+    @override_settings(SERVER_TIMING_SAMPLE_RATE=1.0)
+    def test_values_list_rows_count_as_serialization(self):
+        self.assertGreater(self.metrics(self.client.get(reverse("book-list")))["ser"], 0)
+
+    @override_settings(SERVER_TIMING_SAMPLE_RATE=0.0)
+    def test_unsampled_requests_are_untouched(self):
+        self.assertNotIn("Server-Timing", self.client.get(reverse("author-list")))
+
+    @override_settings(SERVER_TIMING_SAMPLE_RATE=1.0, SERVER_TIMING_LOG=True)
+    def test_log_line(self):
+        with self.assertLogs("server_timing", "INFO") as logs:
+            self.client.get(reverse("book-detail", args=[1000]))
+        data = json.loads(logs.records[0].getMessage())
+        self.assertEqual((data["path"], data["status"]), (reverse("book-detail", args=[1000]), 404))
+        self.assertIn("SELECT", data["db_slowest_sql"])
+
+    def test_sample_rate(self):
+        middleware = ServerTimingMiddleware(lambda request: None)
+        middleware.sample_rate = 0.25
+        hits = sum(middleware.sampled() for _ in range(4000))
+        self.assertTrue(700 < hits < 1300, hits)
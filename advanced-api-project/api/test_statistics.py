@@ -0,0 +1,226 @@
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import Count, Max, Min, QuerySet
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+
+from . import search, statistics
+from .models import Author, AuthorStatistics, Book, BookSearchIndex, PublicationYearStatistics
+
+
+class StatisticsTests(APITestCase):
+    """
+    The summary tables always match a GROUP BY over api_book, and the
+    statistics endpoints are served from them.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.orwell = Author.objects.create(name="George Orwell")
+        self.huxley = Author.objects.create(name="Aldous Huxley")
+        self.book = Book.objects.create(title="1984", publication_year=1949, author=self.orwell)
+        Book.objects.create(title="Animal Farm", publication_year=1945, author=self.orwell)
+        Book.objects.create(title="Brave New World", publication_year=1932, author=self.huxley)
+
+    def assertStatisticsMatchBooks(self):
+        years = dict(Book.objects.values_list("publication_year").annotate(Count("id")).order_by())
+        self.assertEqual(dict(PublicationYearStatistics.objects.values_list("publication_year", "book_count")), years)
+
+        authors = {
+            row.pop("author"): row
+            for row in Book.objects.values("author").annotate(
+                book_count=Count("id"),
+                first_publication_year=Min("publication_year"),
+                last_publication_year=Max("publication_year"),
+            ).order_by()
+        }
+        self.assertEqual(
+            {
+                row.pop("author_id"): row
+                for row in AuthorStatistics.objects.values(
+                    "author_id", "book_count", "first_publication_year", "last_publication_year",
+                )
+            },
+            authors,
+        )
+
+    def test_create_update_delete(self):
+        self.assertStatisticsMatchBooks()
+
+        Book.objects.create(title="Homage to Catalonia", publication_year=1949, author=self.orwell)
+        self.assertStatisticsMatchBooks()
+
+        self.book.publication_year = 1950
+        self.book.save()
+        self.assertStatisticsMatchBooks()
+
+        self.book.author = self.huxley
+        self.book.save()
+        self.assertStatisticsMatchBooks()
+
+        self.book.delete()
+        self.assertStatisticsMatchBooks()
+
+    def test_year_created_concurrently(self):
+        # Another request inserts 1949's row between our UPDATE and INSERT: the
+        # first UPDATE matches nothing, then the INSERT hits the unique constraint.
+        real_update = QuerySet.update
+        raced = []
+
+        def update(queryset, **kwargs):
+            if queryset.model is PublicationYearStatistics and not raced:
+                raced.append(True)
+                return 0
+            return real_update(queryset, **kwargs)
+
+        with mock.patch.object(QuerySet, "update", update):
+            statistics._increment_year(1949)
+        self.assertEqual(PublicationYearStatistics.objects.get(publication_year=1949).book_count, 2)
+        self.assertEqual(raced, [True])
+
+    def test_author_delete_cascades(self):
+        self.orwell.delete()
+        self.assertStatisticsMatchBooks()
+        self.assertFalse(PublicationYearStatistics.objects.filter(publication_year=1949).exists())
+
+    def test_author_delete_costs_the_same_for_more_books(self):
+        def delete_queries(books):
+            author = Author.objects.create(name=f"Prolific {books}")
+            for i in range(books):
+                Book.objects.create(title=f"Book {i}", publication_year=1945 + i % 3, author=author)
+            with CaptureQueriesContext(connection) as ctx:
+                author.delete()
+            self.assertStatisticsMatchBooks()
+            if search.is_supported():
+                self.assertEqual(BookSearchIndex.objects.count(), Book.objects.count())
+            return len(ctx.captured_queries)
+
+        self.assertEqual(delete_queries(3), delete_queries(30))
+
+    def test_author_queryset_delete_cascades(self):
+        Author.objects.filter(pk__in=[self.orwell.pk, self.huxley.pk]).delete()
+        self.assertStatisticsMatchBooks()
+        self.assertFalse(PublicationYearStatistics.objects.exists())
+
+    def test_bulk_endpoint_keeps_statistics(self):
+        self.client.force_authenticate(User.objects.create_user(username="writer"))
+        url = reverse("book-bulk")
+        resp = self.client.post(url, [
+            {"title": "Island", "publication_year": 1962, "author": self.huxley.pk},
+            {"title": "Burmese Days", "publication_year": 1934, "author": self.orwell.pk},
+        ], format="json")
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        self.assertStatisticsMatchBooks()
+
+        resp = self.client.patch(url, [{"id": self.book.pk, "publication_year": 1962, "author": self.huxley.pk}], format="json")
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertStatisticsMatchBooks()
+
+        resp = self.client.delete(url, [self.book.pk], format="json")
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertStatisticsMatchBooks()
+
+    def test_rebuild_command(self):
+        PublicationYearStatistics.objects.all().delete()
+        AuthorStatistics.objects.update(book_count=99)
+        out = StringIO()
+        call_command("rebuild_statistics", stdout=out)
+        self.assertIn("3 years and 2 authors", out.getvalue())
+        self.assertStatisticsMatchBooks()
+
+    def test_endpoints(self):
+        resp = self.client.get(reverse("statistics-summary"))
+        self.assertEqual(resp.json(), {
+            "book_count": 3, "author_count": 2, "first_publication_year": 1932, "last_publication_year": 1949,
+        })
+
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(reverse("statistics-years"))
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertNotIn("api_book", ctx.captured_queries[0]["sql"])
+        self.assertEqual(resp.json(), [
+            {"publication_year": 1932, "book_count": 1},
+            {"publication_year": 1945, "book_count": 1},
+            {"publication_year": 1949, "book_count": 1},
+        ])
+        resp = self.client.get(reverse("statistics-years"), {"publication_year__gte": 1940})
+        self.assertEqual(len(resp.json()), 2)
+
+        resp = self.client.get(reverse("statistics-authors"))
+        self.assertEqual(resp.json()["results"][0], {
+            "author": self.orwell.pk, "author_name": "George Orwell", "book_count": 2,
+            "first_publication_year": 1945, "last_publication_year": 1949,
+        })
+
+    def test_endpoints_follow_writes(self):
+        url = reverse("statistics-years")
+        self.client.get(url)
+        Book.objects.create(title="Island", publication_year=1962, author=self.huxley)
+        self.assertEqual(self.client.get(url).json()[-1], {"publication_year": 1962, "book_count": 1})
+
+
+class AuthorBookCountTests(APITestCase):
+    """
+    Author.book_count and latest_publication_year follow the author's books,
+    and AuthorListCreateView orders and filters by them.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.orwell = Author.objects.create(name="George Orwell")
+        self.huxley = Author.objects.create(name="Aldous Huxley")
+        self.book = Book.objects.create(title="1984", publication_year=1949, author=self.orwell)
+        Book.objects.create(title="Animal Farm", publication_year=1945, author=self.orwell)
+
+    def assertCounts(self, author, book_count, latest_publication_year):
+        author = Author.objects.get(pk=author.pk)
+        self.assertEqual((author.book_count, author.latest_publication_year), (book_count, latest_publication_year))
+
+    def test_counts_follow_books(self):
+        self.assertCounts(self.orwell, 2, 1949)
+        self.assertCounts(self.huxley, 0, None)
+
+        self.book.author = self.huxley
+        self.book.save()
+        self.assertCounts(self.orwell, 1, 1945)
+        self.assertCounts(self.huxley, 1, 1949)
+
+        self.book.publication_year = 1932
+        self.book.save()
+        self.assertCounts(self.huxley, 1, 1932)
+
+        self.book.delete()
+        self.assertCounts(self.huxley, 0, None)
+
+    def test_stale_author_save_keeps_counts(self):
+        stale = Author.objects.get(pk=self.orwell.pk)
+        Book.objects.create(title="Homage to Catalonia", publication_year=1938, author=self.orwell)
+        stale.name = "Eric Blair"
+        stale.save()
+        self.assertCounts(self.orwell, 3, 1949)
+        self.assertEqual(Author.objects.get(pk=self.orwell.pk).name, "Eric Blair")
+
+    def test_repair_command(self):
+        Author.objects.update(book_count=7, latest_publication_year=2000)
+        out = StringIO()
+        call_command("repair_author_counts", batch_size=1, stdout=out)
+        self.assertIn("Checked 2 authors, corrected 2.", out.getvalue())
+        self.assertCounts(self.orwell, 2, 1949)
+        self.assertCounts(self.huxley, 0, None)
+
+    def test_author_list_orders_and_filters(self):
+        url = reverse("author-list")
+        names = [author["name"] for author in self.client.get(url, {"ordering": "book_count"}).json()]
+        self.assertEqual(names, ["Aldous Huxley", "George Orwell"])
+        data = self.client.get(url, {"book_count__gte": 1, "fields": "name,book_count,latest_publication_year"}).json()
+        self.assertEqual(data, [{"name": "George Orwell", "book_count": 2, "latest_publication_year": 1949}])
@@ -0,0 +1,51 @@
+from io import StringIO
+
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from .models import Author, Book
+from .serializers import AuthorSerializer, BookSerializer, ValuesSerializer, get_values_serializer
+
+
+class ValuesSerializerTests(TestCase):
+    """
+    The .values() fast path must render byte-identical JSON to BookSerializer.
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.orwell = Author.objects.create(name="George Orwell")
+        self.martin = Author.objects.create(name="Robert C. Martin")
+        Book.objects.create(title="1984", publication_year=1949, author=self.orwell)
+        Book.objects.create(title="Animal Farm", publication_year=1945, author=self.orwell)
+        Book.objects.create(title="Clean Code ☕", publication_year=2008, author=self.martin)
+
+    def test_identical_json(self):
+        queryset = Book.objects.order_by("id")
+        fast = get_values_serializer(BookSerializer)
+        self.assertEqual(
+            JSONRenderer().render(fast.to_representation(fast.get_queryset(queryset))),
+            JSONRenderer().render(BookSerializer(queryset, many=True).data),
+        )
+
+    def test_book_list_pages_match_serializer(self):
+        for params in ({}, {"ordering": "-publication_year", "page_size": 2}, {"search": "orwell"}):
+            with self.subTest(params=params):
+                results = self.client.get(reverse("book-list"), params).json()["results"]
+                expected = [BookSerializer(Book.objects.get(pk=book["id"])).data for book in results]
+                self.assertTrue(results)
+                self.assertEqual(results, expected)
+
+    def test_nested_serializers_are_rejected(self):
+        with self.assertRaises(ImproperlyConfigured):
+            ValuesSerializer(AuthorSerializer)
+
+    def test_benchmark_command(self):
+        out = StringIO()
+        call_command("benchmark_book_serializer", rows=50, repeat=1, stdout=out)
+        self.assertIn("Identical output", out.getvalue())
+        self.assertFalse(Book.objects.filter(title__startswith="Benchmark").exists())
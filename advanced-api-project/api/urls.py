@@ -1,12 +1,25 @@
 from django.urls import path
-from . import views
+from . import async_views, views
 
 
 
 urlpatterns = [
+    path('authors/', views.AuthorListCreateView.as_view(), name='author-list'),
     path('books/', views.BookListView.as_view(), name='book-list'),
+    path('books/export.<str:export_format>', views.BookExportView.as_view(), name='book-export'),
     path('books/<int:pk>/', views.BookDetailView.as_view(), name='book-detail'),
     path('books/create/', views.BookCreateView.as_view(), name='book-create'),
+    path('books/bulk/', views.BookBulkView.as_view(), name='book-bulk'),
     path('books/update/<int:pk>/', views.BookUpdateView.as_view(), name='book-update'),
     path('books/delete/<int:pk>/', views.BookDeleteView.as_view(), name='book-delete'),
+    path('statistics/', views.StatisticsSummaryView.as_view(), name='statistics-summary'),
+    path('statistics/years/', views.PublicationYearStatisticsView.as_view(), name='statistics-years'),
+    path('statistics/authors/', views.AuthorStatisticsView.as_view(), name='statistics-authors'),
+
+    # Async (ASGI-native) variants; point a route at either version as needed.
+    path('async/books/', async_views.AsyncBookListView.as_view(), name='async-book-list'),
+    path('async/books/<int:pk>/', async_views.AsyncBookDetailView.as_view(), name='async-book-detail'),
+    path('async/books/create/', async_views.AsyncBookCreateView.as_view(), name='async-book-create'),
+    path('async/books/update/<int:pk>/', async_views.AsyncBookUpdateView.as_view(), name='async-book-update'),
+    path('async/books/delete/<int:pk>/', async_views.AsyncBookDeleteView.as_view(), name='async-book-delete'),
 ]
\ No newline at end of file
@@ -2,27 +2,121 @@ from django.shortcuts import render
 
 # Create your views here.
 
-from .models import Author, Book
-from .serializers import AuthorSerializer, BookSerializer
+from .models import Author, AuthorStatistics, Book, PublicationYearStatistics
+from .serializers import (
+    AuthorSerializer, AuthorStatisticsSerializer, BookSerializer, DynamicFieldsMixin, PublicationYearStatisticsSerializer,
+    get_eager_loading_lookups, get_field_options, get_only_fields, get_values_serializer,
+)
 from .serializers import BookSerializer
+from .cache import CachedResponseMixin
+from .conditional import ConditionalGetMixin
+from .pagination import AuthorStatisticsPagination, KeysetCursorPagination
+from .search import FullTextSearchFilter, RankedOrderingFilter
+from . import cache, export, search, statistics
 from datetime import datetime
-from rest_framework import generics, filters
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from django.db import transaction
+from django.http import Http404, StreamingHttpResponse
+from django.db.models import Max, Min, Sum
+from rest_framework import generics, filters, permissions, status
+from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticatedOrReadOnly, IsAuthenticated
 from rest_framework.filters import SearchFilter, OrderingFilter
+from django_common.server_timing import ServerTimingMixin, serializing
 from django_filters import rest_framework  # required for checker
 from django_filters.rest_framework import DjangoFilterBackend
 from .serializers import BookSerializer
+import logging
 
+logger = logging.getLogger(__name__)
 
-class AuthorListCreateView(generics.ListCreateAPIView):
+
+class EagerLoadingMixin:
+    """
+    Loads every relation the serializer nests together with the queryset,
+    so listing N objects costs a fixed number of queries instead of N + 1.
+    Only the relations the response renders are loaded (see ?fields= / ?expand=),
+    and a sparse fieldset narrows the SELECT with .only().
+    query_budget: the most queries one GET on the view may run (checked in tests).
+    """
+    query_budget = None
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        select_related, prefetch_related = get_eager_loading_lookups(self.get_serializer())
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        if prefetch_related:
+            queryset = queryset.prefetch_related(*prefetch_related)
+        return queryset
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.request.method != 'GET' or get_field_options(self.request)['fields'] is None:
+            return queryset
+        only = get_only_fields(self.get_serializer())
+        if only is None:
+            return queryset
+        # Keyset pagination reads the ordering columns of the last row.
+        for name in queryset.query.order_by:
+            if isinstance(name, str):
+                try:
+                    queryset.model._meta.get_field(name.lstrip('-'))
+                except FieldDoesNotExist:
+                    continue
+                only.append(name.lstrip('-'))
+        return queryset.only(*only)
+
+
+class ValuesListMixin:
+    """
+    Opt-in fast path for read-only list endpoints with a flat serializer:
+    rows are fetched with .values() and rendered by a ValuesSerializer, which
+    produces exactly the data the serializer would, without building models.
+    Honours ?fields=; an ?expand= that nests a serializer falls back to the
+    regular list().
+    """
+
+    def list(self, request, *args, **kwargs):
+        serializer_class = self.get_serializer_class()
+        options = get_field_options(request) if issubclass(serializer_class, DynamicFieldsMixin) else {}
+        try:
+            fast = get_values_serializer(serializer_class, **options)
+        except ImproperlyConfigured:
+            return super().list(request, *args, **kwargs)
+        queryset = fast.get_queryset(self.filter_queryset(self.get_queryset()))
+
+        page = self.paginate_queryset(queryset)
+        with serializing(request):
+            data = fast.to_representation(queryset if page is None else page)
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
+
+
+class AuthorListCreateView(ServerTimingMixin, CachedResponseMixin, EagerLoadingMixin, generics.ListCreateAPIView):
     """
     Handles GET (list authors with nested books) and POST (create new author).
+    Nested books are prefetched: one query for authors, one for all their books.
+    GET responses are cached until an Author or Book changes.
+    Supports ?fields= (e.g. id,name to skip the books) and ?expand=books.author.
+    Ordering and filtering by the denormalized book_count and
+    latest_publication_year columns need no join:
+    ?ordering=-book_count, ?book_count__gte=3, ?latest_publication_year__lte=1950.
     """
     queryset = Author.objects.all()
     serializer_class = AuthorSerializer
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
+    filterset_fields = {
+        'book_count': ['exact', 'gte', 'lte'],
+        'latest_publication_year': ['exact', 'gte', 'lte'],
+    }
+    ordering_fields = ['name', 'book_count', 'latest_publication_year']
+    query_budget = 2
+    cache_dependencies = (Author, Book)
 
 
-class BookListCreateView(generics.ListCreateAPIView):
+class BookListCreateView(ServerTimingMixin, generics.ListCreateAPIView):
     """
     Handles GET (list books) and POST (create new book).
     """
@@ -37,46 +131,151 @@ class BookListCreateView(generics.ListCreateAPIView):
 # READ OPERATIONS
 # ---------------------
 
-class BookListView(generics.ListAPIView):
+class BookListView(ServerTimingMixin, CachedResponseMixin, ConditionalGetMixin, EagerLoadingMixin, ValuesListMixin, generics.ListAPIView):
     """
     ListView for retrieving all books.
     Supports:
         - Filtering by title, author name, and publication year.
-        - Searching by title or author's name.
+        - Searching by title or author's name (FTS5 index, ranked by relevance).
         - Ordering by title or publication year.
+        - Keyset (cursor) pagination that follows the active ordering.
+    Responses are cached per query string until a Book or Author changes,
+    and carry an ETag (from the Book/Author versions, no SQL) so unchanged
+    pages can be answered with 304.
+    Rows are rendered from .values() (ValuesListMixin), not model instances.
+    Supports ?fields=id,title and ?expand=author.
     """
     queryset = Book.objects.all()
     serializer_class = BookSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
+    pagination_class = KeysetCursorPagination
 
     # Enable filter, search, and ordering
-    filter_backends = [rest_framework.DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [rest_framework.DjangoFilterBackend, FullTextSearchFilter, RankedOrderingFilter]
 
     # Filtering: query parameters ?title=...&publication_year=...
     filterset_fields = ['title', 'publication_year', 'author']
 
-    # Searching: query parameter ?search=keyword
+    # Searching: query parameter ?search=keyword (prefix matches, e.g. ?search=orw)
     search_fields = ['title', 'author__name']
 
     # Ordering: query parameter ?ordering=title or ?ordering=-publication_year
     ordering_fields = ['title', 'publication_year']
     ordering = ['title']  # default ordering
 
+    query_budget = 1  # the page; the ETag comes from the cache versions
+    cache_dependencies = (Book, Author)
+
+
+class BookExportView(generics.GenericAPIView):
+    """
+    Streams every book (with its author's name) as NDJSON or CSV:
+        /books/export.ndjson, /books/export.csv
+    Accepts the same filter, search and ordering parameters as BookListView.
+    Rows are read in chunks and written as they are encoded, so memory stays
+    constant however large the table is.
+    """
+    queryset = Book.objects.all()
+    serializer_class = BookSerializer
+    permission_classes = [IsAuthenticatedOrReadOnly]
+    filter_backends = BookListView.filter_backends
+    filterset_fields = BookListView.filterset_fields
+    search_fields = BookListView.search_fields
+    ordering_fields = BookListView.ordering_fields
+    ordering = BookListView.ordering
+    chunk_size = 2000
+
+    def get(self, request, export_format, *args, **kwargs):
+        if export_format not in export.FORMATS:
+            raise Http404(f"Unknown export format: {export_format}")
+        queryset = self.filter_queryset(self.get_queryset())
+        _, content_type = export.FORMATS[export_format]
+        response = StreamingHttpResponse(
+            export.stream_export(queryset, export_format, self.chunk_size),
+            content_type=f"{content_type}; charset=utf-8",
+        )
+        response['Content-Disposition'] = f'attachment; filename="books.{export_format}"'
+        return response
+
 
-class BookDetailView(generics.RetrieveAPIView):
+class BookDetailView(ServerTimingMixin, CachedResponseMixin, ConditionalGetMixin, EagerLoadingMixin, generics.RetrieveAPIView):
     """
     DetailView for retrieving a single book by ID.
+    Responses are cached until the Book changes (or its Author, with
+    ?expand=author), and support conditional GET.
+    Supports ?fields= and ?expand=author.
     """
     queryset = Book.objects.all()
     serializer_class = BookSerializer
     permission_classes = [permissions.AllowAny]  # Public read access
+    cache_dependencies = (Book,)
+
+    def get_cache_dependencies(self):
+        if any(name.partition('.')[0] == 'author' for name in get_field_options(self.request)['expand']):
+            return (Book, Author)
+        return self.cache_dependencies
+
+
+# ---------------------
+# STATISTICS
+# ---------------------
+
+class StatisticsSummaryView(CachedResponseMixin, generics.GenericAPIView):
+    """
+    Totals for the dashboards, read from the precomputed statistics tables:
+    number of books and authors, first and last publication year.
+    Costs O(#years), whatever the number of books.
+    """
+    queryset = PublicationYearStatistics.objects.all()
+    permission_classes = [permissions.AllowAny]
+    cache_dependencies = (Book, Author)
+
+    def get(self, request, *args, **kwargs):
+        summary = self.get_queryset().aggregate(
+            book_count=Sum('book_count'),
+            first_publication_year=Min('publication_year'),
+            last_publication_year=Max('publication_year'),
+        )
+        summary['book_count'] = summary['book_count'] or 0
+        summary['author_count'] = AuthorStatistics.objects.count()
+        return Response(summary)
+
+
+class PublicationYearStatisticsView(ServerTimingMixin, CachedResponseMixin, generics.ListAPIView):
+    """
+    Books per publication year (histogram), oldest year first.
+    Supports ?ordering=-book_count and ?publication_year__gte= / __lte=.
+    """
+    queryset = PublicationYearStatistics.objects.all()
+    serializer_class = PublicationYearStatisticsSerializer
+    permission_classes = [permissions.AllowAny]
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
+    filterset_fields = {'publication_year': ['exact', 'gte', 'lte']}
+    ordering_fields = ['publication_year', 'book_count']
+    ordering = ['publication_year']
+    cache_dependencies = (Book,)
+
+
+class AuthorStatisticsView(ServerTimingMixin, CachedResponseMixin, generics.ListAPIView):
+    """
+    Book count and first/last publication year per author, most books first,
+    keyset paginated. Supports ?ordering=first_publication_year etc.
+    """
+    queryset = AuthorStatistics.objects.select_related('author')
+    serializer_class = AuthorStatisticsSerializer
+    permission_classes = [permissions.AllowAny]
+    pagination_class = AuthorStatisticsPagination
+    filter_backends = [filters.OrderingFilter]
+    ordering_fields = ['book_count', 'first_publication_year', 'last_publication_year']
+    ordering = ['-book_count']
+    cache_dependencies = (Book, Author)
 
 
 # ---------------------
 # CREATE OPERATION
 # ---------------------
 
-class BookCreateView(generics.CreateAPIView):
+class BookCreateView(ServerTimingMixin, generics.CreateAPIView):
     """
     CreateView for adding a new book.
     Only authenticated users can create.
@@ -96,11 +295,122 @@ class BookCreateView(generics.CreateAPIView):
         serializer.save()
 
 
+# ---------------------
+# BULK OPERATIONS
+# ---------------------
+
+class BookBulkView(ServerTimingMixin, generics.GenericAPIView):
+    """
+    Bulk endpoint for syncing many books in one request.
+        - POST:   JSON array of books to create.
+        - PATCH:  JSON array of partial books, each with its "id" (PUT: full books).
+        - DELETE: JSON array of book ids.
+    Items are validated with BookSerializer(many=True) and written with
+    bulk_create/bulk_update inside one transaction.
+    Query parameters:
+        - ?allow_partial=true: write the valid items and return the errors of the
+          others as {"index", "errors"} instead of rejecting the whole request.
+        - ?batch_size=N: rows per INSERT/UPDATE statement (default 500, max 1000).
+    Only authenticated users can write.
+    """
+    queryset = Book.objects.all()
+    serializer_class = BookSerializer
+    permission_classes = [permissions.IsAuthenticated]  # Auth required
+    batch_size = 500
+    max_batch_size = 1000
+
+    def get_batch_size(self):
+        try:
+            batch_size = int(self.request.query_params.get('batch_size', self.batch_size))
+        except ValueError:
+            return self.batch_size
+        return min(max(batch_size, 1), self.max_batch_size)
+
+    def allow_partial(self):
+        return self.request.query_params.get('allow_partial', '').lower() in ('1', 'true', 'yes')
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['batch_size'] = self.get_batch_size()
+        context['allow_partial'] = self.allow_partial()
+        return context
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data, many=True)
+        return self.perform_bulk_write(serializer, status.HTTP_201_CREATED)
+
+    def patch(self, request, *args, **kwargs):
+        return self.bulk_update(request, partial=True)
+
+    def put(self, request, *args, **kwargs):
+        return self.bulk_update(request, partial=False)
+
+    def bulk_update(self, request, partial):
+        items = request.data if isinstance(request.data, list) else []
+        ids = [item.get('id') for item in items if isinstance(item, dict)]
+        instances = self.get_queryset().filter(pk__in=[pk for pk in ids if isinstance(pk, int)])
+        serializer = self.get_serializer(instances, data=request.data, many=True, partial=partial)
+        return self.perform_bulk_write(serializer, status.HTTP_200_OK)
+
+    def perform_bulk_write(self, serializer, success_status):
+        serializer.is_valid(raise_exception=True)
+        # Where the statistics count the books being updated, before they change.
+        previous = [(book.publication_year, book.author_id) for book in serializer.instance or ()]
+        with transaction.atomic():
+            books = serializer.save()
+            self.after_bulk_write([book.pk for book in books], previous)
+        return Response({'results': serializer.data, 'errors': serializer.item_errors}, status=success_status)
+
+    def delete(self, request, *args, **kwargs):
+        ids = request.data
+        if not isinstance(ids, list) or not all(isinstance(pk, int) for pk in ids):
+            return Response({'detail': 'Expected a JSON array of book ids.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        found = set(self.get_queryset().filter(pk__in=ids).values_list('pk', flat=True))
+        errors = [
+            {'index': index, 'errors': {'id': ['No book with this id.']}}
+            for index, pk in enumerate(ids) if pk not in found
+        ]
+        if errors and not self.allow_partial():
+            # Same shape as a failed BookSerializer(many=True): errors keyed by item index.
+            return Response(
+                {str(error['index']): error['errors'] for error in errors},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        found = sorted(found)
+        batch_size = self.get_batch_size()
+        with transaction.atomic():
+            for start in range(0, len(found), batch_size):
+                # Deletes still send post_delete, which keeps the search index and cache in sync.
+                self.get_queryset().filter(pk__in=found[start:start + batch_size]).delete()
+        return Response({'deleted': len(found), 'errors': errors}, status=status.HTTP_200_OK)
+
+    def after_bulk_write(self, ids, previous=()):
+        """
+        bulk_create/bulk_update send no signals: refresh the search index, the
+        statistics of every year and author the books left or joined, and
+        invalidate cached responses here instead.
+        """
+        batch_size = self.get_batch_size()
+        years, authors = {year for year, _ in previous}, {author for _, author in previous}
+        for start in range(0, len(ids), batch_size):
+            batch = Book.objects.filter(pk__in=ids[start:start + batch_size])
+            if search.is_supported():
+                search.index_books(batch)
+            for year, author in batch.values_list('publication_year', 'author_id'):
+                years.add(year)
+                authors.add(author)
+        statistics.refresh_years(years)
+        statistics.refresh_authors(authors)
+        cache.bump_model_version(Book)
+
+
 # ---------------------
 # UPDATE OPERATION
 # ---------------------
 
-class BookUpdateView(generics.UpdateAPIView):
+class BookUpdateView(ServerTimingMixin, generics.UpdateAPIView):
     """
     UpdateView for modifying an existing book.
     Only authenticated users can update.
@@ -113,7 +423,7 @@ class BookUpdateView(generics.UpdateAPIView):
         """
         Example: Custom update logic could log changes or restrict edits.
         """
-        print(f"Updating book: {serializer.instance.title}")
+        logger.debug("Updating book %s: %s", serializer.instance.pk, serializer.instance.title)
         serializer.save()
 
 
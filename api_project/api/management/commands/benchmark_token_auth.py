@@ -0,0 +1,65 @@
+from time import perf_counter
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from django_common.authentication import CachedTokenAuthentication, token_cache
+
+from api.models import Author, Book
+from api.views import BookViewSet
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare queries and latency per authenticated request on BookViewSet "
+        "with TokenAuthentication and CachedTokenAuthentication. Data is rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=200, help="Requests per variant (default: 200).")
+        parser.add_argument("--books", type=int, default=20, help="Books to seed (default: 20).")
+
+    def handle(self, *args, **options):
+        if min(options["requests"], options["books"]) < 1:
+            raise CommandError("--requests and --books must be positive integers.")
+
+        results = {}
+        with transaction.atomic(), override_settings(ALLOWED_HOSTS=["testserver"]):
+            user = User.objects.create_user(username="benchmark-token-auth")
+            token = Token.objects.create(user=user)
+            authors = [Author.objects.get_for_name(f"Benchmark Author {i}") for i in range(10)]
+            Book.objects.bulk_create(
+                Book(title=f"Book {i}", author=authors[i % 10]) for i in range(options["books"])
+            )
+            client = APIClient()
+            client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+
+            for name, auth_class in [("TokenAuthentication", TokenAuthentication),
+                                     ("CachedTokenAuthentication", CachedTokenAuthentication)]:
+                token_cache.clear()
+                with mock.patch.object(BookViewSet, "authentication_classes", [auth_class]):
+                    client.get("/api/books_all/")  # warm-up; fills the cache
+                    with CaptureQueriesContext(connection) as ctx:
+                        start = perf_counter()
+                        for _ in range(options["requests"]):
+                            response = client.get("/api/books_all/")
+                            if response.status_code != 200:
+                                raise CommandError(f"{name}: unexpected status {response.status_code}")
+                        elapsed = perf_counter() - start
+                results[name] = (len(ctx.captured_queries) / options["requests"],
+                                 elapsed / options["requests"] * 1000)
+            token_cache.clear()
+            transaction.set_rollback(True)
+
+        self.stdout.write(f"{options['requests']} requests to /api/books_all/ per variant")
+        self.stdout.write(f"{'authentication':<28} {'queries/req':>12} {'ms/req':>9}")
+        for name, (queries, ms) in results.items():
+            self.stdout.write(f"{name:<28} {queries:>12.2f} {ms:>9.2f}")
+        saved = results["TokenAuthentication"][0] - results["CachedTokenAuthentication"][0]
+        self.stdout.write(f"Queries saved per request: {saved:.2f}")
@@ -1,9 +1,41 @@
 from django.db import models
 
+
+def normalize_author_name(name):
+    """
+    The key authors are deduplicated on: whitespace collapsed, case folded.
+    """
+    return ' '.join(name.split()).casefold()
+
+
+class AuthorManager(models.Manager):
+    def get_for_name(self, name):
+        """
+        The Author with this name (compared normalized), created if needed.
+        """
+        name = ' '.join(name.split())
+        author, _ = self.get_or_create(normalized_name=normalize_author_name(name), defaults={'name': name})
+        return author
+
+
+class Author(models.Model):
+    name = models.CharField(max_length=255)
+    # casefold() can turn one character into up to three ('ß' -> 'ss', 'ﬃ' -> 'ffi').
+    normalized_name = models.CharField(max_length=765, unique=True, editable=False)
+
+    objects = AuthorManager()
+
+    def save(self, *args, **kwargs):
+        self.normalized_name = normalize_author_name(self.name)
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return self.name
+
+
 class Book(models.Model):
     title = models.CharField(max_length=255)
-    author = models.CharField(max_length=255)
+    author = models.ForeignKey(Author, on_delete=models.PROTECT, related_name='books')
 
     def __str__(self):
         return f"{self.title} by {self.author}"
-
@@ -0,0 +1,133 @@
+"""
+Pagination without SELECT COUNT(*).
+
+DRF's PageNumberPagination counts the whole table on every page.
+CountFreePageNumberPagination uses django_common.pagination.CountFreePaginator
+instead, which fetches page_size + 1 rows: the extra row only tells whether
+there is a next page, and the total is reported as an estimate.
+CountFreeLimitOffsetPagination does the same for ?limit=&offset=, and
+BookCursorPagination never needs a count.
+
+Settings:
+    API_PAGE_SIZE: default page size (default: 20).
+    API_MAX_PAGE_SIZE: largest page a client may request (default: 100).
+"""
+from django.conf import settings
+from django.core.paginator import InvalidPage
+from django_common.pagination import CountFreePaginator, get_estimated_count
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, LimitOffsetPagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+PAGE_SIZE = getattr(settings, 'API_PAGE_SIZE', 20)
+MAX_PAGE_SIZE = getattr(settings, 'API_MAX_PAGE_SIZE', 100)
+
+
+class CountFreePageNumberPagination(PageNumberPagination):
+    """
+    ?page=N&page_size=M pagination backed by CountFreePaginator.
+    Responses: {'estimated_count', 'next', 'previous', 'results'}, where
+    estimated_count is null until the first background count finishes.
+    """
+    django_paginator_class = CountFreePaginator
+    page_size = PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = MAX_PAGE_SIZE
+    last_page_strings = ()  # the last page is unknown without a count
+    template = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        paginator = self.django_paginator_class(queryset, page_size)
+        page_number = self.get_page_number(request, paginator)
+        try:
+            self.page = paginator.page(page_number)
+        except InvalidPage as exc:
+            raise NotFound(self.invalid_page_message.format(page_number=page_number, message=str(exc)))
+        return list(self.page)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'estimated_count': self.page.paginator.estimated_count,
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        schema = super().get_paginated_response_schema(schema)
+        schema['properties'] = {
+            'estimated_count': {'type': 'integer', 'nullable': True, 'example': 123},
+            **{name: value for name, value in schema['properties'].items() if name != 'count'},
+        }
+        schema['required'] = [name for name in schema.get('required', []) if name != 'count']
+        return schema
+
+
+class CountFreeLimitOffsetPagination(LimitOffsetPagination):
+    """
+    ?limit=M&offset=N pagination that fetches limit + 1 rows instead of counting.
+    Responses: {'estimated_count', 'next', 'previous', 'results'}.
+    """
+    default_limit = PAGE_SIZE
+    max_limit = MAX_PAGE_SIZE
+    template = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            return None
+
+        self.queryset = queryset
+        self.offset = self.get_offset(request)
+        rows = list(queryset[self.offset:self.offset + self.limit + 1])
+        self.has_next = len(rows) > self.limit
+        return rows[:self.limit]
+
+    def get_paginated_response(self, data):
+        return Response({
+            'estimated_count': get_estimated_count(self.queryset),
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        schema = super().get_paginated_response_schema(schema)
+        schema['properties'] = {
+            'estimated_count': {'type': 'integer', 'nullable': True, 'example': 123},
+            **{name: value for name, value in schema['properties'].items() if name != 'count'},
+        }
+        schema['required'] = [name for name in schema['required'] if name != 'count']
+        return schema
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = replace_query_param(self.request.build_absolute_uri(), self.limit_query_param, self.limit)
+        return replace_query_param(url, self.offset_query_param, self.offset + self.limit)
+
+    def get_previous_link(self):
+        if self.offset <= 0:
+            return None
+        url = replace_query_param(self.request.build_absolute_uri(), self.limit_query_param, self.limit)
+        if self.offset - self.limit <= 0:
+            return remove_query_param(url, self.offset_query_param)
+        return replace_query_param(url, self.offset_query_param, self.offset - self.limit)
+
+
+class BookCursorPagination(CursorPagination):
+    """
+    Opaque ?cursor= pagination on the primary key: constant cost at any depth
+    and stable while rows are inserted.
+    """
+    ordering = 'id'
+    page_size = PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = MAX_PAGE_SIZE
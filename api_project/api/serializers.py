@@ -1,7 +1,36 @@
 from rest_framework import serializers
-from .models import Book
+from .models import Author, Book
+
+
+class AuthorNameField(serializers.CharField):
+    """
+    A book's author as a plain name string, the shape the API had before
+    authors got their own table. BookSerializer maps written names to Authors.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault('max_length', 255)
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        return value.name
+
 
 class BookSerializer(serializers.ModelSerializer):
+    author = AuthorNameField()
+
     class Meta:
         model = Book
-        fields = '__all__'
\ No newline at end of file
+        fields = ['id', 'title', 'author']
+
+    def _resolve_author(self, validated_data):
+        # Only once the whole payload is valid, so rejected writes create no Author.
+        if 'author' in validated_data:
+            validated_data['author'] = Author.objects.get_for_name(validated_data['author'])
+        return validated_data
+
+    def create(self, validated_data):
+        return super().create(self._resolve_author(validated_data))
+
+    def update(self, instance, validated_data):
+        return super().update(instance, self._resolve_author(validated_data))
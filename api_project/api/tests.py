@@ -1,3 +1,190 @@
-from django.test import TestCase
+import json
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.core.management import call_command
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from .models import Author, Book
+from .pagination import MAX_PAGE_SIZE
+from .serializers import BookSerializer
+from .views import BookList
+
+
+class AuthorMigrationTests(TransactionTestCase):
+    """
+    0002-0004 move the Book.author strings into deduplicated Author rows, and
+    can be unapplied.
+    """
+    before = [('api', '0001_initial')]
+    after = [('api', '0004_book_author_fk')]
+
+    def migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    def tearDown(self):
+        # Back to the latest migrations for the tests that follow.
+        self.migrate(MigrationExecutor(connection).loader.graph.leaf_nodes())
+
+    def test_forwards_and_backwards(self):
+        apps = self.migrate(self.before)
+        OldBook = apps.get_model('api', 'Book')
+        OldBook.objects.bulk_create([
+            OldBook(title='1984', author='George  Orwell'),
+            OldBook(title='Animal Farm', author='george orwell'),
+            OldBook(title='Brave New World', author='Aldous Huxley'),
+        ])
+
+        apps = self.migrate(self.after)
+        NewAuthor, NewBook = apps.get_model('api', 'Author'), apps.get_model('api', 'Book')
+        self.assertEqual(
+            sorted(NewAuthor.objects.values_list('name', 'normalized_name')),
+            [('Aldous Huxley', 'aldous huxley'), ('George Orwell', 'george orwell')],
+        )
+        self.assertEqual(
+            dict(NewBook.objects.values_list('title', 'author__name')),
+            {'1984': 'George Orwell', 'Animal Farm': 'George Orwell', 'Brave New World': 'Aldous Huxley'},
+        )
+
+        # Unapplied, each book gets its author's display name back.
+        apps = self.migrate(self.before)
+        self.assertEqual(
+            dict(apps.get_model('api', 'Book').objects.values_list('title', 'author')),
+            {'1984': 'George Orwell', 'Animal Farm': 'George Orwell', 'Brave New World': 'Aldous Huxley'},
+        )
+
+
+class AuthorNameFieldTests(TestCase):
+    """
+    BookSerializer reads and writes the author as a name, mapped onto Authors.
+    """
+
+    def setUp(self):
+        self.orwell = Author.objects.get_for_name('George Orwell')
+
+    def test_renders_the_name(self):
+        book = Book.objects.create(title='1984', author=self.orwell)
+        self.assertEqual(BookSerializer(book).data, {'id': book.pk, 'title': '1984', 'author': 'George Orwell'})
+
+    def test_names_resolve_to_existing_authors(self):
+        serializer = BookSerializer(data={'title': 'Animal Farm', 'author': '  george   ORWELL '})
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        self.assertEqual(serializer.save().author, self.orwell)
+
+        serializer = BookSerializer(serializer.instance, data={'author': 'Aldous Huxley'}, partial=True)
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        self.assertEqual(serializer.save().author.name, 'Aldous Huxley')
+        self.assertEqual(Author.objects.count(), 2)
+
+    def test_invalid_payload_creates_no_author(self):
+        serializer = BookSerializer(data={'title': '', 'author': 'Nobody Yet'})
+        self.assertFalse(serializer.is_valid())
+        self.assertFalse(Author.objects.filter(normalized_name='nobody yet').exists())
+
+
+class AuthorFilterTests(APITestCase):
+    """
+    ?author=<name> keeps the books by that author, whatever the case or spacing.
+    """
+
+    def test_filter(self):
+        orwell = Author.objects.get_for_name('George Orwell')
+        huxley = Author.objects.get_for_name('Aldous Huxley')
+        Book.objects.create(title='1984', author=orwell)
+        Book.objects.create(title='Animal Farm', author=orwell)
+        Book.objects.create(title='Brave New World', author=huxley)
+
+        response = self.client.get(reverse('book-list'), {'author': ' GEORGE  orwell'})
+        self.assertEqual([book['title'] for book in response.json()['results']], ['1984', 'Animal Farm'])
+        response = self.client.get(reverse('book-list'), {'author': 'Nobody'})
+        self.assertEqual(response.json()['results'], [])
+
+
+class BookListPaginationTests(APITestCase):
+    """
+    ?pagination= picks the style; every style caps the page at API_MAX_PAGE_SIZE.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        author = Author.objects.get_for_name('George Orwell')
+        Book.objects.bulk_create(Book(title=f'Book {i}', author=author) for i in range(MAX_PAGE_SIZE + 5))
+        cls.ids = list(Book.objects.order_by('id').values_list('id', flat=True))
+
+    def get(self, **params):
+        response = self.client.get(reverse('book-list'), params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def test_max_page_size(self):
+        for params in [
+            {'page_size': 1000},
+            {'pagination': 'page', 'page_size': 1000},
+            {'pagination': 'offset', 'limit': 1000},
+            {'pagination': 'cursor', 'page_size': 1000},
+        ]:
+            with self.subTest(**params):
+                self.assertEqual(len(self.get(**params)['results']), MAX_PAGE_SIZE)
+
+    def test_styles(self):
+        data = self.get(page=2, page_size=5)  # page is BookList's default
+        self.assertEqual(set(data), {'estimated_count', 'next', 'previous', 'results'})
+        self.assertEqual([book['id'] for book in data['results']], self.ids[5:10])
+
+        data = self.get(pagination='offset', limit=5, offset=10)
+        self.assertEqual(set(data), {'estimated_count', 'next', 'previous', 'results'})
+        self.assertEqual([book['id'] for book in data['results']], self.ids[10:15])
+
+        data = self.get(pagination='cursor', page_size=40)
+        ids = [book['id'] for book in data['results']]
+        while data['next']:
+            data = self.client.get(data['next']).json()
+            ids += [book['id'] for book in data['results']]
+        self.assertEqual(ids, self.ids)
+
+    def test_unknown_style(self):
+        response = self.client.get(reverse('book-list'), {'pagination': 'everything'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'pagination': ['Expected one of: page, offset, cursor.']})
+
+
+class StreamingListTests(APITestCase):
+    """
+    ?stream=true returns every (filtered) book as one JSON array, in chunks.
+    """
+
+    def stream(self, **params):
+        response = self.client.get(reverse('book-list'), {'stream': 'true', **params})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        return json.loads(b''.join(response.streaming_content))
+
+    def test_empty(self):
+        self.assertEqual(self.stream(), [])
+
+    @mock.patch.object(BookList, 'stream_chunk_size', 3)
+    def test_every_row_across_chunks(self):
+        orwell = Author.objects.get_for_name('George Orwell')
+        huxley = Author.objects.get_for_name('Aldous Huxley')
+        Book.objects.bulk_create(Book(title=f'Book {i}', author=orwell) for i in range(10))
+        Book.objects.create(title='Brave New World', author=huxley)
+
+        expected = BookSerializer(Book.objects.order_by('id'), many=True).data
+        self.assertEqual(self.stream(), expected)
+        self.assertEqual(len(self.stream(author='george orwell')), 10)
+
+
+class BenchmarkTokenAuthTests(TestCase):
+
+    def test_runs(self):
+        out = StringIO()
+        call_command('benchmark_token_auth', requests=2, books=3, stdout=out)
+        self.assertIn('Queries saved per request: 1.00', out.getvalue())
@@ -1,14 +1,95 @@
+from itertools import islice
+
+from django.http import StreamingHttpResponse
 from django.shortcuts import render
 from rest_framework import generics, viewsets, permissions
-from .models import Book
+from rest_framework.exceptions import ValidationError
+from rest_framework.renderers import JSONRenderer
+from django_common.server_timing import ServerTimingMixin
+from .models import Book, normalize_author_name
+from .pagination import BookCursorPagination, CountFreeLimitOffsetPagination, CountFreePageNumberPagination
 from .serializers import BookSerializer
 
-class BookList(generics.ListAPIView):
-    queryset = Book.objects.all()
+
+class SelectablePaginationMixin:
+    """
+    Lets the client pick the pagination style with ?pagination=<name>, one of
+    pagination_classes. Every style enforces API_MAX_PAGE_SIZE.
+    """
+    pagination_classes = {
+        'page': CountFreePageNumberPagination,      # ?page=N&page_size=M
+        'offset': CountFreeLimitOffsetPagination,   # ?limit=M&offset=N
+        'cursor': BookCursorPagination,             # ?cursor=...&page_size=M
+    }
+    default_pagination = 'offset'
+    pagination_query_param = 'pagination'
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            request = getattr(self, 'request', None)
+            name = self.default_pagination
+            if request is not None:
+                name = request.query_params.get(self.pagination_query_param, name)
+            if name not in self.pagination_classes:
+                raise ValidationError({self.pagination_query_param: [
+                    f"Expected one of: {', '.join(self.pagination_classes)}."
+                ]})
+            self._paginator = self.pagination_classes[name]()
+        return self._paginator
+
+
+class StreamingListMixin:
+    """
+    ?stream=true returns the whole (filtered) list as one JSON array, written
+    incrementally: rows are read with QuerySet.iterator() and serialized
+    stream_chunk_size at a time, so memory stays flat however large the table.
+    """
+    stream_query_param = 'stream'
+    stream_chunk_size = 500
+
+    def list(self, request, *args, **kwargs):
+        if request.query_params.get(self.stream_query_param, '').lower() in ('1', 'true'):
+            return self.stream_list(request)
+        return super().list(request, *args, **kwargs)
+
+    def stream_list(self, request):
+        queryset = self.filter_queryset(self.get_queryset())
+        return StreamingHttpResponse(self.stream_chunks(queryset), content_type='application/json')
+
+    def stream_chunks(self, queryset):
+        renderer = JSONRenderer()
+        rows = queryset.iterator(chunk_size=self.stream_chunk_size)
+        separator = b''
+        yield b'['
+        while chunk := list(islice(rows, self.stream_chunk_size)):
+            # Render the chunk as an array and drop its brackets.
+            yield separator + renderer.render(self.get_serializer(chunk, many=True).data)[1:-1]
+            separator = b','
+        yield b']'
+
+
+class AuthorFilterMixin:
+    """
+    ?author=<name> keeps the books by that author, matched on the unique
+    Author.normalized_name, so case and spacing don't matter.
+    """
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        author = self.request.query_params.get('author')
+        if author is not None:
+            queryset = queryset.filter(author__normalized_name=normalize_author_name(author))
+        return queryset
+
+
+class BookList(ServerTimingMixin, AuthorFilterMixin, StreamingListMixin, SelectablePaginationMixin, generics.ListAPIView):
+    queryset = Book.objects.select_related('author').order_by('id')
     serializer_class = BookSerializer
     permission_classes = [permissions.AllowAny] # Optional: open access for this view
+    default_pagination = 'page'  # ?page=N, no COUNT(*) per page
 
-class BookViewSet(viewsets.ModelViewSet):
-    queryset = Book.objects.all()
+class BookViewSet(ServerTimingMixin, AuthorFilterMixin, StreamingListMixin, SelectablePaginationMixin, viewsets.ModelViewSet):
+    queryset = Book.objects.select_related('author').order_by('id')
     serializer_class = BookSerializer
     permission_classes = [permissions.IsAuthenticated]  # Secured
@@ -0,0 +1,135 @@
+import itertools
+import random
+import statistics
+import time
+
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Q
+from taggit.models import Tag, TaggedItem
+
+from blog import search
+from blog.models import Post
+from blog.views import SEARCH_RESULTS_PER_PAGE
+
+WORDS = [
+    "river", "shadow", "garden", "empire", "winter", "silent", "golden", "machine",
+    "ocean", "forest", "secret", "broken", "crimson", "distant", "hidden", "iron",
+    "django", "python", "server", "cache", "query", "index", "thread", "signal",
+]
+SYLLABLES = ["ka", "lo", "mi", "ra", "te", "su", "no", "vi", "de", "po", "an", "el", "or", "un", "is", "ber"]
+TAGS = ["news", "howto", "travel", "python", "django", "release", "opinion", "tutorial"]
+
+
+def vocabulary(rng, size=20000):
+    """
+    `size` words, most frequent first, with Zipf cumulative weights, so the
+    text has common, mid-frequency and rare words like real posts do.
+    """
+    words = list(WORDS)
+    seen = set(words)
+    while len(words) < size:
+        word = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+        if word not in seen:
+            seen.add(word)
+            words.append(word)
+    return words, list(itertools.accumulate(1 / rank for rank in range(1, size + 1)))
+
+
+def timed(func, runs):
+    durations = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        durations.append((time.perf_counter() - start) * 1000)
+    durations.sort()
+    return statistics.median(durations), durations[max(0, int(len(durations) * 0.95) - 1)]
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the latency of the old icontains search (every match, as the view "
+        "used to return) with a page of full-text results, on a large generated blog. "
+        "Data is rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--posts", type=int, default=1_000_000, help="Posts to seed (default: 1000000).")
+        parser.add_argument("--queries", type=int, default=20, help="Full-text searches per term (default: 20).")
+        parser.add_argument(
+            "--baseline-queries", type=int, default=3,
+            help="icontains searches per term; each scans the whole table (default: 3).",
+        )
+        parser.add_argument("--batch-size", type=int, default=10000, help="Rows per bulk insert (default: 10000).")
+
+    def handle(self, *args, **options):
+        if not search.is_supported():
+            raise CommandError(
+                "Full-text search needs SQLite (FTS5), or PostgreSQL with POSTGRES_SEARCH = True."
+            )
+        if min(options["posts"], options["queries"], options["baseline_queries"], options["batch_size"]) < 1:
+            raise CommandError("--posts, --queries, --baseline-queries and --batch-size must be positive integers.")
+
+        with transaction.atomic():
+            start = time.perf_counter()
+            words = self.seed(options["posts"], options["batch_size"])
+            self.stdout.write(f"Seeded and indexed {options['posts']} posts in {time.perf_counter() - start:.1f}s")
+
+            terms = [words[2], words[200], words[5000], f"{words[30]} {words[300]}", words[1000][:3], "tutorial"]
+            self.stdout.write(
+                f"{'query':<20} {'matches':>9} {'icontains p50':>14} {'p95':>9} {'index p50':>10} {'p95':>9}"
+            )
+            for term in terms:
+                baseline = Post.objects.filter(
+                    Q(title__icontains=term) | Q(content__icontains=term) | Q(tags__name__icontains=term)
+                ).distinct()
+
+                def run_fts():
+                    for post in search.search_posts(term)[:SEARCH_RESULTS_PER_PAGE + 1]:
+                        search.render_snippet(post.search_snippet)
+
+                matches = search.search_posts(term).count()
+                old = timed(lambda: list(baseline.all()), options["baseline_queries"])
+                new = timed(run_fts, options["queries"])
+                self.stdout.write(
+                    f"{term:<20} {matches:>9} {old[0]:>14.2f} {old[1]:>9.2f} {new[0]:>10.2f} {new[1]:>9.2f}"
+                )
+            transaction.set_rollback(True)
+        self.stdout.write(
+            f"Times in ms: icontains loads every match, the index ({connection.vendor}) one ranked page of "
+            f"{SEARCH_RESULTS_PER_PAGE} with snippets."
+        )
+
+    def seed(self, posts, batch_size):
+        """
+        Bulk-load and index `posts` posts; returns the vocabulary, most frequent first.
+        """
+        rng = random.Random(42)
+        words, weights = vocabulary(rng)
+        author = User.objects.create(username="search-benchmark")
+        last_id = Post.objects.order_by("-pk").values_list("pk", flat=True).first() or 0
+        for start in range(0, posts, batch_size):
+            Post.objects.bulk_create(
+                Post(
+                    title=" ".join(rng.choices(words, cum_weights=weights, k=5)).capitalize(),
+                    content=" ".join(rng.choices(words, cum_weights=weights, k=80)),
+                    author=author,
+                )
+                for _ in range(start, min(start + batch_size, posts))
+            )
+
+        # Two tags on every tenth post.
+        tags = [Tag.objects.get_or_create(name=name, defaults={"slug": name})[0] for name in TAGS]
+        content_type = ContentType.objects.get_for_model(Post)
+        post_ids = Post.objects.filter(pk__gt=last_id, author=author).values_list("pk", flat=True)[::10]
+        TaggedItem.objects.bulk_create(
+            (
+                TaggedItem(content_type=content_type, object_id=post_id, tag=tag)
+                for post_id in post_ids for tag in rng.sample(tags, 2)
+            ),
+            batch_size=batch_size,
+        )
+        search.rebuild_index(batch_size=batch_size)
+        return words
@@ -0,0 +1,58 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS blog_post_fts USING fts5("
+        "title, content, tags, tokenize = 'unicode61 remove_diacritics 2')"
+    )
+    schema_editor.execute("INSERT INTO blog_post_fts (blog_post_fts, rank) VALUES ('rank', 'bm25(10.0, 1.0, 5.0)')")
+    schema_editor.execute(
+        "INSERT INTO blog_post_fts (rowid, title, content, tags) "
+        "SELECT blog_post.id, blog_post.title, blog_post.content, COALESCE(("
+        "  SELECT group_concat(taggit_tag.name, ' ') FROM taggit_taggeditem"
+        "  INNER JOIN taggit_tag ON taggit_tag.id = taggit_taggeditem.tag_id"
+        "  INNER JOIN django_content_type ON django_content_type.id = taggit_taggeditem.content_type_id"
+        "  WHERE django_content_type.app_label = 'blog' AND django_content_type.model = 'post'"
+        "  AND taggit_taggeditem.object_id = blog_post.id"
+        "), '') FROM blog_post"
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute("DROP TABLE IF EXISTS blog_post_fts")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0004_comment_post_created_idx'),
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('taggit', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostSearchIndex',
+            fields=[
+                ('post', models.OneToOneField(db_column='rowid', db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_index', serialize=False, to='blog.post')),
+                ('title', models.TextField()),
+                ('content', models.TextField()),
+                ('tags', models.TextField()),
+                ('match', models.TextField(db_column='blog_post_fts')),
+                ('rank', models.FloatField()),
+            ],
+            options={
+                'db_table': 'blog_post_fts',
+                'managed': False,
+            },
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
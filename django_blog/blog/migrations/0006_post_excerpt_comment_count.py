@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:40
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils.text import Truncator
+
+EXCERPT_LENGTH = 160
+BATCH_SIZE = 1000
+
+
+def populate(apps, schema_editor):
+    """
+    Fill in the excerpt of every post, BATCH_SIZE posts at a time, and count
+    the comments of all posts in one UPDATE.
+    """
+    Post = apps.get_model("blog", "Post")
+    Comment = apps.get_model("blog", "Comment")
+
+    last_id = 0
+    while True:
+        posts = list(Post.objects.filter(pk__gt=last_id).order_by("pk").only("content")[:BATCH_SIZE])
+        if not posts:
+            break
+        for post in posts:
+            post.excerpt = Truncator(post.content).chars(EXCERPT_LENGTH)
+        Post.objects.bulk_update(posts, ["excerpt"])
+        last_id = posts[-1].pk
+
+    counts = Comment.objects.filter(post=OuterRef("pk")).order_by().values("post").annotate(n=Count("pk")).values("n")
+    Post.objects.update(comment_count=Coalesce(Subquery(counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0005_post_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='excerpt',
+            field=models.CharField(blank=True, editable=False, max_length=160),
+        ),
+        migrations.RunPython(populate, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:40
+
+from django.db import migrations, models
+
+# The title, tags and content weighted A, B and C for ts_rank.
+DOCUMENT_SQL = (
+    "setweight(to_tsvector('english', title), 'A') || "
+    "setweight(to_tsvector('english', tags), 'B') || "
+    "setweight(to_tsvector('english', content), 'C')"
+)
+
+
+def create_search_index(apps, schema_editor):
+    # On SQLite, 0005 created blog_post_fts as an FTS5 table; on PostgreSQL it
+    # is a plain table whose generated tsvector column has a GIN index.
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        "CREATE TABLE IF NOT EXISTS blog_post_fts ("
+        "rowid bigint PRIMARY KEY, title text NOT NULL, content text NOT NULL, tags text NOT NULL, "
+        f"document tsvector GENERATED ALWAYS AS ({DOCUMENT_SQL}) STORED)"
+    )
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS blog_post_fts_document_idx ON blog_post_fts USING GIN (document)"
+    )
+    schema_editor.execute(
+        "INSERT INTO blog_post_fts (rowid, title, content, tags) "
+        "SELECT blog_post.id, blog_post.title, blog_post.content, COALESCE(("
+        "  SELECT string_agg(taggit_tag.name, ' ') FROM taggit_taggeditem"
+        "  INNER JOIN taggit_tag ON taggit_tag.id = taggit_taggeditem.tag_id"
+        "  INNER JOIN django_content_type ON django_content_type.id = taggit_taggeditem.content_type_id"
+        "  WHERE django_content_type.app_label = 'blog' AND django_content_type.model = 'post'"
+        "  AND taggit_taggeditem.object_id = blog_post.id"
+        "), '') FROM blog_post"
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("DROP TABLE IF EXISTS blog_post_fts")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0006_post_excerpt_comment_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='postsearchindex',
+            name='document',
+            field=models.TextField(),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -1,6 +1,8 @@
 from django.db import models
+from django.urls import reverse
 from django.contrib.auth.models import User
 from django.utils import timezone
+from django.utils.text import Truncator
 from taggit.managers import TaggableManager
 
 
@@ -17,6 +19,47 @@ class Profile(models.Model):
         return f"{self.user.username}'s profile"
     
 
+EXCERPT_LENGTH = 160
+
+
+def make_excerpt(content):
+    # What the post list used to render with content|truncatechars:160.
+    return Truncator(content).chars(EXCERPT_LENGTH)
+
+
+class Post(models.Model):
+    title = models.CharField(max_length=200)
+    content = models.TextField()
+    author = models.ForeignKey(User, on_delete=models.CASCADE)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    tags = TaggableManager()   # ✅ taggit manager
+    # Precomputed for the post list, so it never loads content or counts comments.
+    excerpt = models.CharField(max_length=EXCERPT_LENGTH, blank=True, editable=False)
+    comment_count = models.PositiveIntegerField(default=0, editable=False)  # kept by blog.signals
+
+    def __str__(self):
+        return self.title
+
+    def save(self, *args, **kwargs):
+        self.excerpt = make_excerpt(self.content)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            if "content" in update_fields:
+                kwargs["update_fields"] = {*update_fields, "excerpt"}
+        elif not self._state.adding and not kwargs.get("force_insert"):
+            # comment_count is only changed in the database (F() updates); saving
+            # it from an instance loaded earlier would undo comments made since.
+            kwargs["update_fields"] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != "comment_count"
+            ]
+        super().save(*args, **kwargs)
+
+    def get_absolute_url(self):
+        return reverse('post-detail', kwargs={'pk': self.pk})
+
+
 class Comment(models.Model):
     post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name="comments")
     author = models.ForeignKey(User, on_delete=models.CASCADE)
@@ -24,19 +67,40 @@ class Comment(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # Keyset pagination of a post's comments (blog/pagination.py).
+            models.Index(fields=["post", "created_at"], name="comment_post_created_idx"),
+        ]
+
     def __str__(self):
         return f"Comment by {self.author.username} on {self.post.title}"
-    
-def get_absolute_url(self):
-    return reverse('post-detail', kwargs={'pk': self.pk})
 
-class Post(models.Model):
-    title = models.CharField(max_length=200)
+
+class PostSearchIndex(models.Model):
+    """
+    Read-only mapping of the blog_post_fts search table (one row per post):
+    an FTS5 table on SQLite, a table with a GIN-indexed tsvector on PostgreSQL.
+    The table is created by a migration and kept in sync by blog.signals;
+    see blog.search for how it is queried.
+    Fields:
+        - post: The indexed post; its id is the FTS rowid.
+        - title / content / tags: The indexed text (tags: the tag names).
+        - match: SQLite only. The hidden column named after the table, used for MATCH queries.
+        - rank: SQLite only. BM25 relevance of the current match (lower is better).
+        - document: PostgreSQL only. The weighted tsvector of the text.
+    """
+    post = models.OneToOneField(
+        Post, primary_key=True, db_column="rowid", db_constraint=False,
+        related_name="search_index", on_delete=models.DO_NOTHING,
+    )
+    title = models.TextField()
     content = models.TextField()
-    author = models.ForeignKey(User, on_delete=models.CASCADE)
-    created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
-    tags = TaggableManager()   # ✅ taggit manager
+    tags = models.TextField()
+    match = models.TextField(db_column="blog_post_fts")
+    rank = models.FloatField()
+    document = models.TextField()
 
-    def __str__(self):
-        return self.title
\ No newline at end of file
+    class Meta:
+        managed = False
+        db_table = "blog_post_fts"
@@ -0,0 +1,201 @@
+"""
+Full-page cache for anonymous readers, purged by surrogate key.
+
+A cached page is stored with the surrogate keys of everything it shows, e.g.
+"post:12", "author:3", "tag:django" and "posts" (the post list itself). Each
+key has a version number in the cache. An entry remembers the versions its
+keys had when it was stored and is served only while they are all unchanged,
+so purge("post:12") makes exactly the pages showing post 12 stale, in O(1);
+nothing is scanned or deleted, stale entries simply expire. blog.signals
+purges the keys when posts, comments, tags or authors change.
+
+Hits and misses are counted per view in the cache (so with a shared cache the
+numbers cover every process); see page_cache_stats() and PageCacheStatsView.
+
+Settings:
+    PAGE_CACHE_TIMEOUT: seconds a page may be served (default: 300).
+"""
+import hashlib
+
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
+from django.core.cache import cache
+from django.http import HttpResponse, JsonResponse
+from django.utils.decorators import method_decorator
+from django.views import View
+
+KEY_PREFIX = "blog:page"
+PURGE_COUNTER_KEY = f"{KEY_PREFIX}:purges"
+PAGE_CACHE_TIMEOUT = getattr(settings, "PAGE_CACHE_TIMEOUT", 300)
+
+# Response headers kept with the cached content.
+CACHED_HEADERS = ("Content-Type", "Content-Language")
+
+# Views whose counters page_cache_stats() reports (filled in by the mixin).
+_views = set()
+
+
+def _version_key(surrogate_key):
+    return f"{KEY_PREFIX}:key:{surrogate_key}"
+
+
+def get_key_versions(surrogate_keys):
+    """
+    {surrogate key: current version}, with a single cache round-trip.
+    """
+    keys = {_version_key(key): key for key in surrogate_keys}
+    versions = cache.get_many(keys)
+    missing = {key: 1 for key in keys if key not in versions}
+    if missing:
+        cache.set_many(missing, timeout=None)
+        versions.update(missing)
+    return {keys[key]: version for key, version in versions.items()}
+
+
+def _incr(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Not set yet (or evicted): any new value differs from the old ones.
+        cache.set(key, 2, timeout=None)
+
+
+def purge(*surrogate_keys):
+    """
+    Make every cached page tagged with any of these keys stale. O(1) per key.
+    """
+    for surrogate_key in surrogate_keys:
+        _incr(_version_key(surrogate_key))
+    _incr(PURGE_COUNTER_KEY)
+
+
+def get_purge_counter():
+    return cache.get(PURGE_COUNTER_KEY)
+
+
+def get_cache_key(request):
+    # The host is part of the key because pages may embed absolute links.
+    raw = f"{request.get_host()}{request.get_full_path()}"
+    return f"{KEY_PREFIX}:entry:{hashlib.md5(raw.encode('utf-8')).hexdigest()}"
+
+
+def get_page(request):
+    """
+    The cached page for this request, or None if absent or purged since.
+    """
+    entry = cache.get(get_cache_key(request))
+    if entry is None:
+        return None
+    content, headers, versions = entry
+    current = cache.get_many([_version_key(key) for key in versions])
+    if any(current.get(_version_key(key)) != version for key, version in versions.items()):
+        return None
+    response = HttpResponse(content)
+    for name, value in headers.items():
+        response[name] = value
+    response["Surrogate-Key"] = " ".join(sorted(versions))
+    return response
+
+
+def set_page(request, response, surrogate_keys, purge_counter, timeout=PAGE_CACHE_TIMEOUT):
+    """
+    Store the rendered response, unless something was purged since
+    purge_counter (read before the view ran): the page may predate that change.
+    """
+    versions = get_key_versions(surrogate_keys)
+    if get_purge_counter() != purge_counter:
+        return
+    headers = {name: response[name] for name in CACHED_HEADERS if name in response}
+    cache.set(get_cache_key(request), (response.content, headers, versions), timeout)
+
+
+def _count(view_name, outcome):
+    key = f"{KEY_PREFIX}:stats:{view_name}:{outcome}"
+    if not cache.add(key, 1, timeout=None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, timeout=None)
+
+
+def page_cache_stats():
+    """
+    {view name: {"hits", "misses", "hit_ratio"}} plus a "total" entry.
+    """
+    names = sorted(_views)
+    counters = cache.get_many(
+        [f"{KEY_PREFIX}:stats:{name}:{outcome}" for name in names for outcome in ("hits", "misses")]
+    )
+    stats = {}
+    for name in names + ["total"]:
+        if name == "total":
+            hits = sum(view["hits"] for view in stats.values())
+            misses = sum(view["misses"] for view in stats.values())
+        else:
+            hits = counters.get(f"{KEY_PREFIX}:stats:{name}:hits", 0)
+            misses = counters.get(f"{KEY_PREFIX}:stats:{name}:misses", 0)
+        total = hits + misses
+        stats[name] = {"hits": hits, "misses": misses, "hit_ratio": hits / total if total else 0.0}
+    return stats
+
+
+def reset_page_cache_stats():
+    cache.delete_many(
+        [f"{KEY_PREFIX}:stats:{name}:{outcome}" for name in _views for outcome in ("hits", "misses")]
+    )
+
+
+class AnonymousPageCacheMixin:
+    """
+    Serves GET requests from logged-out readers from the page cache.
+    get_surrogate_keys(context) lists what the rendered page shows; by default
+    every post in the context, with its author. Only 200 responses are stored.
+    Responses carry X-Cache: HIT or MISS and a Surrogate-Key header, which a
+    CDN in front of the site can use for the same purges.
+    """
+    page_cache_timeout = PAGE_CACHE_TIMEOUT
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        _views.add(cls.__name__)
+
+    def get_surrogate_keys(self, context):
+        posts = list(context.get("object_list") or ())
+        if context.get("object") is not None:
+            posts.append(context["object"])
+        keys = set()
+        for post in posts:
+            keys.update({f"post:{post.pk}", f"author:{post.author_id}"})
+        return keys
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in ("GET", "HEAD") or request.user.is_authenticated:
+            return super().dispatch(request, *args, **kwargs)
+
+        name = type(self).__name__
+        response = get_page(request)
+        if response is not None:
+            _count(name, "hits")
+            response["X-Cache"] = "HIT"
+            return response
+
+        _count(name, "misses")
+        purge_counter = get_purge_counter()
+        response = super().dispatch(request, *args, **kwargs)
+        if response.status_code == 200 and hasattr(response, "render"):
+            response.render()
+            surrogate_keys = self.get_surrogate_keys(response.context_data)
+            set_page(request, response, surrogate_keys, purge_counter, self.page_cache_timeout)
+            response["Surrogate-Key"] = " ".join(sorted(surrogate_keys))
+        response["X-Cache"] = "MISS"
+        return response
+
+
+@method_decorator(staff_member_required, name="dispatch")
+class PageCacheStatsView(View):
+    """
+    Page cache hit ratios as JSON, for staff.
+    """
+
+    def get(self, request):
+        return JsonResponse(page_cache_stats())
@@ -0,0 +1,72 @@
+"""
+Pagination without SELECT COUNT(*).
+
+Long lists page with django_common.pagination.CountFreePaginator, which never
+counts the whole table. KeysetPaginator goes further for long, append-mostly
+lists such as comment threads: pages continue after the (created_at, pk) of
+the last row shown, passed around as an opaque cursor, so every page costs
+one indexed range scan however deep it is.
+"""
+import base64
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(created_at, pk):
+    return base64.urlsafe_b64encode(f'{created_at.isoformat()}|{pk}'.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        created_at, pk = raw.split('|')
+        created_at, pk = parse_datetime(created_at), int(pk)
+    except (ValueError, UnicodeDecodeError):
+        raise InvalidCursor(cursor)
+    if created_at is None:
+        raise InvalidCursor(cursor)
+    return created_at, pk
+
+
+class KeysetPage:
+    def __init__(self, object_list, next_cursor):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+
+class KeysetPaginator:
+    """
+    Pages through a queryset in (created_at, pk) order, oldest first.
+    page(None) is the first page; page(page.next_cursor) the one after it.
+    Raises InvalidCursor for a cursor it did not produce.
+    """
+
+    def __init__(self, queryset, per_page):
+        self.queryset = queryset.order_by('created_at', 'pk')
+        self.per_page = per_page
+
+    def page(self, cursor=None):
+        queryset = self.queryset
+        if cursor:
+            created_at, pk = decode_cursor(cursor)
+            queryset = queryset.filter(Q(created_at__gt=created_at) | Q(created_at=created_at, pk__gt=pk))
+        rows = list(queryset[:self.per_page + 1])
+        object_list = rows[:self.per_page]
+        next_cursor = None
+        if len(rows) > self.per_page:
+            next_cursor = encode_cursor(object_list[-1].created_at, object_list[-1].pk)
+        return KeysetPage(object_list, next_cursor)
@@ -0,0 +1,201 @@
+"""
+Full-text search for posts, on SQLite FTS5 or PostgreSQL.
+
+blog_post_fts holds one row per post (rowid = post id) with the post title,
+content and tag names. blog.signals keeps it in sync when posts are saved or
+deleted and when their tags change; bulk loads bypass signals, so run
+`python manage.py rebuild_search_index` after them.
+
+On SQLite it is an FTS5 table, and results are ranked with BM25. On
+PostgreSQL it is a plain table with a generated tsvector column (migration
+0007) behind a GIN index, and results are ranked with ts_rank. Both weight
+title matches above tag matches above content matches, and come with a
+snippet of the best-matching text. Only SQLite ignores accents.
+
+The PostgreSQL path is off unless settings.POSTGRES_SEARCH is True: no test
+run covers it yet, so until one does it has to be switched on deliberately
+(then run rebuild_search_index). While it is off, PostgreSQL searches
+with icontains like any other database.
+"""
+import re
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection, transaction
+from django.db.models import ExpressionWrapper, F, Q
+from django.db.models.expressions import RawSQL
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+from taggit.models import TaggedItem
+
+from .models import Post, PostSearchIndex
+
+FTS_TABLE = PostSearchIndex._meta.db_table
+
+CREATE_TABLE_SQL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    "title, content, tags, tokenize = 'unicode61 remove_diacritics 2')"
+)
+# Column weights for the table's rank: title, content, tags.
+RANK_SQL = f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}, rank) VALUES ('rank', 'bm25(10.0, 1.0, 5.0)')"
+DROP_TABLE_SQL = f"DROP TABLE IF EXISTS {FTS_TABLE}"
+INSERT_SQL = f"INSERT INTO {FTS_TABLE} (rowid, title, content, tags) VALUES (%s, %s, %s, %s)"
+
+# Private-use characters mark the matched words in snippets; render_snippet
+# turns them into <mark> after escaping the text around them.
+MARK_START, MARK_END = "\ue000", "\ue001"
+SNIPPET_TOKENS = 24
+
+
+def is_supported(conn=connection):
+    """
+    SQLite (FTS5) has an index, and PostgreSQL has one when POSTGRES_SEARCH is
+    set; other databases fall back to icontains.
+    """
+    if conn.vendor == "postgresql":
+        return getattr(settings, "POSTGRES_SEARCH", False)
+    return conn.vendor == "sqlite"
+
+
+def build_match_expression(search):
+    """
+    Turn user input into an FTS5 query: every word must match, and the last
+    characters typed may be the start of a longer word ("djan" finds "Django").
+    Returns None when there is nothing searchable in the input.
+    """
+    terms = [term for term in search.replace(",", " ").split() if re.search(r"\w", term)]
+    if not terms:
+        return None
+    return " ".join('"{}"*'.format(term.replace('"', '""')) for term in terms)
+
+
+def build_tsquery(search):
+    """
+    The PostgreSQL equivalent of build_match_expression, for to_tsquery:
+    every word must match, as a prefix. None when there is nothing searchable.
+    """
+    words = re.findall(r"\w+", search)
+    if not words:
+        return None
+    return " & ".join(f"{word}:*" for word in words)
+
+
+def _tag_names(post_ids):
+    names = {}
+    tagged = TaggedItem.objects.filter(
+        content_type=ContentType.objects.get_for_model(Post), object_id__in=post_ids,
+    ).values_list("object_id", "tag__name")
+    for post_id, name in tagged:
+        names.setdefault(post_id, []).append(name)
+    return names
+
+
+def _rows(posts):
+    posts = list(posts)
+    tags = _tag_names([pk for pk, _, _ in posts])
+    return [(pk, title, content, " ".join(tags.get(pk, ()))) for pk, title, content in posts]
+
+
+def index_posts(ids):
+    """
+    (Re)index the posts with these ids; ids of deleted posts are unindexed.
+    """
+    ids = list(ids)
+    if not ids:
+        return
+    rows = _rows(Post.objects.filter(pk__in=ids).values_list("pk", "title", "content"))
+    unindex_posts(ids)
+    with connection.cursor() as cursor:
+        cursor.executemany(INSERT_SQL, rows)
+
+
+def unindex_posts(ids):
+    """
+    Remove posts from the index.
+    """
+    ids = list(ids)
+    if not ids:
+        return
+    with connection.cursor() as cursor:
+        placeholders = ", ".join(["%s"] * len(ids))
+        cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid IN ({placeholders})", ids)
+
+
+def rebuild_index(batch_size=1000):
+    """
+    Rebuild the whole index from blog_post, reading batch_size posts at a time
+    (keyset on id, so memory stays flat). Returns the number of posts indexed.
+    """
+    total = 0
+    last_id = 0
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            if connection.vendor == "sqlite":
+                cursor.execute(DROP_TABLE_SQL)
+                cursor.execute(CREATE_TABLE_SQL)
+                cursor.execute(RANK_SQL)
+            else:
+                # Keeps the table and its GIN index from migration 0007.
+                cursor.execute(f"DELETE FROM {FTS_TABLE}")
+        while True:
+            rows = _rows(
+                Post.objects.filter(pk__gt=last_id).order_by("pk").values_list("pk", "title", "content")[:batch_size]
+            )
+            if not rows:
+                break
+            with connection.cursor() as cursor:
+                cursor.executemany(INSERT_SQL, rows)
+            total += len(rows)
+            last_id = rows[-1][0]
+    return total
+
+
+def search_posts(query):
+    """
+    Posts matching the search query, most relevant first, each annotated with
+    `search_rank` (lower is more relevant) and `search_snippet` (pass it to
+    render_snippet). On other databases, posts whose title, content or tags
+    contain the query, newest first, without snippets.
+    """
+    expression = build_match_expression(query or "")
+    if expression is None:
+        return Post.objects.none()
+    posts = Post.objects.select_related("author")
+    if not is_supported():
+        return posts.filter(
+            Q(title__icontains=query) | Q(content__icontains=query) | Q(tags__name__icontains=query)
+        ).distinct().order_by("-created_at", "-pk")
+    if connection.vendor == "postgresql":
+        return _search_postgresql(posts, build_tsquery(query))
+
+    return posts.filter(search_index__match=expression).annotate(
+        search_rank=F("search_index__rank"),
+        search_snippet=RawSQL(
+            f"snippet({FTS_TABLE}, -1, %s, %s, %s, %s)", (MARK_START, MARK_END, "…", SNIPPET_TOKENS),
+        ),
+    ).order_by("search_rank", "pk")
+
+
+def _search_postgresql(posts, tsquery):
+    # Imported here: django.contrib.postgres needs psycopg, which SQLite setups lack.
+    from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank, SearchVectorField
+
+    query = SearchQuery(tsquery, config="english", search_type="raw")
+    return posts.alias(
+        search_document=ExpressionWrapper(F("search_index__document"), output_field=SearchVectorField()),
+    ).filter(search_document=query).annotate(
+        # Negated, so that lower is more relevant as with BM25.
+        search_rank=-SearchRank(F("search_document"), query),
+        search_snippet=SearchHeadline(
+            "content", query, config="english", start_sel=MARK_START, stop_sel=MARK_END,
+            max_words=SNIPPET_TOKENS, min_words=SNIPPET_TOKENS // 2,
+        ),
+    ).order_by("search_rank", "pk")
+
+
+def render_snippet(snippet):
+    """
+    HTML for a search_snippet: the text escaped, the matched words in <mark>.
+    """
+    html = escape(snippet).replace(MARK_START, "<mark>").replace(MARK_END, "</mark>")
+    return mark_safe(html)
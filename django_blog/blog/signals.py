@@ -1,11 +1,100 @@
 from django.contrib.auth.models import User
-from django.db.models.signals import post_save
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import F
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.dispatch import receiver
-from .models import Profile
+from taggit.models import Tag, TaggedItem
+from . import page_cache, search
+from .models import Comment, Post, Profile
 
 @receiver(post_save, sender=User)
 def create_or_update_user_profile(sender, instance, created, **kwargs):
     if created:
         Profile.objects.create(user=instance)
     else:
-        instance.profile.save()
\ No newline at end of file
+        instance.profile.save()
+
+
+@receiver(post_save, sender=Post)
+def index_post(sender, instance, **kwargs):
+    if search.is_supported():
+        search.index_posts([instance.pk])
+
+
+@receiver(post_delete, sender=Post)
+def unindex_post(sender, instance, **kwargs):
+    if search.is_supported():
+        search.unindex_posts([instance.pk])
+
+
+@receiver(m2m_changed, sender=TaggedItem)
+def reindex_post_tags(sender, instance, action, **kwargs):
+    # post.tags.add/remove/set/clear: the post's tag names changed.
+    if action in ("post_add", "post_remove", "post_clear") and isinstance(instance, Post) and search.is_supported():
+        search.index_posts([instance.pk])
+
+
+@receiver(post_save, sender=Tag)
+def reindex_tag_posts(sender, instance, created, **kwargs):
+    # A new tag is on no post yet; a rename changes the tags of every post using it.
+    if not created and search.is_supported():
+        search.index_posts(Post.objects.filter(tags=instance).values_list("pk", flat=True))
+
+
+@receiver(post_delete, sender=TaggedItem)
+def reindex_untagged_post(sender, instance, **kwargs):
+    # Covers tags deleted outright, whose TaggedItems go without m2m_changed.
+    if ContentType.objects.get_for_id(instance.content_type_id).model_class() is Post and search.is_supported():
+        search.index_posts([instance.object_id])
+
+
+@receiver(post_save, sender=Comment)
+def count_new_comment(sender, instance, created, **kwargs):
+    if created:
+        Post.objects.filter(pk=instance.post_id).update(comment_count=F("comment_count") + 1)
+
+
+@receiver(post_delete, sender=Comment)
+def count_deleted_comment(sender, instance, **kwargs):
+    Post.objects.filter(pk=instance.post_id, comment_count__gt=0).update(comment_count=F("comment_count") - 1)
+
+
+# Page cache purges: each change makes stale exactly the cached pages showing
+# what changed (see blog.page_cache for the surrogate keys).
+
+@receiver(post_save, sender=Post)
+def purge_saved_post(sender, instance, created, **kwargs):
+    # A new post also shifts every page of the post list.
+    page_cache.purge(f"post:{instance.pk}", *(["posts"] if created else []))
+
+
+@receiver(post_delete, sender=Post)
+def purge_deleted_post(sender, instance, **kwargs):
+    page_cache.purge(f"post:{instance.pk}", "posts")
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def purge_comment_post(sender, instance, **kwargs):
+    page_cache.purge(f"post:{instance.post_id}")
+
+
+@receiver(post_save, sender=TaggedItem)
+@receiver(post_delete, sender=TaggedItem)
+def purge_tag_assignment(sender, instance, **kwargs):
+    # tags.add() creates TaggedItems and tags.remove()/clear()/set() delete them.
+    if ContentType.objects.get_for_id(instance.content_type_id).model_class() is Post:
+        page_cache.purge(f"post:{instance.object_id}", f"tag:{instance.tag.slug}")
+
+
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+def purge_tag(sender, instance, **kwargs):
+    page_cache.purge(f"tag:{instance.slug}")
+
+
+@receiver(post_save, sender=User)
+def purge_author(sender, instance, created, update_fields=None, **kwargs):
+    # Logging in only updates last_login, which no page shows.
+    if not created and set(update_fields or ()) != {"last_login"}:
+        page_cache.purge(f"author:{instance.pk}")
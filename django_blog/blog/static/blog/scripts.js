@@ -1,4 +1,15 @@
 // Basic example script to demonstrate dynamic behavior
 document.addEventListener('DOMContentLoaded', function() {
     console.log('Blog page loaded');
-});
\ No newline at end of file
+});
+
+// "Load more comments": fetch the next page as an HTML fragment and put it
+// in place of the link (the fragment brings its own link if there is more).
+document.addEventListener('click', function(event) {
+    const link = event.target.closest('a.load-more-comments');
+    if (!link) return;
+    event.preventDefault();
+    fetch(link.href)
+        .then(function(response) { return response.text(); })
+        .then(function(html) { link.insertAdjacentHTML('beforebegin', html); link.remove(); });
+});
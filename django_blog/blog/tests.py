@@ -1,3 +1,396 @@
-from django.test import TestCase
+from types import SimpleNamespace
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from django_common import pagination
+from taggit.models import Tag
+
+from . import page_cache, search
+from .models import Comment, Post
+from .views import COMMENTS_PER_PAGE, SEARCH_RESULTS_PER_PAGE, PostListView, get_comment_page
+
+
+class PostDetailQueryTests(TestCase):
+    """
+    The post detail page loads its comments, their authors and the tags in a
+    fixed number of queries.
+    """
+
+    def setUp(self):
+        self.author = User.objects.create_user(username="alice", password="password123")
+        self.post = Post.objects.create(title="Hello", content="First post", author=self.author)
+        self.post.tags.add("django", "performance")
+        self.url = reverse("post-detail", args=[self.post.pk])
+
+    def add_comments(self, count):
+        users = User.objects.bulk_create(
+            User(username=f"reader-{Comment.objects.count()}-{i}") for i in range(count)
+        )
+        Comment.objects.bulk_create(
+            Comment(post=self.post, author=user, content=f"Comment by {user.username}") for user in users
+        )
+        # bulk_create sends no signals, so purge the cached page by hand.
+        page_cache.purge(f"post:{self.post.pk}")
+
+    def get(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        return response, len(ctx.captured_queries)
+
+    def test_query_count_is_independent_of_comment_count(self):
+        self.add_comments(1)
+        _, few = self.get()
+
+        self.add_comments(50)
+        response, many = self.get()
+
+        self.assertEqual(few, many)
+        self.assertContains(response, "By reader-1-18")
+        self.assertContains(response, "performance")
+
+    def test_first_page_of_comments_in_creation_order(self):
+        self.add_comments(COMMENTS_PER_PAGE + 5)
+        response, _ = self.get()
+        comments = [c.content for c in response.context["comment_page"]]
+        expected = list(Comment.objects.order_by("pk").values_list("content", flat=True)[:COMMENTS_PER_PAGE])
+        self.assertEqual(comments, expected)
+        self.assertContains(response, 'class="load-more-comments"')
+
+
+class PostCommentsViewTests(TestCase):
+    """
+    Further pages of comments, keyset-paginated on (created_at, id).
+    """
+
+    def setUp(self):
+        self.author = User.objects.create_user(username="alice", password="password123")
+        self.post = Post.objects.create(title="Hello", content="First post", author=self.author)
+        created_at = timezone.now()
+        self.comments = Comment.objects.bulk_create(
+            Comment(post=self.post, author=self.author, content=f"Comment {i}") for i in range(45)
+        )
+        # Same timestamp for a run of comments: the id breaks the tie.
+        Comment.objects.filter(pk__in=[c.pk for c in self.comments[15:30]]).update(created_at=created_at)
+        self.other = Post.objects.create(title="Other", content="Second post", author=self.author)
+        Comment.objects.create(post=self.other, author=self.author, content="Elsewhere")
+        self.url = reverse("post-comments", args=[self.post.pk])
+
+    def test_json_pages_cover_every_comment_once(self):
+        expected = list(
+            Comment.objects.filter(post=self.post).order_by("created_at", "pk").values_list("content", flat=True)
+        )
+        seen, url = [], f"{self.url}?format=json"
+        while url:
+            with CaptureQueriesContext(connection) as ctx:
+                data = self.client.get(url).json()
+            self.assertLessEqual(len(ctx.captured_queries), 2)
+            self.assertLessEqual(len(data["comments"]), COMMENTS_PER_PAGE)
+            seen += [c["content"] for c in data["comments"]]
+            url = data["next"]
+        self.assertEqual(seen, expected)
+
+    def test_html_fragment(self):
+        first = get_comment_page(self.post)
+        response = self.client.get(self.url, {"cursor": first.next_cursor})
+        self.assertTemplateUsed(response, "partials/comments.html")
+        self.assertNotContains(response, "<html")
+        self.assertContains(response, 'class="load-more-comments"')
+        self.assertNotContains(response, "No comments yet.")
+
+    def test_invalid_cursor(self):
+        response = self.client.get(self.url, {"cursor": "not-a-cursor"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_unknown_post(self):
+        response = self.client.get(reverse("post-comments", args=[self.other.pk + 1]))
+        self.assertEqual(response.status_code, 404)
+
+
+@skipUnless(search.is_supported(), "Full-text search needs SQLite, or PostgreSQL with POSTGRES_SEARCH")
+class SearchTests(TestCase):
+    """
+    The search view answers from the full-text index: ranked, paginated, with
+    highlighted snippets, and kept current by the post and tag signals.
+    """
+
+    def setUp(self):
+        self.author = User.objects.create_user(username="alice", password="password123")
+        self.title_match = Post.objects.create(title="Django performance", content="Tips.", author=self.author)
+        self.content_match = Post.objects.create(
+            title="Weekly notes", content="Some <b>notes</b> about django and databases.", author=self.author,
+        )
+        self.tag_match = Post.objects.create(title="Travel", content="A trip.", author=self.author)
+        self.tag_match.tags.add("django")
+
+    def results(self, query, **params):
+        response = self.client.get(reverse("search"), {"q": query, **params})
+        self.assertEqual(response.status_code, 200)
+        return response, list(response.context["posts"])
+
+    def test_ranked_by_relevance(self):
+        _, posts = self.results("django")
+        self.assertEqual(posts, [self.title_match, self.tag_match, self.content_match])
+
+    def test_prefix(self):
+        _, posts = self.results("perf")
+        self.assertEqual(posts, [self.title_match])
+
+    @skipUnless(connection.vendor == "sqlite", "Only FTS5 ignores accents")
+    def test_accents(self):
+        _, posts = self.results("pérformance")
+        self.assertEqual(posts, [self.title_match])
+
+    def test_no_estimated_total(self):
+        # Each distinct query would otherwise queue a background COUNT(*).
+        with mock.patch.object(pagination, "get_estimated_count") as get_estimated_count:
+            response, _ = self.results("django")
+        get_estimated_count.assert_not_called()
+        self.assertNotContains(response, "results</span>")
+
+    def test_snippet_is_escaped_and_highlighted(self):
+        response, _ = self.results("databases")
+        self.assertContains(response, "&lt;b&gt;notes&lt;/b&gt; about django and <mark>databases</mark>")
+
+    def test_index_follows_posts_and_tags(self):
+        self.content_match.content = "Nothing here."
+        self.content_match.save()
+        self.tag_match.tags.remove("django")
+        self.assertEqual(self.results("django")[1], [self.title_match])
+
+        self.tag_match.tags.add("python")
+        tag = Tag.objects.get(slug="python")
+        tag.name = "pythonic"
+        tag.save()
+        self.assertEqual(self.results("pythonic")[1], [self.tag_match])
+
+        tag.delete()
+        self.title_match.delete()
+        self.assertEqual(self.results("pythonic")[1], [])
+        self.assertEqual(self.results("django")[1], [])
+
+    def test_postgresql_index_needs_the_setting(self):
+        postgresql = SimpleNamespace(vendor="postgresql")
+        self.assertFalse(search.is_supported(postgresql))
+        with self.settings(POSTGRES_SEARCH=True):
+            self.assertTrue(search.is_supported(postgresql))
+
+    def test_paginated(self):
+        Post.objects.bulk_create(
+            Post(title=f"Django {i}", content="", author=self.author) for i in range(SEARCH_RESULTS_PER_PAGE)
+        )
+        search.rebuild_index()
+        response, posts = self.results("django")
+        self.assertEqual(len(posts), SEARCH_RESULTS_PER_PAGE)
+        self.assertTrue(response.context["page_obj"].has_next())
+        _, posts = self.results("django", page=2)
+        self.assertEqual(len(posts), 3)
+
+    def test_empty_query(self):
+        self.assertEqual(self.results("")[1], [])
+        self.assertEqual(self.results('" *')[1], [])
+
+
+class PageCacheTests(TestCase):
+    """
+    Anonymous post pages are served from the page cache until something they
+    show changes, and only those pages are purged.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(username="alice", password="password123")
+        self.post = Post.objects.create(title="Hello", content="First post", author=self.author)
+        self.post.tags.add("django")
+        self.other = Post.objects.create(title="Other", content="Second post", author=self.author)
+        self.url = reverse("post-detail", args=[self.post.pk])
+
+    def get(self, url=None):
+        response = self.client.get(url or self.url)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def assertCached(self, url=None):
+        self.assertEqual(self.get(url)["X-Cache"], "HIT")
+
+    def assertPurged(self, url=None):
+        self.assertEqual(self.get(url)["X-Cache"], "MISS")
+        self.assertCached(url)
+
+    def test_hit_runs_no_queries(self):
+        response = self.get()
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response["Surrogate-Key"], f"author:{self.author.pk} post:{self.post.pk} tag:django")
+        with self.assertNumQueries(0):
+            cached = self.get()
+        self.assertEqual(cached["X-Cache"], "HIT")
+        self.assertEqual(cached.content, response.content)
+        self.assertEqual(cached["Content-Type"], response["Content-Type"])
+
+    def test_purged_by_what_the_page_shows(self):
+        self.get()
+        self.other.title = "Changed"
+        self.other.save()
+        self.other.tags.add("python")
+        self.assertCached()
+
+        comment = Comment.objects.create(post=self.post, author=self.author, content="New comment")
+        self.assertContains(self.get(), "New comment")
+        self.assertCached()
+        comment.delete()
+        self.assertPurged()
+
+        self.post.tags.add("performance")
+        self.assertPurged()
+        self.post.tags.remove("performance")
+        self.assertPurged()
+        tag = Tag.objects.get(slug="django")
+        tag.name = "Django"
+        tag.save()
+        self.assertPurged()
+
+        self.author.username = "alice2"
+        self.author.save()
+        self.assertContains(self.get(), "alice2")
+        self.client.login(username="alice2", password="password123")
+        self.client.logout()
+        self.assertCached()
+
+        self.post.delete()
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+    def test_logged_in_users_bypass_the_cache(self):
+        self.get()
+        self.client.force_login(self.author)
+        response = self.get()
+        self.assertNotIn("X-Cache", response)
+        self.assertContains(response, "csrfmiddlewaretoken")
+
+    def test_not_stored_when_purged_during_render(self):
+        request = RequestFactory().get(self.url)
+        response = HttpResponse("stale")
+        counter = page_cache.get_purge_counter()
+        page_cache.purge(f"post:{self.other.pk}")
+        page_cache.set_page(request, response, {f"post:{self.post.pk}"}, counter)
+        self.assertIsNone(page_cache.get_page(request))
+        page_cache.set_page(request, response, {f"post:{self.post.pk}"}, page_cache.get_purge_counter())
+        self.assertEqual(page_cache.get_page(request).content, b"stale")
+
+    def test_hit_ratio(self):
+        self.get()
+        self.get()
+        self.get()
+        stats = page_cache.page_cache_stats()
+        self.assertEqual(stats["PostDetailView"], {"hits": 2, "misses": 1, "hit_ratio": 2 / 3})
+        self.assertEqual(stats["total"]["hits"], 2)
+
+        url = reverse("page-cache-stats")
+        self.assertEqual(self.client.get(url).status_code, 302)
+        self.client.force_login(User.objects.create_user(username="staff", password="x", is_staff=True))
+        self.assertEqual(self.client.get(url).json()["PostDetailView"]["misses"], 1)
+
+
+class PostListPrecomputedTests(TestCase):
+    """
+    The post list reads a stored excerpt and comment count instead of the post
+    bodies and comments, in one query whatever the number of posts.
+    """
+
+    def setUp(self):
+        self.author = User.objects.create_user(username="alice", password="password123")
+        self.post = Post.objects.create(title="Hello", content="word " * 1000, author=self.author)
+
+    def test_excerpt_follows_content(self):
+        self.assertEqual(self.post.excerpt, ("word " * 32)[:159] + "…")
+        self.post.content = "Short now."
+        self.post.save(update_fields=["content"])
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.excerpt, "Short now.")
+
+    def test_comment_count_follows_comments(self):
+        stale = Post.objects.get(pk=self.post.pk)
+        comments = [Comment.objects.create(post=self.post, author=self.author, content=str(i)) for i in range(3)]
+        comments[0].delete()
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comment_count, 2)
+
+        # Saving a copy loaded before the comments does not reset the count.
+        stale.title = "Renamed"
+        stale.save()
+        self.post.refresh_from_db()
+        self.assertEqual((self.post.title, self.post.comment_count), ("Renamed", 2))
+
+    def test_list_queryset_skips_post_bodies(self):
+        for i in range(5):
+            other = User.objects.create_user(username=f"author-{i}")
+            Post.objects.create(title=f"Post {i}", content="Body", author=other)
+        view = PostListView(request=RequestFactory().get("/"), kwargs={})
+        with CaptureQueriesContext(connection) as ctx:
+            rows = [(post.title, post.excerpt, post.comment_count, post.author.username) for post in view.get_queryset()]
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertNotIn('"content"', ctx.captured_queries[0]["sql"])
+        self.assertEqual(rows[0], ("Post 4", "Body", 0, "author-4"))
+        self.assertEqual(len(rows), 6)
+
+
+class PrecomputedFieldsMigrationTests(TransactionTestCase):
+    """
+    0006 fills in the excerpt and comment count of the posts that exist.
+    """
+    before = [("blog", "0005_post_search_index")]
+    after = [("blog", "0006_post_excerpt_comment_count")]
+
+    def migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    def tearDown(self):
+        # Back to the latest migrations for the tests that follow.
+        self.migrate(MigrationExecutor(connection).loader.graph.leaf_nodes())
+
+    def test_backfill(self):
+        apps = self.migrate(self.before)
+        author = apps.get_model("auth", "User").objects.create(username="alice")
+        OldPost, OldComment = apps.get_model("blog", "Post"), apps.get_model("blog", "Comment")
+        long_post = OldPost.objects.create(title="Long", content="word " * 1000, author=author)
+        OldPost.objects.create(title="Short", content="Short.", author=author)
+        OldComment.objects.bulk_create(
+            OldComment(post=long_post, author=author, content=str(i)) for i in range(3)
+        )
+
+        apps = self.migrate(self.after)
+        self.assertEqual(
+            sorted(apps.get_model("blog", "Post").objects.values_list("title", "excerpt", "comment_count")),
+            [("Long", ("word " * 32)[:159] + "…", 3), ("Short", "Short.", 0)],
+        )
+
+
+class PagesTests(TestCase):
+    """
+    Every page of the blog renders.
+    """
+
+    def test_pages_render(self):
+        author = User.objects.create_user(username="alice", password="password123")
+        post = Post.objects.create(title="Hello", content="World", author=author)
+        post.tags.add("django")
+        for url in [
+            reverse("post-list"),
+            post.get_absolute_url(),
+            reverse("search") + "?q=hello",
+            reverse("posts_by_tag", args=["django"]),
+            reverse("login"),
+            reverse("register"),
+        ]:
+            with self.subTest(url=url):
+                self.assertEqual(self.client.get(url).status_code, 200)
@@ -1,34 +1,27 @@
 from django.urls import path
-from .views import (
-    PostListView, PostDetailView, PostCreateView, PostUpdateView, PostDeleteView,
-    BlogLoginView, BlogLogoutView, register, profile,  # from your auth work
-)
+from . import views
+from .page_cache import PageCacheStatsView
 
 urlpatterns = [
-    # Auth (already added earlier)
-    path("login/",   BlogLoginView.as_view(), name="login"),
-    path("logout/",  BlogLogoutView.as_view(), name="logout"),
-    path("register/", register, name="register"),
-    path("profile/",  profile, name="profile"),
-]
-
+    # Auth
+    path("login/",   views.BlogLoginView.as_view(), name="login"),
+    path("logout/",  views.BlogLogoutView.as_view(), name="logout"),
+    path("register/", views.register, name="register"),
+    path("profile/",  views.profile, name="profile"),
 
-urlpatterns = [
+    # Posts and comments
     path('', views.PostListView.as_view(), name='post-list'),
     path('post/<int:pk>/', views.PostDetailView.as_view(), name='post-detail'),
     path('post/new/', views.PostCreateView.as_view(), name='post-create'),
     path('post/<int:pk>/update/', views.PostUpdateView.as_view(), name='post-update'),
     path('post/<int:pk>/delete/', views.PostDeleteView.as_view(), name='post-delete'),
-    path('post/<int:pk>/comments/new/', CommentCreateView.as_view(), name='comment-create'),
-    path('comment/<int:pk>/update/', CommentUpdateView.as_view(), name='comment-update'),
-    path('comment/<int:pk>/delete/', CommentDeleteView.as_view(), name='comment-delete'),
-]
+    path('post/<int:pk>/comments/', views.PostCommentsView.as_view(), name='post-comments'),
+    path('post/<int:pk>/comments/new/', views.CommentCreateView.as_view(), name='comment-create'),
+    path('comment/<int:pk>/update/', views.CommentUpdateView.as_view(), name='comment-update'),
+    path('comment/<int:pk>/delete/', views.CommentDeleteView.as_view(), name='comment-delete'),
 
-
-urlpatterns = [
-    # existing CRUD paths...
+    # Search and tags
     path('search/', views.search, name='search'),
+    path('page-cache/stats/', PageCacheStatsView.as_view(), name='page-cache-stats'),
     path("tags/<slug:tag_slug>/", views.PostByTagListView.as_view(), name="posts_by_tag"),
 ]
-
-
@@ -10,11 +10,18 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
+import sys
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# For django_common/ (see its __init__.py).
+REPO_DIR = BASE_DIR.parent
+if str(REPO_DIR) not in sys.path:
+    sys.path.append(str(REPO_DIR))
+
 
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/5.2/howto/deployment/checklist/
@@ -42,6 +49,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'django_common.server_timing.ServerTimingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -85,6 +93,16 @@ DATABASES = {
     }
 }
 
+# BLOG_DATABASE=sqlite uses db.sqlite3 instead, e.g. to run the tests without
+# a PostgreSQL server: BLOG_DATABASE=sqlite python manage.py test blog
+if os.environ.get('BLOG_DATABASE') == 'sqlite':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': BASE_DIR / 'db.sqlite3',
+        }
+    }
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -143,4 +161,15 @@ MEDIA_ROOT = BASE_DIR / "media"
 
 # If you don’t use a global static/ directory, remove STATICFILES_DIRS.
 # Otherwise, ensure it exists: BASE_DIR / "static"
-# STATICFILES_DIRS = [BASE_DIR / "static"]
\ No newline at end of file
+# STATICFILES_DIRS = [BASE_DIR / "static"]
+
+SERVER_TIMING_SAMPLE_RATE = 1.0 if DEBUG else 0.01  # django_common/server_timing.py
+
+# Full-page cache for anonymous readers (blog/page_cache.py). With the default
+# per-process cache each worker has its own pages and hit counters; point
+# CACHES at a shared backend (e.g. Redis or Memcached) in production.
+PAGE_CACHE_TIMEOUT = 300
+
+# Full-text search on PostgreSQL (blog/search.py). Off until the PostgreSQL path
+# is covered by a test run; run rebuild_search_index after switching it on.
+POSTGRES_SEARCH = False
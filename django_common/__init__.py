@@ -0,0 +1,10 @@
+"""
+Code shared by the Django projects in this repository.
+
+Each project's settings put the repository root on sys.path, so modules here
+are imported as django_common.<module>. The tests have their own settings:
+
+    python -m django test django_common --settings=django_common.tests.settings
+
+(run from the repository root).
+"""
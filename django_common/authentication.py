@@ -0,0 +1,109 @@
+"""
+Token authentication with a per-process cache of the token -> user lookup.
+
+DRF's TokenAuthentication runs SELECT token JOIN user on every request.
+CachedTokenAuthentication keeps the result in a bounded LRU with a TTL, so a
+client sending the same token again is authenticated without a query.
+
+Entries are evicted when their Token or User is saved or deleted (this
+includes is_active changes and token regeneration). The cache lives in each
+process, so a change made in another process, or through queryset.update(),
+is seen after at most TOKEN_AUTH_CACHE_TIMEOUT seconds.
+
+Use 'django_common.authentication.CachedTokenAuthentication' in
+DEFAULT_AUTHENTICATION_CLASSES, and import this module from an AppConfig's
+ready() so the eviction receivers are connected before the first request.
+
+Settings:
+    TOKEN_AUTH_CACHE_SIZE: maximum number of cached tokens (default: 1024).
+    TOKEN_AUTH_CACHE_TIMEOUT: seconds an entry may be used (default: 60).
+"""
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authentication import TokenAuthentication
+
+
+class TokenCache:
+    """
+    Thread-safe LRU of token key -> (user, token), with a TTL per entry.
+    """
+
+    def __init__(self, maxsize, timeout):
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1], entry[2]
+
+    def set(self, key, user, token):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.timeout, user, token)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def delete_user(self, user_pk):
+        with self._lock:
+            for key in [key for key, entry in self._entries.items() if entry[1].pk == user_pk]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+token_cache = TokenCache(
+    getattr(settings, 'TOKEN_AUTH_CACHE_SIZE', 1024),
+    getattr(settings, 'TOKEN_AUTH_CACHE_TIMEOUT', 60),
+)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    TokenAuthentication that serves repeated tokens from token_cache.
+    """
+
+    def authenticate_credentials(self, key):
+        cached = token_cache.get(key)
+        if cached is None:
+            # Raises AuthenticationFailed for unknown tokens and inactive users.
+            user, token = super().authenticate_credentials(key)
+            token_cache.set(key, user, token)
+            cached = user, token
+        # A copy per request: views may modify request.user.
+        return copy.copy(cached[0]), copy.copy(cached[1])
+
+
+@receiver(post_save, sender='authtoken.Token', dispatch_uid='token_cache_token')
+@receiver(post_delete, sender='authtoken.Token', dispatch_uid='token_cache_token_delete')
+def evict_token(sender, instance, **kwargs):
+    token_cache.delete(instance.key)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL, dispatch_uid='token_cache_user')
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL, dispatch_uid='token_cache_user_delete')
+def evict_user(sender, instance, **kwargs):
+    token_cache.delete_user(instance.pk)
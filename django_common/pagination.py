@@ -0,0 +1,157 @@
+"""
+Pagination without SELECT COUNT(*).
+
+Django's Paginator counts the whole table on every page. CountFreePaginator
+fetches per_page + 1 rows instead: the extra row only tells whether there is
+a next page. The total is reported as an estimate from get_estimated_count(),
+a count cached per query and refreshed in the background.
+
+Background counts run one at a time on a single worker thread per process,
+and at most ESTIMATED_COUNT_MAX_PENDING of them wait in its queue; when the
+queue is full the count is skipped (and retried by a later request). So
+however many distinct filters clients send, each process runs at most one
+extra thread and one COUNT(*) at a time.
+"""
+import hashlib
+import logging
+import queue
+import threading
+import time
+from functools import partial
+
+from django.core.cache import cache
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger, Paginator
+from django.db import connections, transaction
+from django.db.models import QuerySet
+
+logger = logging.getLogger(__name__)
+
+# How long a cached count may be served, and the age after which it is recounted.
+ESTIMATED_COUNT_TIMEOUT = 60 * 60
+ESTIMATED_COUNT_REFRESH = 5 * 60
+# Counts waiting for the worker; more are dropped.
+ESTIMATED_COUNT_MAX_PENDING = 100
+
+
+class BackgroundWorker:
+    """
+    A single daemon thread running submitted functions in order. At most
+    maxsize functions wait; submit() returns False instead of queueing more.
+    The thread's database connections are closed after every function.
+    """
+
+    def __init__(self, maxsize):
+        self.jobs = queue.Queue(maxsize)
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def submit(self, func):
+        try:
+            self.jobs.put_nowait(func)
+        except queue.Full:
+            return False
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="background-worker", daemon=True)
+                self._thread.start()
+        return True
+
+    def _run(self):
+        while True:
+            func = self.jobs.get()
+            try:
+                func()
+            except Exception:
+                logger.exception("Background job %r failed", func)
+            finally:
+                connections.close_all()
+                self.jobs.task_done()
+
+
+count_worker = BackgroundWorker(ESTIMATED_COUNT_MAX_PENDING)
+
+
+def refresh_in_background(func):
+    """
+    Run func on the background worker. Returns False if its queue is full.
+    """
+    return count_worker.submit(func)
+
+
+def _refresh_count(queryset, key):
+    try:
+        cache.set(key, (queryset.count(), time.time()), ESTIMATED_COUNT_TIMEOUT)
+    finally:
+        cache.delete(key + ':lock')
+
+
+def _schedule_count(queryset, key):
+    if not refresh_in_background(partial(_refresh_count, queryset, key)):
+        cache.delete(key + ':lock')  # let a later request try again
+
+
+def get_estimated_count(queryset):
+    """
+    A recent COUNT(*) of the queryset from the cache, or None until the first
+    count has finished. The count itself runs on the background worker, at
+    most once per query every ESTIMATED_COUNT_REFRESH seconds, never in the
+    request.
+    """
+    if not isinstance(queryset, QuerySet):
+        return len(queryset)
+    queryset = queryset.order_by()
+    sql, params = queryset.query.sql_with_params()
+    key = 'estimated-count:' + hashlib.md5(f'{queryset.db}|{sql}|{params}'.encode('utf-8')).hexdigest()
+    cached = cache.get(key)
+    if cached is None or time.time() - cached[1] > ESTIMATED_COUNT_REFRESH:
+        if cache.add(key + ':lock', True, ESTIMATED_COUNT_REFRESH):
+            # After commit, so the worker sees what this request sees.
+            transaction.on_commit(partial(_schedule_count, queryset, key))
+    return cached[0] if cached is not None else None
+
+
+class CountFreePage(Page):
+    def __init__(self, object_list, number, paginator, has_next):
+        super().__init__(object_list, number, paginator)
+        self._has_next = has_next
+
+    def has_next(self):
+        return self._has_next
+
+    def end_index(self):
+        return (self.number - 1) * self.paginator.per_page + len(self)
+
+
+class CountFreePaginator(Paginator):
+    """
+    Paginator that never counts: count and num_pages are unknown (None), and
+    estimated_count is the cached estimate. Orphans are not supported.
+    Use it as a ListView's paginator_class.
+    """
+    count = None
+    num_pages = None
+
+    @property
+    def estimated_count(self):
+        if not hasattr(self, '_estimated_count'):
+            self._estimated_count = get_estimated_count(self.object_list)
+        return self._estimated_count
+
+    def validate_number(self, number):
+        try:
+            if isinstance(number, float) and not number.is_integer():
+                raise ValueError
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger(self.error_messages['invalid_page'])
+        if number < 1:
+            raise EmptyPage(self.error_messages['min_page'])
+        return number
+
+    def page(self, number):
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom:bottom + self.per_page + 1])
+        if not rows and (number > 1 or not self.allow_empty_first_page):
+            raise EmptyPage(self.error_messages['no_results'])
+        return CountFreePage(rows[:self.per_page], number, self, has_next=len(rows) > self.per_page)
@@ -0,0 +1,210 @@
+"""
+Per-request timing: a Server-Timing header and an optional structured log line.
+
+For a sampled fraction of requests, records:
+    - db:     number of SQL queries and total time spent in them
+              (connection.execute_wrapper on every configured database);
+    - db-max: the slowest query (its SQL goes to the log, never to the header);
+    - ser:    time spent in DRF serializers' to_representation, less their SQL
+              (views opt in with ServerTimingMixin, or time a block with
+              serializing());
+    - render: time spent rendering the response (templates, DRF renderers);
+    - total:  the whole request as seen by this middleware.
+The rest of total is the view itself, middleware and the handler.
+Unsampled requests go straight through, so the cost in production is one
+random() call per request.
+
+Settings:
+    SERVER_TIMING_SAMPLE_RATE: fraction of requests to instrument, 0.0-1.0
+        (default: 1.0 with DEBUG, 0.0 otherwise). The projects here set
+        `1.0 if DEBUG else 0.01`: every request in development, and in
+        production 1%, enough for percentiles at a negligible cost.
+    SERVER_TIMING_LOG: also log one JSON line per sampled request to the
+        "server_timing" logger (default: False).
+Put the middleware first in MIDDLEWARE so the totals include the others.
+It works under WSGI and ASGI, for sync and async views.
+"""
+import json
+import logging
+import random
+from contextlib import ExitStack, contextmanager, nullcontext
+from time import perf_counter
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger("server_timing")
+
+
+class RequestTimings:
+    """
+    Accumulates the timings of one request. Instances are execute wrappers.
+    """
+
+    def __init__(self):
+        self.started = perf_counter()
+        self.queries = 0
+        self.sql_time = 0.0
+        self.slowest_time = 0.0
+        self.slowest_sql = None
+        self.serializer_time = 0.0
+        self.render_time = 0.0
+        self._serializing = False
+
+    def __call__(self, execute, sql, params, many, context):
+        start = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = perf_counter() - start
+            self.queries += 1
+            self.sql_time += elapsed
+            if elapsed > self.slowest_time:
+                self.slowest_time, self.slowest_sql = elapsed, sql
+
+    def instrument(self):
+        """
+        Wrap every database connection of the current thread; close the
+        returned ExitStack to unwrap them.
+        """
+        stack = ExitStack()
+        for alias in connections:
+            stack.enter_context(connections[alias].execute_wrapper(self))
+        return stack
+
+    @contextmanager
+    def serializing(self):
+        """
+        Count the enclosed block as serialization, minus the SQL it runs
+        (lazy querysets are often evaluated there). Nested blocks count once.
+        """
+        if self._serializing:
+            yield
+            return
+        self._serializing = True
+        start, sql_time = perf_counter(), self.sql_time
+        try:
+            yield
+        finally:
+            self._serializing = False
+            self.serializer_time += max(perf_counter() - start - (self.sql_time - sql_time), 0)
+
+    def as_dict(self):
+        return {
+            "total_ms": round((perf_counter() - self.started) * 1000, 2),
+            "db_ms": round(self.sql_time * 1000, 2),
+            "db_queries": self.queries,
+            "db_slowest_ms": round(self.slowest_time * 1000, 2),
+            "ser_ms": round(self.serializer_time * 1000, 2),
+            "render_ms": round(self.render_time * 1000, 2),
+        }
+
+
+def serializing(request):
+    """
+    Context manager counting a block as `ser` when the request is sampled,
+    e.g. a view that renders rows without a DRF serializer.
+    """
+    timings = getattr(request, "server_timings", None)
+    return timings.serializing() if timings is not None else nullcontext()
+
+
+class ServerTimingMixin:
+    """
+    DRF view mixin: serializers from get_serializer() time their
+    to_representation() as `ser` on sampled requests.
+    """
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        timings = getattr(self.request, "server_timings", None)
+        if timings is not None:
+            to_representation = serializer.to_representation
+
+            def timed_to_representation(instance):
+                with timings.serializing():
+                    return to_representation(instance)
+
+            serializer.to_representation = timed_to_representation
+        return serializer
+
+
+def server_timing_header(data):
+    return ", ".join([
+        f'db;desc="{data["db_queries"]} queries";dur={data["db_ms"]}',
+        f'db-max;dur={data["db_slowest_ms"]}',
+        f'ser;dur={data["ser_ms"]}',
+        f'render;dur={data["render_ms"]}',
+        f'total;dur={data["total_ms"]}',
+    ])
+
+
+class ServerTimingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate = getattr(settings, "SERVER_TIMING_SAMPLE_RATE", 1.0 if settings.DEBUG else 0.0)
+        self.log = getattr(settings, "SERVER_TIMING_LOG", False)
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def sampled(self):
+        return self.sample_rate >= 1 or (self.sample_rate > 0 and random.random() < self.sample_rate)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.sampled():
+            return self.get_response(request)
+
+        request.server_timings = timings = RequestTimings()
+        with timings.instrument():
+            response = self.get_response(request)
+        return self.finish(request, response, timings)
+
+    async def __acall__(self, request):
+        if not self.sampled():
+            return await self.get_response(request)
+
+        request.server_timings = timings = RequestTimings()
+        # Connections are per thread, and under ASGI the ORM (for sync views
+        # and async ORM calls alike) runs in the request's thread-sensitive
+        # worker, so the wrappers are installed and removed there.
+        stack = await sync_to_async(timings.instrument, thread_sensitive=True)()
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close, thread_sensitive=True)()
+        return self.finish(request, response, timings)
+
+    def process_template_response(self, request, response):
+        # Called just before rendering (this middleware comes first, so last here).
+        timings = getattr(request, "server_timings", None)
+        if timings is not None:
+            start = perf_counter()
+
+            def rendered(response):
+                timings.render_time += perf_counter() - start
+
+            response.add_post_render_callback(rendered)
+        return response
+
+    def finish(self, request, response, timings):
+        data = timings.as_dict()
+        header = server_timing_header(data)
+        if response.has_header("Server-Timing"):
+            header = f'{response["Server-Timing"]}, {header}'
+        response["Server-Timing"] = header
+
+        if self.log:
+            logger.info(json.dumps({
+                "method": request.method,
+                "path": request.path,
+                "status": response.status_code,
+                **data,
+                "db_slowest_sql": timings.slowest_sql,
+            }))
+        return response
@@ -0,0 +1,27 @@
+"""
+Minimal settings for the django_common tests.
+"""
+SECRET_KEY = "django-common-tests"
+DEBUG = False
+USE_TZ = True
+
+INSTALLED_APPS = [
+    "django.contrib.contenttypes",
+    "django.contrib.auth",
+    "rest_framework",
+    "rest_framework.authtoken",
+]
+
+MIDDLEWARE = [
+    "django_common.server_timing.ServerTimingMiddleware",
+]
+
+ROOT_URLCONF = "django_common.tests.urls"
+
+DATABASES = {
+    "default": {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"},
+}
+
+DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
+
+SERVER_TIMING_SAMPLE_RATE = 1.0
@@ -0,0 +1,107 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIRequestFactory
+
+from django_common.authentication import CachedTokenAuthentication, TokenCache, token_cache
+
+
+class CachedTokenAuthenticationTests(TestCase):
+    """
+    Repeated tokens are authenticated without a query until they expire, and
+    a revoked token or deactivated user stops authenticating at once.
+    """
+
+    def setUp(self):
+        token_cache.clear()
+        self.addCleanup(token_cache.clear)
+        self.user = User.objects.create_user(username="alice")
+        self.token = Token.objects.create(user=self.user)
+
+    def authenticate(self, key=None):
+        # Deleting a token clears its key; tests pass the old one explicitly.
+        request = APIRequestFactory().get("/", HTTP_AUTHORIZATION=f"Token {key or self.token.key}")
+        return CachedTokenAuthentication().authenticate(request)
+
+    def test_cache_hit(self):
+        with self.assertNumQueries(1):
+            user, token = self.authenticate()
+        with self.assertNumQueries(0):
+            cached_user, cached_token = self.authenticate()
+        self.assertEqual((cached_user, cached_token), (self.user, self.token))
+        self.assertIsNot(cached_user, user)  # a copy per request
+
+    def test_ttl_expiry(self):
+        with mock.patch("django_common.authentication.time") as time:
+            time.monotonic.return_value = 1000
+            self.authenticate()
+            time.monotonic.return_value = 1000 + token_cache.timeout
+            with self.assertNumQueries(0):
+                self.authenticate()
+            time.monotonic.return_value = 1000 + token_cache.timeout + 1
+            with self.assertNumQueries(1):
+                self.authenticate()
+
+    def test_evicted_when_token_saved(self):
+        self.authenticate()
+        self.token.save()
+        with self.assertNumQueries(1):
+            self.authenticate()
+
+    def test_revoked_token(self):
+        key = self.token.key
+        self.authenticate()
+        self.token.delete()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate(key)
+
+    def test_regenerated_token(self):
+        self.authenticate()
+        old_key = self.token.key
+        self.token.delete()
+        new_token = Token.objects.create(user=self.user)
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate(old_key)
+        self.assertEqual(self.authenticate(new_token.key)[0], self.user)
+
+    def test_deactivated_user(self):
+        self.authenticate()
+        self.user.is_active = False
+        self.user.save()
+        with self.assertRaisesMessage(AuthenticationFailed, "User inactive or deleted."):
+            self.authenticate()
+
+    def test_deleted_user(self):
+        self.authenticate()
+        self.user.delete()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+
+    def test_other_users_stay_cached(self):
+        bob = User.objects.create_user(username="bob")
+        bob_token = Token.objects.create(user=bob)
+        self.authenticate()
+        self.authenticate(bob_token.key)
+        self.user.save()
+        with self.assertNumQueries(0):
+            self.authenticate(bob_token.key)
+
+
+class TokenCacheTests(TestCase):
+    """
+    The cache is an LRU bounded to maxsize entries.
+    """
+
+    def test_least_recently_used_is_dropped(self):
+        cache = TokenCache(maxsize=2, timeout=60)
+        users = [User(pk=pk) for pk in range(3)]
+        cache.set("a", users[0], None)
+        cache.set("b", users[1], None)
+        cache.get("a")
+        cache.set("c", users[2], None)
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), (users[0], None))
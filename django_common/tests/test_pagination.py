@@ -0,0 +1,95 @@
+import threading
+from unittest import mock
+
+from django.contrib.auth.models import Group
+from django.core.cache import cache
+from django.core.paginator import EmptyPage, PageNotAnInteger
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from django_common import pagination
+from django_common.pagination import BackgroundWorker, CountFreePaginator, get_estimated_count
+
+
+class CountFreePaginatorTests(TestCase):
+    """
+    Pages come from one query of per_page + 1 rows, never from a COUNT(*).
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        Group.objects.bulk_create(Group(name=f"group-{i:02}") for i in range(25))
+
+    def setUp(self):
+        cache.clear()
+        self.paginator = CountFreePaginator(Group.objects.order_by("name"), 10)
+
+    def test_pages(self):
+        with CaptureQueriesContext(connection) as ctx:
+            pages = [self.paginator.page(number) for number in (1, 2, 3)]
+        self.assertEqual(len(ctx.captured_queries), 3)
+        self.assertFalse([query for query in ctx.captured_queries if "COUNT(" in query["sql"]])
+        self.assertEqual([len(page) for page in pages], [10, 10, 5])
+        self.assertEqual([page.has_next() for page in pages], [True, True, False])
+        self.assertEqual((pages[2].start_index(), pages[2].end_index()), (21, 25))
+        self.assertIsNone(self.paginator.count)
+
+    def test_invalid_pages(self):
+        for number, error in [("x", PageNotAnInteger), (1.5, PageNotAnInteger), (0, EmptyPage), (4, EmptyPage)]:
+            with self.subTest(number=number), self.assertRaises(error):
+                self.paginator.page(number)
+        self.assertEqual(len(CountFreePaginator(Group.objects.none(), 10).page(1)), 0)
+
+    @mock.patch.object(pagination, "refresh_in_background", lambda func: func())
+    def test_estimated_count(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertIsNone(self.paginator.estimated_count)  # counted after the response
+        self.assertEqual(CountFreePaginator(Group.objects.order_by("name"), 10).estimated_count, 25)
+        self.assertEqual(CountFreePaginator(list(range(7)), 10).estimated_count, 7)
+
+
+class EstimatedCountWorkerTests(TestCase):
+    """
+    However many distinct queries ask for an estimate, counts run on one
+    thread and only a bounded number wait for it.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.worker = BackgroundWorker(maxsize=5)
+        patcher = mock.patch.object(pagination, "count_worker", self.worker)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_distinct_queries_share_one_bounded_worker(self):
+        release = threading.Event()
+        self.worker.submit(release.wait)  # keeps the worker busy while we queue
+        threads = threading.active_count()
+
+        refresh = mock.Mock()
+        with mock.patch.object(pagination, "_refresh_count", refresh):
+            with self.captureOnCommitCallbacks(execute=True):
+                for i in range(200):
+                    get_estimated_count(Group.objects.filter(name__icontains=str(i)))
+
+        self.assertEqual(threading.active_count(), threads)
+        self.assertEqual(self.worker.jobs.qsize(), 5)
+        release.set()
+        self.worker.jobs.join()
+        self.assertEqual(refresh.call_count, 5)
+
+        # Skipped counts were unlocked, so a later request schedules them again.
+        with mock.patch.object(pagination, "_refresh_count", refresh):
+            with self.captureOnCommitCallbacks(execute=True):
+                get_estimated_count(Group.objects.filter(name__icontains="199"))
+        self.worker.jobs.join()
+        self.assertEqual(refresh.call_count, 6)
+
+    def test_failing_job_does_not_stop_the_worker(self):
+        done = threading.Event()
+        with self.assertLogs("django_common.pagination", "ERROR"):
+            self.worker.submit(lambda: 1 / 0)
+            self.worker.submit(done.set)
+            self.worker.jobs.join()
+        self.assertTrue(done.is_set())
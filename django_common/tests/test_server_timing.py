@@ -0,0 +1,63 @@
+import re
+from time import sleep
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import Group
+from django.db import connection
+from django.test import TestCase, override_settings
+
+from django_common.server_timing import RequestTimings, ServerTimingMiddleware
+
+
+class ServerTimingTests(TestCase):
+    """
+    The SQL of sync and async views is counted under WSGI and ASGI alike,
+    and DRF serializers are timed apart from the SQL and the renderer.
+    """
+
+    def metrics(self, response):
+        return dict(re.findall(r"([\w-]+)(?:;desc=\"[^\"]*\")?;dur=([\d.]+)", response["Server-Timing"]))
+
+    def test_wsgi(self):
+        for url in ("/sync/", "/async/"):
+            with self.subTest(url=url):
+                self.assertIn('db;desc="2 queries"', self.client.get(url)["Server-Timing"])
+
+    async def test_asgi(self):
+        for url in ("/sync/", "/async/"):
+            with self.subTest(url=url):
+                response = await self.async_client.get(url)
+                self.assertIn('db;desc="2 queries"', response["Server-Timing"])
+
+    async def test_wrappers_are_removed_after_the_request(self):
+        await self.async_client.get("/async/")
+        wrappers = await sync_to_async(lambda: connection.execute_wrappers)()
+        self.assertEqual(wrappers, [])
+
+    @override_settings(SERVER_TIMING_SAMPLE_RATE=0.0)
+    async def test_unsampled_requests_are_untouched(self):
+        self.assertNotIn("Server-Timing", await self.async_client.get("/async/"))
+
+    def test_drf_views_report_serializer_and_render_time(self):
+        Group.objects.bulk_create(Group(name=f"group {i}") for i in range(50))
+        metrics = self.metrics(self.client.get("/groups/"))
+        self.assertEqual(list(metrics), ["db", "db-max", "ser", "render", "total"])
+        self.assertGreater(float(metrics["ser"]), 0)
+        self.assertGreater(float(metrics["render"]), 0)
+
+    def test_serializing_excludes_sql_and_counts_nested_blocks_once(self):
+        timings = RequestTimings()
+        with timings.instrument(), timings.serializing():
+            with timings.serializing():
+                sleep(0.05)
+            list(Group.objects.all())
+        self.assertEqual(timings.queries, 1)
+        # Counted twice, the nested block alone would make it 0.1s.
+        self.assertGreaterEqual(timings.serializer_time, 0.05)
+        self.assertLess(timings.serializer_time, 0.1)
+
+    def test_sample_rate(self):
+        middleware = ServerTimingMiddleware(lambda request: None)
+        middleware.sample_rate = 0.25
+        hits = sum(middleware.sampled() for _ in range(4000))
+        self.assertTrue(700 < hits < 1300, hits)
@@ -0,0 +1,32 @@
+from django.contrib.auth.models import Group
+from django.http import HttpResponse
+from django.urls import path
+from rest_framework import generics, serializers
+
+from django_common.server_timing import ServerTimingMixin
+
+
+def sync_view(request):
+    return HttpResponse(f"{Group.objects.count()} {len(list(Group.objects.all()))}")
+
+
+async def async_view(request):
+    return HttpResponse(f"{await Group.objects.acount()} {len([group async for group in Group.objects.all()])}")
+
+
+class GroupSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Group
+        fields = ["id", "name"]
+
+
+class GroupListView(ServerTimingMixin, generics.ListAPIView):
+    queryset = Group.objects.all()
+    serializer_class = GroupSerializer
+
+
+urlpatterns = [
+    path("sync/", sync_view),
+    path("async/", async_view),
+    path("groups/", GroupListView.as_view()),
+]
@@ -5,11 +5,12 @@ from rest_framework.response import Response
 from rest_framework.authtoken.models import Token
 from rest_framework.authtoken.views import ObtainAuthToken
 from django.contrib.auth import get_user_model
+from django_common.server_timing import ServerTimingMixin
 from .serializers import UserSerializer, RegisterSerializer
 
 User = get_user_model()
 
-class RegisterView(generics.CreateAPIView):
+class RegisterView(ServerTimingMixin, generics.CreateAPIView):
     queryset = User.objects.all()
     serializer_class = RegisterSerializer
 
@@ -25,7 +26,7 @@ class CustomAuthToken(ObtainAuthToken):
         token = Token.objects.get(key=response.data["token"])
         return Response({"token": token.key, "user": UserSerializer(token.user).data})
 
-class ProfileView(generics.RetrieveUpdateAPIView):
+class ProfileView(ServerTimingMixin, generics.RetrieveUpdateAPIView):
     serializer_class = UserSerializer
     permission_classes = [permissions.IsAuthenticated]
 